@@ -2,6 +2,9 @@ import sys
 from pathlib import Path
 import streamlit as st
 import plotly.graph_objects as go
+import pandas as pd
+from dataclasses import fields
+from typing import Optional
 from datetime import datetime, timedelta
 
 
@@ -11,9 +14,56 @@ sys.path.append(str(ROOT))
 
 from config import Config
 from src.data_loader import load_stock_data
-from predict import ui_predict_for_symbol  # Import from predict.py instead
+from src.bar_cache import get_bars
+from src.downsample import downsample_ohlc, lttb
+from src.model_registry import read_metrics
+from predict import UIMetrics, ui_explain_for_symbol, ui_predict_for_symbol  # Import from predict.py instead
+from src.signal_stream import StreamSubscriber
 if "prediction" not in st.session_state:
     st.session_state.prediction = None
+if "attribution" not in st.session_state:
+    st.session_state.attribution = None
+
+# Market Data ranges; long ranges default to pre-aggregated weekly/monthly bars
+CHART_PERIODS = {
+    "30 Days": ("daily", pd.DateOffset(days=30)),
+    "90 Days": ("daily", pd.DateOffset(days=90)),
+    "180 Days": ("daily", pd.DateOffset(days=180)),
+    "1 Year": ("daily", pd.DateOffset(years=1)),
+    "3 Years": ("weekly", pd.DateOffset(years=3)),
+    "5 Years": ("weekly", pd.DateOffset(years=5)),
+    "10 Years": ("monthly", pd.DateOffset(years=10)),
+    "All": ("monthly", None),
+}
+
+
+def load_history(ticker: str, resolution: str) -> pd.DataFrame:
+    return load_stock_data(ticker) if resolution == "daily" else get_bars(ticker, resolution)
+
+
+def data_stamp(ticker: str) -> Optional[int]:
+    """mtime of the daily CSV: weekly/monthly bars are refreshed from it too (src.bar_cache)."""
+    path = Config.DATA_RAW_DIR / f"{ticker.upper()}_raw.csv"
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def chart_series(ticker: str, resolution: str, period_label: str, stamp: Optional[int]):
+    """
+    Downsampled candles (OHLC buckets) and volume (LTTB) for one chart, capped
+    at Config.CHART_MAX_POINTS, plus the number of bars and the last 20 bars.
+    Cached per (symbol, bars, range); `stamp` (data_stamp) changes whenever
+    the daily CSV is rewritten. None if there is no history.
+    """
+    df = load_history(ticker, resolution)
+    if df is None or df.empty:
+        return None
+    offset = CHART_PERIODS[period_label][1]
+    if offset is not None:
+        df = df.loc[df.index[-1] - offset:]
+    candles = downsample_ohlc(df, Config.CHART_MAX_POINTS)
+    volume = lttb(df["Volume"], Config.CHART_MAX_POINTS)
+    return candles, volume, len(df), df.tail(20)
 
 
 st.set_page_config(
@@ -187,11 +237,38 @@ st.markdown("""
 with st.sidebar:
     st.markdown("### 📈 Stock Selection")
     ticker = st.selectbox("Symbol", Config.SUPPORTED_STOCKS, index=0)
+    show_uncertainty = st.checkbox(
+        "🎲 Uncertainty (MC dropout)", value=False,
+        help=f"{Config.MC_DROPOUT_PASSES} stochastic passes in one batched call",
+    )
+    show_attribution = st.checkbox(
+        "🔍 Explain (integrated gradients)", value=False,
+        help=f"Which features and days drove the probabilities ({Config.ATTRIBUTION_STEPS} steps, one batched gradient pass)",
+    )
+    live_stream = st.checkbox(
+        "📡 Live stream", value=False,
+        help=f"Follow the signal stream at {Config.STREAM_URL} (python stream.py): "
+             "the prediction updates when new bars arrive",
+    )
     st.markdown("---")
     st.markdown("### ℹ️ Info")
     st.markdown("Select a stock and click **Generate AI Prediction** to see signals.")
 
 
+@st.cache_resource
+def stream_subscriber() -> StreamSubscriber:
+    """One SSE connection per Streamlit server, shared by every session."""
+    return StreamSubscriber(Config.STREAM_URL).start()
+
+
+@st.fragment(run_every=Config.STREAM_UI_REFRESH_SECONDS)
+def follow_stream(symbol: str):
+    """Cheap periodic check; reruns the page only when a newer signal was pushed."""
+    signal = stream_subscriber().latest.get(symbol)
+    if signal is not None and signal["event_id"] != st.session_state.get("stream_event_id"):
+        st.rerun()
+
+
 # Tabs
 tab_live, tab_data, tab_about = st.tabs(
     ["🔮 Live Prediction", "📊 Market Data", "ℹ️ About"]
@@ -207,12 +284,35 @@ with tab_live:
         # ✅ FIX 2: Button ONLY stores prediction in session_state
         if st.button("🚀 Generate AI Prediction", use_container_width=True):
             with st.spinner("Running LSTM model..."):
-                st.session_state.prediction = ui_predict_for_symbol(ticker)
+                st.session_state.prediction = ui_predict_for_symbol(
+                    ticker, mc_passes=Config.MC_DROPOUT_PASSES if show_uncertainty else 0
+                )
+                st.session_state.attribution = ui_explain_for_symbol(ticker) if show_attribution else None
                 st.success("✅ Prediction generated successfully!")
         
+        # Live mode: show the latest pushed signal instead of recomputing per session
+        if live_stream:
+            signal = stream_subscriber().latest.get(ticker)
+            if signal is not None:
+                if signal["event_id"] != st.session_state.get("stream_event_id"):
+                    st.session_state.stream_event_id = signal["event_id"]
+                    st.session_state.attribution = None
+                st.session_state.prediction = UIMetrics(
+                    **{f.name: signal[f.name] for f in fields(UIMetrics) if f.name in signal}
+                )
+                st.caption(f"📡 Live · window through {signal['as_of']} · model {signal['model_version']}")
+            else:
+                st.caption(f"📡 Waiting for the signal stream at {Config.STREAM_URL} (python stream.py)")
+        
         # ✅ FIX 3: ALL METRICS UI MOVED OUTSIDE BUTTON - MOST IMPORTANT!
         if st.session_state.prediction is not None:
             metrics = st.session_state.prediction
+            
+            # "± spread" labels when the prediction ran with MC dropout
+            tom_spread = week_spread = ""
+            if metrics.uncertainty is not None:
+                tom_spread = f" ± {metrics.uncertainty['tomorrow_output']['std']:.1%}"
+                week_spread = f" ± {metrics.uncertainty['week_output']['std']:.1%}"
 
             # Display metrics
             col1, col2, col3 = st.columns(3)
@@ -230,7 +330,7 @@ with tab_live:
                 <div class="metric-tile">
                     <div class="metric-label">Tomorrow</div>
                     <div class="metric-value">{metrics.tom_direction}</div>
-                    <div class="metric-label">{metrics.p_tom_up:.1%}</div>
+                    <div class="metric-label">{metrics.p_tom_up:.1%}{tom_spread}</div>
                 </div>
                 """, unsafe_allow_html=True)
             
@@ -239,7 +339,7 @@ with tab_live:
                 <div class="metric-tile">
                     <div class="metric-label">This Week</div>
                     <div class="metric-value">{metrics.week_direction}</div>
-                    <div class="metric-label">{metrics.p_week_up:.1%}</div>
+                    <div class="metric-label">{metrics.p_week_up:.1%}{week_spread}</div>
                 </div>
                 """, unsafe_allow_html=True)
             
@@ -264,7 +364,13 @@ with tab_live:
                 y=[metrics.p_tom_up * 100, metrics.p_week_up * 100],
                 marker_color=['rgba(99, 102, 241, 0.8)', 'rgba(139, 92, 246, 0.8)'],
                 text=[f"{metrics.p_tom_up:.1%}", f"{metrics.p_week_up:.1%}"],
-                textposition='outside'
+                textposition='outside',
+                error_y=None if metrics.uncertainty is None else dict(
+                    type='data',
+                    array=[metrics.uncertainty['tomorrow_output']['std'] * 100,
+                           metrics.uncertainty['week_output']['std'] * 100],
+                    color='rgba(255,255,255,0.6)',
+                ),
             ))
             
             fig.update_layout(
@@ -280,11 +386,43 @@ with tab_live:
             st.markdown('<div class="chart-glass">', unsafe_allow_html=True)
             st.plotly_chart(fig, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Attribution heatmap: days of the input window × features, signed
+            attribution = st.session_state.attribution
+            if attribution is not None:
+                head = st.radio("Explain", ["week_output", "tomorrow_output"], horizontal=True,
+                                format_func=lambda h: "This Week" if h == "week_output" else "Tomorrow")
+                heat = attribution.heatmap(head)
+                limit = float(abs(heat).max()) or 1.0
+                fig_attr = go.Figure(go.Heatmap(
+                    z=heat.T,
+                    x=[f"t-{len(heat) - d}" for d in range(len(heat))],
+                    y=attribution.features,
+                    colorscale='RdYlGn', zmid=0, zmin=-limit, zmax=limit,
+                    colorbar=dict(title="Δ P(UP)"),
+                ))
+                fig_attr.update_layout(
+                    title="What moved the prediction (green: towards UP, red: towards DOWN)",
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='white'),
+                    xaxis=dict(title="Day in input window"),
+                    height=max(300, 18 * len(attribution.features) + 120),
+                )
+                st.markdown('<div class="chart-glass">', unsafe_allow_html=True)
+                st.plotly_chart(fig_attr, use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+                top = list(attribution.by_feature(head).items())[:5]
+                st.caption(
+                    "Top features: " + ", ".join(f"{name} {value:+.3f}" for name, value in top)
+                    + f" · {attribution.seconds_per_symbol * 1e3:.0f} ms"
+                )
         else:
             st.info("👆 Click **Generate AI Prediction** to see results")
     
     with right:
-        st.markdown("""
+        model_metrics = read_metrics()
+        st.markdown(f"""
         <div class="glass-card">
             <h3>🧠 How It Works</h3>
             <p style="color: rgba(255,255,255,0.8); line-height: 1.6;">
@@ -299,8 +437,8 @@ with tab_live:
             <hr style="border-color: rgba(255,255,255,0.2);">
             <p style="color: rgba(255,255,255,0.7); font-size: 0.9rem;">
             <strong>Model Accuracy:</strong><br>
-            Tomorrow: 60%<br>
-            Week: 67%
+            Tomorrow: {model_metrics['val_acc_tomorrow']:.0%}<br>
+            Week: {model_metrics['val_acc_week']:.0%}
             </p>
         </div>
         """, unsafe_allow_html=True)
@@ -321,28 +459,35 @@ with tab_data:
     st.subheader(f"📈 {ticker} Historical Data")
     
     try:
-        df = load_stock_data(ticker)
+        col1, col2 = st.columns(2)
+        with col1:
+            period_label = st.selectbox("Time Period", list(CHART_PERIODS), index=1)
+        default_resolution = CHART_PERIODS[period_label][0]
+        with col2:
+            resolution = st.selectbox(
+                "Bars", ["daily", "weekly", "monthly"],
+                index=["daily", "weekly", "monthly"].index(default_resolution),
+            )
         
-        if df is not None and not df.empty:
-            # Date range selector
-            col1, col2 = st.columns(2)
-            with col1:
-                days_back = st.selectbox("Time Period", [30, 60, 90, 180, 365], index=2)
-            
-            df_display = df.tail(days_back)
+        series = chart_series(ticker, resolution, period_label, data_stamp(ticker))
+        
+        if series is not None:
+            candles, volume, n_rows, recent = series
+            if len(candles) < n_rows:
+                st.caption(f"Showing {len(candles):,} candles aggregated from {n_rows:,} {resolution} bars")
             
             # Candlestick chart
             fig = go.Figure(data=[go.Candlestick(
-                x=df_display.index,
-                open=df_display['Open'],
-                high=df_display['High'],
-                low=df_display['Low'],
-                close=df_display['Close'],
+                x=candles.index,
+                open=candles['Open'],
+                high=candles['High'],
+                low=candles['Low'],
+                close=candles['Close'],
                 name='OHLC'
             )])
             
             fig.update_layout(
-                title=f"{ticker} Price Movement (Last {days_back} Days)",
+                title=f"{ticker} Price Movement ({period_label}, {resolution} bars)",
                 paper_bgcolor='rgba(0,0,0,0)',
                 plot_bgcolor='rgba(255,255,255,0.05)',
                 font=dict(color='white'),
@@ -356,8 +501,8 @@ with tab_data:
             
             # Volume chart
             fig_vol = go.Figure(data=[go.Bar(
-                x=df_display.index,
-                y=df_display['Volume'],
+                x=volume.index,
+                y=volume.values,
                 marker_color='rgba(139, 92, 246, 0.6)',
                 name='Volume'
             )])
@@ -376,7 +521,7 @@ with tab_data:
             
             # Data table
             with st.expander("📄 View Raw Data"):
-                st.dataframe(df_display.tail(20), use_container_width=True)
+                st.dataframe(recent, use_container_width=True)
         else:
             st.warning("No data available for this symbol")
             
@@ -451,3 +596,6 @@ st.markdown("""
     <p>AI Stock Oracle Pro v1.0 | Powered by TensorFlow & Streamlit</p>
 </div>
 """, unsafe_allow_html=True)
+
+if live_stream:
+    follow_stream(ticker)
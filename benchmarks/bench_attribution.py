@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Integrated gradients: one batched gradient pass over every symbol and
+interpolation step vs a Python loop with one GradientTape per symbol, step
+and head (the straightforward implementation).
+
+Builds an untrained model of the production shape, so no registry or data
+is needed. The check column compares both attributions and the
+completeness error (sum of attributions vs f(x) - f(baseline)).
+
+Run:
+    python benchmarks/bench_attribution.py
+    python benchmarks/bench_attribution.py --symbols 1 10 100 --steps 16 64 --loop-max 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.attribution import HEADS, integrated_gradients
+from src.model_builder import build_multi_task_model
+
+
+def loop_ig(model, X, steps):
+    """Per-symbol, per-step, per-head tapes; trapezoid rule like src.attribution."""
+    import tensorflow as tf
+    alphas = np.linspace(0.0, 1.0, steps + 1, dtype=np.float32)
+    weights = np.full(steps + 1, 1.0 / steps, dtype=np.float32)
+    weights[[0, -1]] /= 2
+    out = np.zeros((len(HEADS), len(X)) + X.shape[1:], dtype=np.float32)
+    for i, x in enumerate(X):
+        for a, w in zip(alphas, weights):
+            for h, head in enumerate(HEADS.values()):
+                point = tf.constant((a * x)[None])
+                with tf.GradientTape() as tape:
+                    tape.watch(point)
+                    y = model(point, training=False)[head]
+                out[h, i] += w * tape.gradient(y, point).numpy()[0]
+        out[:, i] *= x
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature attribution benchmark")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--steps", type=int, nargs="+", default=[32])
+    parser.add_argument("--features", type=int, default=18)
+    parser.add_argument("--loop-max", type=int, default=1,
+                        help="Skip the per-step loop baseline above this many symbols")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    tf.keras.utils.set_random_seed(Config.RANDOM_STATE)
+    model = build_multi_task_model((Config.SEQUENCE_LENGTH, args.features))
+    names = [f"f{j}" for j in range(args.features)]
+    rng = np.random.default_rng(0)
+    integrated_gradients(model, rng.standard_normal((1, Config.SEQUENCE_LENGTH, args.features)), names)
+
+    print(f"\n{'symbols':>7} {'steps':>5} | {'loop':>9} {'batched':>9} {'ms/symbol':>9} | "
+          f"{'speedup':>7} | completeness | same")
+    print("-" * 80)
+    for n in args.symbols:
+        X = rng.standard_normal((n, Config.SEQUENCE_LENGTH, args.features)).astype(np.float32)
+        for steps in args.steps:
+            attr = integrated_gradients(model, X, names, steps=steps)
+            t_batch = attr.seconds_per_symbol * n
+            if n <= args.loop_max:
+                t0 = time.perf_counter()
+                ref = loop_ig(model, X, steps)
+                t_loop = time.perf_counter() - t0
+                same = "✅" if np.allclose(attr.values, ref, atol=1e-5) else "❌"
+                loop, speedup = f"{t_loop:>8.2f}s", f"{t_loop / t_batch:>6.1f}x"
+            else:
+                loop, speedup, same = f"{'-':>9}", f"{'-':>7}", "-"
+            print(f"{n:>7} {steps:>5} | {loop} {t_batch:>8.2f}s {attr.seconds_per_symbol * 1e3:>9.1f} | "
+                  f"{speedup} | {np.abs(attr.delta).max():>12.5f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Trading-calendar alignment: array lookups vs per-frame reindexing.
+
+Aligns the closes of a synthetic universe onto NYSE sessions with
+TradingCalendar.align (one day-number lookup per row) and, as a baseline,
+by reindexing every frame onto the session index and stacking. Also times
+validate() (duplicates, off-calendar rows, missing sessions) per symbol.
+
+Run:
+    python benchmarks/bench_calendar.py
+    python benchmarks/bench_calendar.py --symbols 100 1000 5000 --years 15
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.synthetic_data import generate_ohlcv, synthetic_symbols
+from src.trading_calendar import get_calendar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trading calendar benchmark")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--years", type=float, default=15)
+    args = parser.parse_args()
+
+    cal = get_calendar()
+    print(f"{'symbols':>7} {'rows':>10} | {'align':>8} {'reindex':>8} | {'validate/sym':>12} | same")
+    print("-" * 62)
+    for n in args.symbols:
+        rng = np.random.default_rng(n)
+        frames = {}
+        for i, symbol in enumerate(synthetic_symbols(n)):
+            df = generate_ohlcv(args.years, seed=i)
+            frames[symbol] = df[rng.random(len(df)) > 0.01]  # ~1% missing sessions
+        rows = sum(len(df) for df in frames.values())
+
+        t0 = time.perf_counter()
+        sessions, values = cal.align(frames)
+        t_align = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        baseline = np.stack([df["Close"].reindex(sessions).to_numpy(dtype=np.float64)
+                             for df in frames.values()])
+        t_reindex = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for df in frames.values():
+            cal.validate(df.index)
+        t_validate = (time.perf_counter() - t0) / n
+
+        same = "✅" if np.array_equal(values, baseline, equal_nan=True) else "❌"
+        print(f"{n:>7,} {rows:>10,} | {t_align:>7.3f}s {t_reindex:>7.3f}s | "
+              f"{t_validate * 1e6:>10.0f}µs | {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized decision engine.
+Reports per-sample cost of `decide_batch` for N = 1 .. 1,000,000.
+
+Run:
+    python benchmarks/bench_decision_engine.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.decision_engine import decide_batch
+
+
+def time_decide(n: int, repeats: int = 5) -> float:
+    """Best-of-`repeats` wall time (seconds) for one batch of n samples."""
+    rng = np.random.default_rng(0)
+    p_tom = rng.random((n, 1), dtype=np.float32)
+    p_week = rng.random((n, 1), dtype=np.float32)
+
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        decide_batch(p_tom, p_week)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print(f"{'N':>10} | {'total (ms)':>11} | {'per sample (ns)':>15}")
+    print("-" * 44)
+    for n in [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]:
+        elapsed = time_decide(n)
+        print(f"{n:>10,} | {elapsed*1e3:>11.3f} | {elapsed/n*1e9:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Scaling of data-parallel training (train.py --distributed) on localhost:
+training throughput and efficiency for 1, 2 and 4 worker processes with a
+fixed per-worker batch.
+
+Uses a synthetic universe and does not publish a model. Efficiency is
+throughput(N) / (N × throughput(1)); it can only approach 100% when the
+machine has at least N × threads-per-worker free cores.
+
+Run:
+    python benchmarks/bench_distributed.py
+    python benchmarks/bench_distributed.py --workers 1 2 4 8 --symbols 20 --years 10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.cpu_affinity import available_cpus
+from src.distributed import train_distributed
+from src.feature_engineer import create_technical_indicators, create_targets
+from src.synthetic_data import generate_ohlcv, synthetic_symbols
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed training scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--symbols", type=int, default=6)
+    parser.add_argument("--years", type=float, default=4)
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    Config.DISTRIBUTED_DIR = ROOT / "benchmarks" / "results" / "distributed"
+    frames = {
+        symbol: create_targets(create_technical_indicators(generate_ohlcv(args.years, seed=i)))
+        for i, symbol in enumerate(synthetic_symbols(args.symbols))
+    }
+    print(f"{len(available_cpus())} CPUs | {args.symbols} symbols × {args.years:g} years | "
+          f"{args.epochs} epochs | per-worker batch {Config.BATCH_SIZE}\n")
+
+    results = {}
+    for n in args.workers:
+        results[n] = train_distributed(n, epochs=args.epochs, frames=frames, publish=False,
+                                       threads_per_worker=args.threads_per_worker)
+
+    base = results[args.workers[0]]["windows_per_sec"] / args.workers[0]
+    print(f"\n{'workers':>7} {'global batch':>12} | {'windows/s':>10} {'speedup':>8} {'efficiency':>10} | val week acc")
+    print("-" * 72)
+    for n, r in results.items():
+        speedup = r["windows_per_sec"] / (base * args.workers[0])
+        print(f"{n:>7} {r['global_batch']:>12} | {r['windows_per_sec']:>10,.0f} {speedup:>7.2f}x "
+              f"{r['windows_per_sec'] / (n * base):>9.0%} | {r['val_acc_week']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Chart downsampling: points sent to the browser vs full history.
+
+Checks that OHLC bucketing keeps the overall High/Low and total Volume and
+that LTTB keeps the largest volume spike, then times both on synthetic
+daily histories.
+
+Run:
+    python benchmarks/bench_downsample.py
+    python benchmarks/bench_downsample.py --years 1 15 100 --max-points 1500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.downsample import downsample_ohlc, lttb
+from src.synthetic_data import generate_ohlcv
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart downsampling benchmark")
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 15, 30, 100])
+    parser.add_argument("--max-points", type=int, default=Config.CHART_MAX_POINTS)
+    args = parser.parse_args()
+
+    print(f"{'years':>6} {'rows':>8} | {'candles':>8} {'volume pts':>10} | "
+          f"{'ohlc':>8} {'lttb':>8} | extremes")
+    print("-" * 72)
+    for years in args.years:
+        df = generate_ohlcv(years, seed=0)
+        candles = downsample_ohlc(df, args.max_points)
+        volume = lttb(df["Volume"], args.max_points)
+
+        kept = (
+            candles["High"].max() == df["High"].max()
+            and candles["Low"].min() == df["Low"].min()
+            and candles["Volume"].sum() == df["Volume"].sum()
+            and volume.max() == df["Volume"].max()
+        )
+        t_ohlc = best_of(lambda: downsample_ohlc(df, args.max_points))
+        t_lttb = best_of(lambda: lttb(df["Volume"], args.max_points))
+        print(f"{years:>6g} {len(df):>8,} | {len(candles):>8,} {len(volume):>10,} | "
+              f"{t_ohlc * 1e3:>6.1f}ms {t_lttb * 1e3:>6.1f}ms | {'✅' if kept else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
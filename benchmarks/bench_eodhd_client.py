@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Validate the async EODHD client against a local mock server (no API key used).
+
+The mock runs in its own process (like a remote API) and serves synthetic /api/eod/<SYMBOL>.US histories, enforces a rolling
+per-window request limit with HTTP 429 like EODHD does, and gzips responses
+when asked. The run checks that the client:
+  - never receives a 429 while running close to the allowed rate,
+  - sends one request per symbol when callers ask for the same symbol
+    concurrently (deduplication),
+  - is served gzip-compressed,
+  - stops with QuotaExceededError once the persisted daily quota is used up,
+  - shares one process-wide client between sync calls (fetch_stock_data):
+    the burst is spent once, not granted again to every call.
+
+Run:
+    python benchmarks/bench_eodhd_client.py
+    python benchmarks/bench_eodhd_client.py --symbols 500 --limit 300 --window 10
+"""
+
+import argparse
+import asyncio
+import collections
+import gzip
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.data_loader import fetch_many_async, fetch_stock_data, shared_client, EODHD_API_KEY
+from src.eodhd_client import EODHDClient, DailyQuota, QuotaExceededError, run_sync
+from src.instrumentation import snapshot, reset
+from src.synthetic_data import generate_ohlcv, synthetic_symbols
+
+
+class MockEODHD:
+    def __init__(self, limit: int, window: float, years: float):
+        self.limit = limit
+        self.window = window
+        self.recent = collections.deque()
+        self.per_symbol = collections.Counter()
+        self.throttled = 0
+        self.gzipped = 0
+        # One payload for every symbol, built up front so the mock is never the bottleneck
+        df = generate_ohlcv(years, seed=0).reset_index()
+        self.body = json.dumps([
+            {"date": d.strftime("%Y-%m-%d"), "open": o, "high": h, "low": l,
+             "close": c, "adjusted_close": a, "volume": int(v)}
+            for d, o, h, l, c, a, v in df.itertuples(index=False)
+        ]).encode()
+        self.body_gzip = gzip.compress(self.body)
+
+    async def eod(self, request: web.Request) -> web.Response:
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] >= self.window:
+            self.recent.popleft()
+        if len(self.recent) >= self.limit:
+            self.throttled += 1
+            return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+        self.recent.append(now)
+
+        symbol = request.match_info["symbol"]
+        self.per_symbol[symbol] += 1
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            self.gzipped += 1
+            return web.Response(body=self.body_gzip, content_type="application/json",
+                                headers={"Content-Encoding": "gzip"})
+        return web.Response(body=self.body, content_type="application/json")
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "per_symbol": dict(self.per_symbol),
+            "throttled": self.throttled,
+            "gzipped": self.gzipped,
+        })
+
+
+def run_mock(limit: int, window: float, years: float, port: int) -> None:
+    mock = MockEODHD(limit, window, years)
+    app = web.Application()
+    app.router.add_get("/api/eod/{symbol}", mock.eod)
+    app.router.add_get("/stats", mock.stats)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+async def mock_stats(port: int) -> dict:
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):  # wait for the server process to come up
+            try:
+                async with session.get(f"http://127.0.0.1:{port}/stats") as resp:
+                    return await resp.json()
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("Mock EODHD server did not start")
+
+
+async def main_async(args) -> bool:
+    await mock_stats(args.port)
+    base_url = f"http://127.0.0.1:{args.port}/api"
+    symbols = synthetic_symbols(args.symbols)
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DATA_RAW_DIR = Path(tmp) / "raw"
+        Config.DATA_PROCESSED_DIR = Path(tmp) / "processed"
+        quota = DailyQuota(Path(tmp) / "quota.json", limit=10 * args.symbols)
+
+        # 1) Raw downloads: the limiter alone should keep us just under the limit
+        reset()
+        async with EODHDClient(EODHD_API_KEY, base_url=base_url, requests_per_minute=args.limit,
+                               window_seconds=args.window, quota=quota) as client:
+            t0 = time.perf_counter()
+            await asyncio.gather(*(client.get_eod(f"{s}.US") for s in symbols))
+            elapsed = time.perf_counter() - t0
+            rate = args.symbols / elapsed * args.window
+
+            # 2) Three callers asking for the same symbols at the same time
+            extra = synthetic_symbols(args.symbols + 20)[-20:]
+            await asyncio.gather(*(client.get_eod(f"{s}.US") for s in extra * 3))
+        counters = snapshot()["counters"]
+        mock = await mock_stats(args.port)
+        sent = sum(mock["per_symbol"].values())
+        print(f"📥 {args.symbols} downloads in {elapsed:.1f}s "
+              f"({rate:.0f} req/{args.window:g}s, limit {args.limit})")
+        print(f"   server requests: {sent}, "
+              f"deduplicated: {counters.get('eodhd_deduplicated', 0):g}, "
+              f"429s: {mock['throttled']}, gzip responses: {mock['gzipped']}, "
+              f"limiter waits: {counters.get('eodhd_rate_limited_waits', 0):g}")
+        print(f"   quota used: {quota.used()}/{quota.limit}")
+
+        checks = [
+            ("no 429 responses", mock["throttled"] == 0),
+            ("one request per symbol (deduplicated)", set(mock["per_symbol"].values()) == {1}),
+            ("gzip-compressed responses", mock["gzipped"] == sent),
+            ("quota matches requests", quota.used() == sent),
+            ("rate within 20% of the limit", rate >= 0.8 * args.limit or elapsed < args.window),
+        ]
+
+        # End-to-end refresh (download + parse + CSV cache); CPU-bound on small machines
+        async with EODHDClient(EODHD_API_KEY, base_url=base_url, requests_per_minute=args.limit,
+                               window_seconds=args.window, quota=quota) as client:
+            t0 = time.perf_counter()
+            results = await fetch_many_async(symbols, client=client)
+            elapsed = time.perf_counter() - t0
+        failures = [s for s, r in results.items() if isinstance(r, Exception)]
+        print(f"💾 {args.symbols} symbols fetched + cached in {elapsed:.1f}s "
+              f"({args.symbols / elapsed:.1f} symbols/s)")
+        checks.append(("no fetch failures", not failures))
+        mock = await mock_stats(args.port)
+        sent = sum(mock["per_symbol"].values())
+
+        # 3) Daily quota exhaustion stops before sending
+        small = DailyQuota(Path(tmp) / "quota-small.json", limit=3)
+        before = sent
+        async with EODHDClient(EODHD_API_KEY, base_url=base_url, requests_per_minute=args.limit,
+                               window_seconds=args.window, quota=small) as client:
+            results = await fetch_many_async(synthetic_symbols(args.symbols + 5)[-5:], client=client)
+        blocked = sum(isinstance(r, QuotaExceededError) for r in results.values())
+        mock = await mock_stats(args.port)
+        sent = sum(mock["per_symbol"].values()) - before
+        checks.append(("quota blocks requests beyond the daily limit", blocked == 2 and sent == 3))
+
+        # 4) Sequential sync fetches go through the process-wide client
+        Config.EODHD_BASE_URL = base_url
+        Config.EODHD_REQUESTS_PER_MINUTE = args.limit  # per minute: the burst refills slowly
+        Config.EODHD_QUOTA_PATH = Path(tmp) / "quota-shared.json"
+        reset()
+        calls = Config.EODHD_BURST + 3
+        for s in synthetic_symbols(args.symbols + 5 + calls)[-calls:]:
+            fetch_stock_data(s)
+        waits = snapshot()["counters"].get("eodhd_rate_limited_waits", 0)
+        same = run_sync(shared_client()) is run_sync(shared_client())
+        print(f"🔁 {calls} sequential fetch_stock_data calls: limiter waits {waits:g} "
+              f"(burst {Config.EODHD_BURST})")
+        checks.append(("sync calls share one client and token bucket", same and waits > 0))
+
+    print()
+    for name, passed in checks:
+        print(f"{'✅' if passed else '❌'} {name}")
+        ok &= passed
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async EODHD client vs mock server")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100, help="Requests allowed per window")
+    parser.add_argument("--window", type=float, default=5.0, help="Rate-limit window in seconds")
+    parser.add_argument("--years", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = mp.Process(target=run_mock, args=(args.limit, args.window, args.years, args.port), daemon=True)
+    server.start()
+    try:
+        ok = asyncio.run(main_async(args))
+    finally:
+        server.terminate()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Memory of N serving workers: shared feature panel vs per-process features.
+
+Each worker reads the feature rows of every symbol in a synthetic universe,
+either from the memory-mapped panel or by loading CSVs and computing
+features itself, then reports its PSS (proportional set size: shared pages
+are split between the processes mapping them). With the panel, total PSS
+should stay roughly flat as workers are added.
+
+Run:
+    python benchmarks/bench_feature_panel.py
+    python benchmarks/bench_feature_panel.py --symbols 1000 --years 15 --workers 1 2 4 8
+
+Linux only (reads /proc/self/smaps_rollup).
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.feature_engineer import create_technical_indicators, create_targets, feature_columns
+from src.feature_panel import build_panel, get_panel
+from src.synthetic_data import write_universe, synthetic_symbols
+
+
+def pss_mb() -> float:
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        if line.startswith("Pss:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError("Pss not found in /proc/self/smaps_rollup")
+
+
+def worker(mode: str, raw_dir: str, panel_dir: str, symbols: list, ready, done, out):
+    Config.DATA_RAW_DIR = Path(raw_dir)
+    Config.FEATURE_PANEL_DIR = Path(panel_dir)
+    base = pss_mb()
+
+    held = []
+    if mode == "panel":
+        panel = get_panel()
+        for symbol in symbols:
+            _, X = panel.symbol_rows(symbol, tail=Config.SEQUENCE_LENGTH + 1)
+            held.append(X)
+        # Fault in every page, as a long-running server eventually would
+        checksum = float(np.nansum(panel.values[:, -1, 0]))
+        for i in range(len(symbols)):
+            checksum += float(np.nansum(panel.values[i]))
+    else:
+        for symbol in symbols:
+            df = create_targets(create_technical_indicators(load_stock_data(symbol)))
+            held.append(df[feature_columns(df)].to_numpy(dtype="float32"))
+
+    ready.wait()  # all workers resident before anyone measures
+    out.put(pss_mb() - base)
+    done.wait()
+
+
+def measure(mode: str, n_workers: int, raw_dir: Path, panel_dir: Path, symbols: list) -> float:
+    ctx = mp.get_context("fork")
+    ready, done = ctx.Barrier(n_workers + 1), ctx.Event()
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(mode, str(raw_dir), str(panel_dir), symbols, ready, done, out))
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    ready.wait()
+    total = sum(out.get() for _ in procs)
+    done.set()
+    for p in procs:
+        p.join()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared feature panel memory benchmark")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--years", type=float, default=15)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    raw_dir = Config.DATA_PROCESSED_DIR / "synthetic" / f"{args.symbols}sym-{args.years:g}y-seed0"
+    if not (raw_dir / ".complete").exists():
+        print(f"🧪 Generating {args.symbols:,} symbols × {args.years:g} years...")
+        write_universe(raw_dir, args.symbols, args.years, seed=0)
+        (raw_dir / ".complete").touch()
+    panel_dir = raw_dir / "panel"
+    symbols = synthetic_symbols(args.symbols)
+
+    Config.DATA_RAW_DIR = raw_dir
+    Config.FEATURE_PANEL_DIR = panel_dir
+    build_panel(symbols)
+    size_mb = get_panel().values.nbytes / 2**20
+    print(f"\n📦 Panel: {size_mb:.1f} MB")
+
+    print(f"\n{'workers':>8} | {'per-process PSS':>16} | {'shared panel PSS':>17}")
+    print("-" * 48)
+    for n in args.workers:
+        private = measure("private", n, raw_dir, panel_dir, symbols)
+        shared = measure("panel", n, raw_dir, panel_dir, symbols)
+        print(f"{n:>8} | {private:>13.1f} MB | {shared:>14.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter search throughput: the same trials run by one process using
+every CPU vs several pinned workers sharing the memory-mapped dataset.
+
+Uses a synthetic universe, so no API key or data cache is needed. On a
+many-core box compare e.g. `--layouts 1x16 4x4 8x2`.
+
+Run:
+    python benchmarks/bench_hparam_search.py
+    python benchmarks/bench_hparam_search.py --layouts 1x8 4x2 8x1 --trials 16
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.feature_engineer import create_technical_indicators, create_targets
+from src.hparam_search import run_search
+from src.synthetic_data import generate_ohlcv, synthetic_symbols
+
+
+def main():
+    n_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    parser = argparse.ArgumentParser(description="Hyperparameter search benchmark")
+    parser.add_argument("--layouts", nargs="+",
+                        default=[f"1x{n_cpus}", f"{n_cpus}x1"] if n_cpus > 1 else ["1x1", "2x1"],
+                        help="WORKERSxTHREADS per run")
+    parser.add_argument("--trials", type=int, default=4)
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--folds", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=2)
+    args = parser.parse_args()
+
+    Config.SEARCH_DIR = ROOT / "benchmarks" / "results" / "search"
+    frames = {
+        symbol: create_targets(create_technical_indicators(generate_ohlcv(args.years, seed=i)))
+        for i, symbol in enumerate(synthetic_symbols(args.symbols))
+    }
+    print(f"{n_cpus} CPUs | {args.trials} trials × {args.folds} folds × {args.epochs} epochs | "
+          f"{args.symbols} symbols × {args.years:g} years\n")
+
+    rows = []
+    for layout in args.layouts:
+        workers, threads = (int(v) for v in layout.split("x"))
+        t0 = time.perf_counter()
+        board, run_dir = run_search(frames=frames, n_trials=args.trials, n_folds=args.folds,
+                                    workers=workers, threads_per_worker=threads,
+                                    epochs=args.epochs, prune=False)
+        seconds = time.perf_counter() - t0
+        dataset_mb = sum(f.stat().st_size for f in (run_dir / "dataset").iterdir()) / 1e6
+        rows.append((layout, seconds, len(board), dataset_mb))
+
+    print(f"\n{'layout':>8} | {'wall':>8} {'trials/min':>10} | shared dataset")
+    print("-" * 50)
+    for layout, seconds, n, mb in rows:
+        print(f"{layout:>8} | {seconds:>7.1f}s {n / seconds * 60:>10.2f} | {mb:.1f} MB mapped once")
+    base = rows[0][1]
+    for layout, seconds, _, _ in rows[1:]:
+        print(f"{layout} vs {rows[0][0]}: {base / seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
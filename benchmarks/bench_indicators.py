@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Indicator backend equivalence check and speedup benchmark.
+Verifies the array kernels match the pandas implementation, then times
+create_technical_indicators per backend on long synthetic histories.
+
+Run:
+    python benchmarks/bench_indicators.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.feature_engineer import create_technical_indicators
+from src.indicator_kernels import numba
+from src.synthetic_data import generate_ohlcv
+
+BACKENDS = ["pandas", "numpy"] + (["numba"] if numba is not None else [])
+
+
+def check_equivalence(years: float = 15, seeds=range(5)) -> None:
+    """Kernel output must match pandas to float32 precision."""
+    for seed in seeds:
+        df = generate_ohlcv(years, seed=seed)
+        ref = create_technical_indicators(df, backend="pandas")
+        for backend in BACKENDS[1:]:
+            out = create_technical_indicators(df, backend=backend)
+            assert out.index.equals(ref.index), f"{backend}: index differs"
+            assert list(out.columns) == list(ref.columns), f"{backend}: columns differ"
+            for col in ref.columns:
+                np.testing.assert_allclose(
+                    out[col].to_numpy(np.float64), ref[col].to_numpy(np.float64),
+                    rtol=1e-5, atol=1e-6, err_msg=f"{backend}: {col}",
+                )
+    print(f"✅ Equivalent to pandas: {', '.join(BACKENDS[1:])}")
+
+
+def best_time(fn, repeats: int = 5) -> float:
+    fn()  # warm-up (JIT compile, caches)
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    check_equivalence()
+    if numba is None:
+        print("ℹ️ numba not installed - skipping the fused JIT backend")
+
+    header = f"{'years':>6} {'rows':>8} | " + " | ".join(f"{b:>10}" for b in BACKENDS) + " | speedup"
+    print("\n" + header)
+    print("-" * len(header))
+    for years in [1, 15, 30, 100]:
+        df = generate_ohlcv(years, seed=0)
+        times = {b: best_time(lambda: create_technical_indicators(df, backend=b)) for b in BACKENDS}
+        fastest = min(times, key=times.get)
+        print(
+            f"{years:>6} {len(df):>8,} | "
+            + " | ".join(f"{times[b]*1e3:>8.2f}ms" for b in BACKENDS)
+            + f" | {times['pandas'] / times[fastest]:.1f}x ({fastest})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Intraday store: partitioned reads and streaming features vs one DataFrame.
+
+For synthetic 1-minute histories of increasing length, writes the bars to a
+temporary partitioned store, then reports
+- the time to read one week (only its partition) vs the whole history,
+- peak traced memory of features + 60-bar windows built partition by
+  partition (iter_windows) vs on the concatenated frame (make_sequences),
+- that both paths produce the same windows.
+
+Run:
+    python benchmarks/bench_intraday.py
+    python benchmarks/bench_intraday.py --months 1 3 6 --no-full
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.feature_engineer import (
+    build_feature_matrix,
+    create_targets,
+    create_technical_indicators,
+    make_sequences,
+)
+from src.intraday_store import fit_scaler, iter_windows, list_partitions, load_bars, write_bars
+from src.synthetic_data import generate_intraday
+
+SYMBOL = "SYN0000"
+INTERVAL = "1m"
+
+
+def peak_mb(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, peak, seconds
+
+
+def streamed(scaler):
+    n, checksum = 0, 0.0
+    for X_seq, *_ in iter_windows(SYMBOL, INTERVAL, scaler):
+        n += len(X_seq)
+        checksum += float(X_seq[:, -1, :].sum(dtype=np.float64))
+    return n, checksum
+
+
+def whole_frame(scaler):
+    df = create_targets(create_technical_indicators(load_bars(SYMBOL, INTERVAL)))
+    X, *ys, _ = build_feature_matrix(df, scaler=scaler)
+    X_seq = make_sequences(X, *ys, seq_len=Config.SEQUENCE_LENGTH)[0]
+    return len(X_seq), float(X_seq[:, -1, :].sum(dtype=np.float64))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intraday store benchmark")
+    parser.add_argument("--months", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--no-full", action="store_true",
+                        help="Skip the whole-frame baseline (it holds every window in memory)")
+    args = parser.parse_args()
+
+    print(f"{'months':>6} {'bars':>9} {'parts':>5} | {'week read':>9} {'full read':>9} | "
+          f"{'stream MB':>9} {'full MB':>8} | {'stream s':>8} {'full s':>7} | same")
+    print("-" * 96)
+    for months in args.months:
+        with tempfile.TemporaryDirectory() as tmp:
+            Config.INTRADAY_DIR = Path(tmp)
+            bars = generate_intraday(days=21 * months, minutes=1, seed=months)
+            write_bars(SYMBOL, INTERVAL, bars)
+            last = bars.index[-1].normalize()
+            week = (last - np.timedelta64(6, "D"), last + np.timedelta64(1, "D"))
+
+            t0 = time.perf_counter()
+            load_bars(SYMBOL, INTERVAL, *week)
+            t_week = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            load_bars(SYMBOL, INTERVAL)
+            t_full = time.perf_counter() - t0
+
+            scaler = fit_scaler(SYMBOL, INTERVAL)
+            (n_s, sum_s), mb_s, sec_s = peak_mb(lambda: streamed(scaler))
+            if args.no_full:
+                mb_f = sec_f = float("nan")
+                same = "-"
+            else:
+                (n_f, sum_f), mb_f, sec_f = peak_mb(lambda: whole_frame(scaler))
+                same = "✅" if n_s == n_f and np.isclose(sum_s, sum_f, rtol=1e-6) else "❌"
+
+            print(f"{months:>6} {len(bars):>9,} {len(list_partitions(SYMBOL, INTERVAL)):>5} | "
+                  f"{t_week * 1e3:>7.1f}ms {t_full * 1e3:>7.1f}ms | "
+                  f"{mb_s:>9.1f} {mb_f:>8.1f} | {sec_s:>8.2f} {sec_f:>7.2f} | {same}")
+
+
+if __name__ == "__main__":
+    main()
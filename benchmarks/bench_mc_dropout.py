@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo dropout: one tiled forward call vs K separate predict calls
+(the cost the batched mode replaces).
+
+Builds an untrained model of the production shape, so no registry or data
+is needed.
+
+Run:
+    python benchmarks/bench_mc_dropout.py
+    python benchmarks/bench_mc_dropout.py --passes 10 50 100 --windows 1 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.model_builder import build_multi_task_model
+from src.uncertainty import mc_dropout_predict
+
+
+def median_time(fn, repeat: int = 5) -> float:
+    fn()  # warm-up / tracing
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MC dropout benchmark")
+    parser.add_argument("--passes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--features", type=int, default=18)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    tf.keras.utils.set_random_seed(Config.RANDOM_STATE)
+    model = build_multi_task_model((Config.SEQUENCE_LENGTH, args.features))
+    rng = np.random.default_rng(0)
+
+    print(f"\n{'windows':>7} {'passes':>7} | {'K x predict':>12} {'batched':>10} | speedup")
+    print("-" * 55)
+    for n in args.windows:
+        X = rng.standard_normal((n, Config.SEQUENCE_LENGTH, args.features)).astype(np.float32)
+        for k in args.passes:
+            t_loop = median_time(lambda: [model.predict(X, verbose=0) for _ in range(k)], repeat=3)
+            t_batch = median_time(lambda: mc_dropout_predict(model, X, passes=k))
+            print(f"{n:>7} {k:>7} | {t_loop * 1e3:>10.1f}ms {t_batch * 1e3:>8.1f}ms | "
+                  f"{t_loop / t_batch:6.1f}x")
+
+    est = mc_dropout_predict(model, X[:1], passes=max(args.passes))
+    print(f"\nSpread is non-zero (dropout active): {'✅' if (est.std > 0).all() else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
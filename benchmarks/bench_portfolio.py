@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Portfolio construction speed and constraint checks.
+
+For random universes, times one rebalance (target_weights with uncertainty
+and a turnover limit) and a one-year weekly simulation over a synthetic
+dates × symbols panel of model outputs, and checks the per-name cap, gross
+exposure and turnover limit on every rebalance.
+
+Run:
+    python benchmarks/bench_portfolio.py
+    python benchmarks/bench_portfolio.py --symbols 1000 5000 20000 --max-weight 0.01
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.portfolio import simulate, target_weights
+from src.synthetic_data import synthetic_symbols
+
+
+def synthetic_outputs(n_symbols: int, n_dates: int, seed: int = 0) -> dict:
+    """Validation-output layout with a weakly informative P(week UP)."""
+    rng = np.random.default_rng(seed)
+    n = n_symbols * n_dates
+    realized = rng.normal(0, 0.03, n)
+    p = np.clip(0.5 + 2.0 * realized + rng.normal(0, 0.08, n), 0.01, 0.99)
+    return {
+        "symbol": np.repeat(np.array(synthetic_symbols(n_symbols)), n_dates),
+        "date": np.tile(np.datetime64("2024-01-01") + np.arange(n_dates), n_symbols),
+        "p_week_up": p.astype(np.float32),
+        "ret_week": (realized + rng.normal(0, 0.03, n)).astype(np.float32),
+        "y_week_ret": realized.astype(np.float32),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio construction benchmark")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--max-weight", type=float, default=0.02)
+    parser.add_argument("--max-turnover", type=float, default=0.5)
+    parser.add_argument("--dates", type=int, default=252)
+    args = parser.parse_args()
+
+    print(f"{'symbols':>7} | {'rebalance':>9} | {'simulate':>8} {'rebal.':>6} | {'names':>6} {'gross':>5} "
+          f"| constraints")
+    print("-" * 70)
+    for n in args.symbols:
+        rng = np.random.default_rng(n)
+        prev = target_weights(rng.uniform(0.3, 0.7, n), rng.normal(0, 0.03, n), max_weight=args.max_weight)
+        p, r, u = rng.uniform(0.3, 0.7, n), rng.normal(0, 0.03, n), rng.uniform(0, 0.1, n)
+        timings = []
+        for _ in range(5):
+            t0 = time.perf_counter()
+            w = target_weights(p, r, u, prev_weights=prev, max_weight=args.max_weight,
+                               max_turnover=args.max_turnover)
+            timings.append(time.perf_counter() - t0)
+        ok = (np.abs(w).max() <= args.max_weight + 1e-12
+              and np.abs(w).sum() <= 1 + 1e-9
+              and np.abs(w - prev).sum() <= args.max_turnover + 1e-9)
+
+        outputs = synthetic_outputs(n, args.dates, seed=n)
+        t0 = time.perf_counter()
+        history, _ = simulate(outputs, max_weight=args.max_weight, max_turnover=args.max_turnover)
+        t_sim = time.perf_counter() - t0
+        ok = ok and (history["gross"] <= 1 + 1e-9).all() and (history["turnover"] <= args.max_turnover + 1e-9).all()
+        print(f"{n:>7,} | {min(timings) * 1e3:>7.2f}ms | {t_sim:>7.2f}s {len(history):>6} | "
+              f"{int((w != 0).sum()):>6,} {np.abs(w).sum():>5.2f} | {'✅' if ok else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Streaming updates: re-scoring only symbols with new bars on a bounded
+indicator tail vs recomputing every symbol from its full history, plus
+SSE push latency.
+
+A synthetic universe is written to a temporary CSV cache and scored by an
+untrained model of the production shape (no registry needed). Then one bar
+is appended to `--changed` symbols and the worker's poll is timed against a
+full recompute of the universe (what each session did on every refresh).
+The check column compares the streamed P(week UP) with the full-history
+path. Finally events are published to local SSE subscribers and the
+publish -> receive latency is reported.
+
+Run:
+    python benchmarks/bench_stream.py
+    python benchmarks/bench_stream.py --symbols 50 500 --changed 1 10 --years 15
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.distill import serving_forward
+from src.feature_engineer import create_targets, create_technical_indicators, feature_columns
+from src.model_builder import build_multi_task_model
+from src.model_metrics import LEGACY_METRICS
+from src.model_registry import ModelBundle
+from src.signal_stream import SignalHub, StreamSubscriber, StreamWorker, serve_stream
+from src.synthetic_data import write_universe
+
+
+class FixedModel:
+    """HotSwapModel stand-in serving one bundle."""
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+
+    def get(self):
+        return self.bundle
+
+
+def score(bundle, symbols, X_seq, prices):
+    import tensorflow as tf
+    out = serving_forward(bundle.model)(tf.constant(X_seq, dtype=tf.float32))
+    return [{"symbol": s, "p_week_up": float(p), "current_price": price}
+            for s, p, price in zip(symbols, out[1].numpy().reshape(-1), prices)]
+
+
+def full_recompute(bundle, symbols):
+    """Every symbol from its whole history, then one batched call."""
+    windows = []
+    for symbol in symbols:
+        df = create_targets(create_technical_indicators(load_stock_data(symbol), symbol=symbol))
+        X_raw = df[feature_columns(df)].to_numpy(dtype="float32")
+        windows.append(bundle.scalers[symbol].transform(X_raw[-Config.SEQUENCE_LENGTH - 1:-1])[np.newaxis])
+    return score(bundle, symbols, np.concatenate(windows), [0.0] * len(symbols))
+
+
+def append_bar(symbol: str) -> None:
+    path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+    df = pd.read_csv(path, index_col="Date", parse_dates=True)
+    row = df.iloc[[-1]].copy()
+    row.index = [df.index[-1] + pd.offsets.BDay(1)]
+    row[["Open", "High", "Low", "Close", "Adj Close"]] *= 1.01
+    pd.concat([df, row]).rename_axis("Date").to_csv(path)
+
+
+def push_latency(events: int, subscribers: int, port: int) -> float:
+    hub = SignalHub()
+    server = serve_stream(hub, port=port)
+    subs = [StreamSubscriber(f"http://localhost:{port}").start() for _ in range(subscribers)]
+    while hub.subscribers < subscribers:
+        time.sleep(0.01)
+    latencies = []
+    for i in range(1, events + 1):
+        t0 = time.perf_counter()
+        hub.publish([{"symbol": "SYN0000", "seq": i}])
+        for sub in subs:
+            sub.wait(i - 1, timeout=5)
+        latencies.append(time.perf_counter() - t0)
+    server.shutdown()
+    return float(np.median(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming signal benchmark")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--changed", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--years", type=float, default=15)
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--features", type=int, default=18)
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    tf.keras.utils.set_random_seed(Config.RANDOM_STATE)
+    model = build_multi_task_model((Config.SEQUENCE_LENGTH, args.features))
+    for batch in (1, 2, 3):  # trace once for a variable batch size (serving does this on its first calls)
+        serving_forward(model)(tf.zeros((batch, Config.SEQUENCE_LENGTH, args.features)))
+
+    print(f"\n{'symbols':>7} {'changed':>7} | {'cold start':>10} {'stream poll':>11} {'full':>8} | "
+          f"{'speedup':>7} | max |ΔP| vs full")
+    print("-" * 82)
+    for n in args.symbols:
+        with tempfile.TemporaryDirectory() as tmp:
+            Config.DATA_RAW_DIR = Path(tmp)
+            symbols = write_universe(Path(tmp), n, args.years)
+            scalers = {}
+            for s in symbols:
+                df = create_targets(create_technical_indicators(load_stock_data(s), symbol=s))
+                scalers[s] = StandardScaler().fit(df[feature_columns(df)].to_numpy(dtype="float32"))
+            bundle = ModelBundle(version="bench", model=model, scalers=scalers, metrics=dict(LEGACY_METRICS))
+            hub = SignalHub()
+            worker = StreamWorker(symbols, FixedModel(bundle), score, hub)
+            t0 = time.perf_counter()
+            worker.run_once()
+            t_cold = time.perf_counter() - t0
+
+            for k in args.changed:
+                changed = symbols[:k]
+                for s in changed:
+                    append_bar(s)
+                t0 = time.perf_counter()
+                rescored = worker.run_once()
+                t_stream = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                reference = full_recompute(bundle, symbols)
+                t_full = time.perf_counter() - t0
+                live = {d["symbol"]: d["p_week_up"] for _, d in hub.snapshot()}
+                diff = max(abs(live[r["symbol"]] - r["p_week_up"]) for r in reference)
+                ok = "✅" if sorted(rescored) == sorted(changed) and diff < 1e-4 else "❌"
+                print(f"{n:>7} {k:>7} | {t_cold:>9.2f}s {t_stream:>10.3f}s {t_full:>7.2f}s | "
+                      f"{t_full / t_stream:>6.1f}x | {diff:.2e} {ok}")
+
+    latency = push_latency(100, args.subscribers, args.port)
+    print(f"\n📡 SSE publish -> {args.subscribers} subscribers received: median {latency * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Serving throughput of the multi-task LSTM vs each distilled student
+architecture at batch sizes 1-1024 (compiled forward pass).
+
+Builds untrained models of the production shape, so no registry or data
+is needed; agreement with the teacher is reported by distill.py.
+
+Run:
+    python benchmarks/bench_student.py
+    python benchmarks/bench_student.py --batches 1 32 512 --seconds 1
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.distill import BATCH_SIZES, STUDENT_KINDS, build_student, throughput
+from src.model_builder import build_multi_task_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Student vs teacher throughput")
+    parser.add_argument("--batches", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--features", type=int, default=18)
+    parser.add_argument("--seconds", type=float, default=0.5, help="Timing budget per batch size")
+    args = parser.parse_args()
+
+    shape = (Config.SEQUENCE_LENGTH, args.features)
+    models = {"teacher": build_multi_task_model(shape, summary=False)}
+    models.update({kind: build_student(shape, kind) for kind in STUDENT_KINDS})
+    rates = {name: throughput(m, args.features, args.batches, args.seconds) for name, m in models.items()}
+
+    print(f"\n{'model':>8} {'params':>8} | " + " ".join(f"{f'b={b}':>10}" for b in args.batches)
+          + "   (windows/s)")
+    print("-" * (21 + 11 * len(args.batches)))
+    for name, model in models.items():
+        print(f"{name:>8} {model.count_params():>8,} | "
+              + " ".join(f"{rates[name][b]:>10,.0f}" for b in args.batches))
+    print()
+    for kind in STUDENT_KINDS:
+        print(f"{kind:>8} speedup | " + " ".join(
+            f"{rates[kind][b] / rates['teacher'][b]:>9.1f}x" for b in args.batches))
+
+
+if __name__ == "__main__":
+    main()
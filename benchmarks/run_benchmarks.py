@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Reproducible pipeline benchmarks on synthetic market data (no network).
+
+Generates GBM OHLCV histories for each (symbols × years) case, then times
+load_stock_data, create_technical_indicators, create_targets,
+build_feature_matrix and make_sequences over the whole universe, plus one
+training epoch and single/batched inference on a capped window sample.
+Throughput and peak traced memory go to a JSON file tagged with the git
+commit, so runs can be compared across commits.
+
+Run:
+    python benchmarks/run_benchmarks.py                       # 10,100 symbols × 1,15 years
+    python benchmarks/run_benchmarks.py --symbols 5000 --years 30 --no-tf
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+
+Timings include tracemalloc overhead unless --no-memory is given.
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.feature_engineer import (
+    create_technical_indicators,
+    create_targets,
+    build_feature_matrix,
+    make_sequences,
+)
+from src.synthetic_data import write_universe
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+REGRESSION_RATIO = 1.2  # flag stages that got >20% slower
+
+
+class StageStats:
+    def __init__(self):
+        self.seconds = 0.0
+        self.rows = 0
+        self.peak_bytes = 0
+
+    def as_dict(self, stage: str, n_symbols: int, years: float) -> dict:
+        return {
+            "stage": stage,
+            "symbols": n_symbols,
+            "years": years,
+            "rows": self.rows,
+            "seconds": self.seconds,
+            "rows_per_sec": self.rows / self.seconds if self.seconds > 0 else None,
+            "peak_mb": self.peak_bytes / 2**20 if self.peak_bytes else None,
+        }
+
+
+def measure(stats: StageStats, rows: int, trace_memory: bool, fn, *args, **kwargs):
+    """Run fn once, adding its wall time, rows and traced peak to stats."""
+    if trace_memory:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    stats.seconds += time.perf_counter() - t0
+    stats.rows += rows
+    if trace_memory:
+        stats.peak_bytes = max(stats.peak_bytes, tracemalloc.get_traced_memory()[1] - base)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def universe_dir(n_symbols: int, years: float, seed: int) -> Path:
+    """Generate (or reuse) a synthetic universe under data/processed/synthetic/."""
+    path = Config.DATA_PROCESSED_DIR / "synthetic" / f"{n_symbols}sym-{years:g}y-seed{seed}"
+    marker = path / ".complete"
+    if not marker.exists():
+        print(f"🧪 Generating {n_symbols:,} symbols × {years:g} years...")
+        write_universe(path, n_symbols, years, seed)
+        marker.touch()
+    return path
+
+
+def bench_data_pipeline(n_symbols: int, years: float, seed: int, trace_memory: bool,
+                        keep_windows: int) -> tuple:
+    """Stream every symbol through the feature pipeline. Returns (results, sample windows)."""
+    data_dir = universe_dir(n_symbols, years, seed)
+    stats = {s: StageStats() for s in [
+        "load_stock_data", "create_technical_indicators", "create_targets",
+        "build_feature_matrix", "make_sequences",
+    ]}
+    kept_X, kept_y = [], []
+
+    original_dir = Config.DATA_RAW_DIR
+    Config.DATA_RAW_DIR = data_dir
+    try:
+        for symbol in sorted(p.name[:-len("_raw.csv")] for p in data_dir.glob("*_raw.csv")):
+            df = measure(stats["load_stock_data"], 0, trace_memory, load_stock_data, symbol)
+            stats["load_stock_data"].rows += len(df)
+            df = measure(stats["create_technical_indicators"], len(df), trace_memory,
+                         create_technical_indicators, df)
+            df = measure(stats["create_targets"], len(df), trace_memory, create_targets, df)
+            X, y1, y2, y3, y4, _ = measure(stats["build_feature_matrix"], len(df), trace_memory,
+                                           build_feature_matrix, df)
+            seqs = measure(stats["make_sequences"], len(X), trace_memory, make_sequences,
+                           X, y1, y2, y3, y4, seq_len=Config.SEQUENCE_LENGTH)
+
+            if sum(len(x) for x in kept_X) < keep_windows:
+                kept_X.append(seqs[0])
+                kept_y.append(seqs[1:])
+            del df, X, seqs
+    finally:
+        Config.DATA_RAW_DIR = original_dir
+
+    results = [s.as_dict(name, n_symbols, years) for name, s in stats.items()]
+    X_sample = np.concatenate(kept_X)[:keep_windows]
+    y_sample = [np.concatenate([y[i] for y in kept_y])[:keep_windows] for i in range(4)]
+    return results, X_sample, y_sample
+
+
+def bench_model(X: np.ndarray, y: list, n_symbols: int, years: float) -> list:
+    """One training epoch plus single and batched inference."""
+    import tensorflow as tf
+    from src.model_builder import build_multi_task_model
+
+    tf.keras.utils.set_random_seed(Config.RANDOM_STATE)
+    model = build_multi_task_model((X.shape[1], X.shape[2]))
+    results = []
+
+    # Warm-up traces the train/predict functions so we time steady state
+    model.fit(X[:Config.BATCH_SIZE], [t[:Config.BATCH_SIZE] for t in y], epochs=1, verbose=0)
+    t0 = time.perf_counter()
+    model.fit(X, y, epochs=1, batch_size=Config.BATCH_SIZE, verbose=0)
+    elapsed = time.perf_counter() - t0
+    results.append({"stage": "training_epoch", "symbols": n_symbols, "years": years,
+                    "rows": len(X), "seconds": elapsed, "rows_per_sec": len(X) / elapsed,
+                    "peak_mb": None})
+
+    for batch in [1, 1024]:
+        xb = X[:batch]
+        model.predict(xb, verbose=0)
+        timings = []
+        for _ in range(20 if batch == 1 else 5):
+            t0 = time.perf_counter()
+            model.predict(xb, batch_size=batch, verbose=0)
+            timings.append(time.perf_counter() - t0)
+        elapsed = float(np.median(timings))
+        results.append({"stage": f"inference_batch_{batch}", "symbols": n_symbols, "years": years,
+                        "rows": len(xb), "seconds": elapsed, "rows_per_sec": len(xb) / elapsed,
+                        "peak_mb": None})
+    return results
+
+
+def compare(current: list, previous_path: Path) -> None:
+    previous = json.loads(previous_path.read_text())
+    old = {(r["stage"], r["symbols"], r["years"]): r for r in previous["results"]}
+    print(f"\n📊 Compared with {previous_path.name} (commit {previous['meta']['git_commit']})")
+    for r in current:
+        key = (r["stage"], r["symbols"], r["years"])
+        if key not in old or not old[key]["seconds"]:
+            continue
+        ratio = r["seconds"] / old[key]["seconds"]
+        flag = "❌ REGRESSION" if ratio > REGRESSION_RATIO else ""
+        print(f"  {r['stage']:<28} {r['symbols']:>5} sym {r['years']:>4g}y  {ratio:6.2f}x {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmarks on synthetic data")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 15])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--train-windows", type=int, default=20_000,
+                        help="Cap on windows used for the training/inference stages")
+    parser.add_argument("--no-tf", action="store_true", help="Skip training/inference stages")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak tracking")
+    parser.add_argument("--out", type=Path, help="Results file (default benchmarks/results/...)")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    trace_memory = not args.no_memory
+    if trace_memory:
+        tracemalloc.start()
+
+    results = []
+    for n_symbols in args.symbols:
+        for years in args.years:
+            print(f"\n⏱️ {n_symbols:,} symbols × {years:g} years")
+            data_results, X, y = bench_data_pipeline(
+                n_symbols, years, args.seed, trace_memory, args.train_windows
+            )
+            results += data_results
+            if not args.no_tf and len(X) > 0:
+                results += bench_model(X, y, n_symbols, years)
+            for r in results:
+                if r["symbols"] == n_symbols and r["years"] == years:
+                    peak = f"{r['peak_mb']:.1f} MB" if r["peak_mb"] else "-"
+                    print(f"  {r['stage']:<28} {r['seconds']:>9.3f}s "
+                          f"{(r['rows_per_sec'] or 0):>14,.0f} rows/s  peak {peak}")
+
+    commit = git_commit()
+    meta = {
+        "git_commit": commit,
+        "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "memory_traced": trace_memory,
+    }
+    out = args.out or RESULTS_DIR / f"bench-{dt.datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    print(f"\n💾 Results: {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Build and publish the shared feature panel used by predict.py / app.py.
+Run once (e.g. after the daily data refresh); every serving process then
+maps the same float32 file read-only instead of recomputing features.
+
+Run:
+    python build_panel.py
+    python build_panel.py --refresh-data --symbols AAPL MSFT
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.feature_panel import build_panel, FeaturePanel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the shared feature panel")
+    parser.add_argument("--symbols", nargs="+", default=Config.SUPPORTED_STOCKS)
+    parser.add_argument("--refresh-data", action="store_true",
+                        help="Re-download prices from EODHD before building")
+    args = parser.parse_args()
+
+    print(f"🔄 Building feature panel for {len(args.symbols)} symbols...")
+    try:
+        version = build_panel(args.symbols, refresh_data=args.refresh_data)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    panel = FeaturePanel(version)
+    n_sym, n_days, n_feat = panel.values.shape
+    print(f"✅ Panel {version}: {n_sym} symbols × {n_days:,} days × {n_feat} features "
+          f"({panel.values.nbytes / 2**20:.1f} MB)")
+    print(f"💾 {Config.FEATURE_PANEL_DIR / version}")
+
+
+if __name__ == "__main__":
+    main()
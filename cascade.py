@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Fit the stage-1 cascade model for the current registry model and report the
+LSTM compute saved and the accuracy impact on the validation windows.
+
+Run:
+    python cascade.py
+    python cascade.py --model gbm --max-acc-drop 0.01
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.cascade import fit_cascade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the stage-1 scoring cascade")
+    parser.add_argument("--model", choices=["logistic", "gbm"], default=Config.CASCADE_MODEL)
+    parser.add_argument("--max-acc-drop", type=float, default=Config.CASCADE_MAX_ACC_DROP,
+                        help="Max week-direction accuracy loss vs the LSTM alone")
+    args = parser.parse_args()
+
+    try:
+        cascade = fit_cascade(kind=args.model, max_acc_drop=args.max_acc_drop)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    r = cascade["report"]
+    sweep = cascade["sweep"]
+    print("\n" + "=" * 80)
+    print(f"🪜 CASCADE ({r['kind']}) on {r['val_windows']:,} validation windows")
+    print(sweep.iloc[::5].to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print("=" * 80)
+    if r["cascade_acc_week"] is None:
+        print(f"⚠️ Stage 1 never stays within {r['max_acc_drop']:.1%} of the LSTM: "
+              f"every window goes to the LSTM")
+    else:
+        print(f"🎯 Margin beyond neutral band: {r['margin']:+.2f}")
+        print(f"⚡ Windows sent to LSTM:       {r['lstm_share']:.1%}")
+        print(f"⚡ Est. compute saved:          {r['compute_saved']:.1%} "
+              f"(stage 1 {r['stage1_ms_per_1k']:.1f} ms vs LSTM {r['lstm_ms_per_1k']:.1f} ms per 1k windows)")
+        print(f"📈 Week accuracy:  LSTM {r['lstm_acc_week']:.2%} → cascade {r['cascade_acc_week']:.2%}")
+        print(f"📈 Tomorrow acc.:  LSTM {r['lstm_acc_tom']:.2%} → cascade {r['cascade_acc_tom']:.2%}")
+    print(f"💾 {Config.CASCADE_PATH} (model {cascade['model_version']})")
+
+
+if __name__ == "__main__":
+    main()
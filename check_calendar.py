@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Validate the cached daily CSVs against the NYSE trading calendar: duplicate
+dates, rows on non-session days and sessions missing inside each symbol's
+history (load_stock_data forward-fills those when Config.CALENDAR_FILL_GAPS).
+
+Run:
+    python check_calendar.py
+    python check_calendar.py --symbols AAPL MSFT
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.trading_calendar import get_calendar, validate_symbols
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cached price dates against the trading calendar")
+    parser.add_argument("--symbols", nargs="+", default=Config.SUPPORTED_STOCKS)
+    args = parser.parse_args()
+
+    dates = {}
+    for symbol in (s.upper() for s in args.symbols):
+        path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+        if not path.exists():
+            print(f"  ⚠️ {symbol}: no cached CSV ({path})")
+            continue
+        dates[symbol] = pd.DatetimeIndex(pd.read_csv(path, usecols=["Date"], parse_dates=["Date"])["Date"])
+    if not dates:
+        print("❌ Error: no cached data to check")
+        sys.exit(1)
+
+    cal = get_calendar()
+    report = validate_symbols(dates)
+    print(f"📅 NYSE calendar: {len(cal):,} sessions "
+          f"{cal.sessions[0]:%Y-%m-%d} → {cal.sessions[-1]:%Y-%m-%d}")
+    print(report.to_string(index=False))
+    issues = report[(report["duplicates"] > 0) | (report["off_calendar"] > 0)
+                    | (report["missing"] > 0) | ~report["sorted"]]
+    if issues.empty:
+        print("✅ Every symbol matches the calendar")
+    else:
+        print(f"⚠️ {len(issues)} symbol(s) with calendar issues")
+
+
+if __name__ == "__main__":
+    main()
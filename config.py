@@ -13,12 +13,58 @@ class Config:
     # Data window: ~15 years of daily data
     START_DATE = "2010-01-01"
     END_DATE = None  # use today's date if None
-    INTERVAL = "1d"
+    INTERVAL = "1d"  # "1m", "5m", "1h" go to the partitioned intraday store
+
+    # Trading calendar (src.trading_calendar): NYSE sessions from this date;
+    # load_stock_data forward-fills sessions missing from a symbol's history
+    CALENDAR_START = "1990-01-01"
+    CALENDAR_FILL_GAPS = True
+
+    # Intraday bars (src.intraday_store): one file per period (pandas frequency)
+    INTRADAY_PARTITION = "M"
+    INTRADAY_WARMUP_BARS = 500  # history carried across partitions when streaming features
 
     # Paths
     DATA_RAW_DIR = BASE_DIR / "data" / "raw"
     DATA_PROCESSED_DIR = BASE_DIR / "data" / "processed"
-    MODEL_PATH = BASE_DIR / "models" / "lstm_stock_model.h5"
+    MODEL_PATH = BASE_DIR / "models" / "lstm_stock_model.h5"  # legacy single-file model
+    MODEL_REGISTRY_DIR = BASE_DIR / "models" / "registry"
+    TRAINING_STATE_PATH = BASE_DIR / "models" / "training_state.json"
+    VALIDATION_OUTPUTS_PATH = DATA_PROCESSED_DIR / "validation_outputs.npz"
+    PROFILE_DIR = BASE_DIR / "profiles"
+    CASCADE_PATH = BASE_DIR / "models" / "cascade.joblib"
+    SEARCH_DIR = BASE_DIR / "models" / "search"
+    CHECKPOINT_DIR = BASE_DIR / "models" / "checkpoints"
+    DISTRIBUTED_DIR = BASE_DIR / "models" / "distributed"
+    FEATURE_PANEL_DIR = DATA_PROCESSED_DIR / "panel"
+    INTRADAY_DIR = DATA_PROCESSED_DIR / "intraday"
+
+    # Serve features from the shared memory-mapped panel when one is published
+    USE_FEATURE_PANEL = True
+
+    # Max points per Market Data chart (longer ranges are downsampled)
+    CHART_MAX_POINTS = 1500
+
+    # In-memory dtype for OHLCV columns ("float64" restores full precision)
+    PRICE_DTYPE = "float32"
+
+    # Market-relative features (src.cross_sectional): return rank, universe /
+    # sector z-scores, relative strength vs the equal-weight universe index.
+    # Changes the model inputs: retrain and rebuild the panel after switching.
+    CROSS_SECTIONAL_FEATURES = False
+    CROSS_SECTIONAL_UNIVERSE = None  # symbols ranked against; None = SUPPORTED_STOCKS
+    CROSS_SECTIONAL_RS_WINDOW = 20
+    SECTORS = {
+        "AAPL": "Information Technology",
+        "MSFT": "Information Technology",
+        "NVDA": "Information Technology",
+        "AMZN": "Consumer Discretionary",
+        "GOOGL": "Communication Services",
+        "META": "Communication Services",
+    }
+
+    # Indicator implementation: "pandas", "numpy" or "numba" (src.indicator_kernels)
+    INDICATOR_BACKEND = "pandas"
 
     # Sequence settings: use last 60 days to predict
     SEQUENCE_LENGTH = 60
@@ -38,10 +84,99 @@ class Config:
     VALIDATION_SPLIT = 0.2
     RANDOM_STATE = 42
 
+    # Resumable training (train.py --resume): checkpoint interval and how many to keep
+    CHECKPOINT_EVERY_EPOCHS = 1
+    CHECKPOINT_KEEP = 2
+
+    # Hyperparameter search (search.py): expanding-window folds, parallel trials
+    SEARCH_SPACE = {
+        "lstm_units_1": [32, 64, 128],
+        "lstm_units_2": [16, 32, 64],
+        "dense_units_1": [32, 64],
+        "dropout_1": [0.1, 0.2, 0.3],
+        "learning_rate": [1e-3, 5e-4],
+        "batch_size": [32, 64, 128],
+    }
+    SEARCH_FOLDS = 4
+    SEARCH_MIN_TRAIN_FRACTION = 0.5  # share of history before the first validation fold
+    SEARCH_EMBARGO_SESSIONS = 8  # sessions from the last training label to validation (> 7-session week target)
+    SEARCH_EPOCHS = 15
+    SEARCH_PATIENCE = 3
+    SEARCH_THREADS_PER_WORKER = 2
+    SEARCH_PRUNE_QUANTILE = 0.5  # prune trials worse than the median at the same fold
+    SEARCH_PRUNE_MIN_TRIALS = 3
+
+    # Warm-start retraining (walk-forward refresh)
+    RETRAIN_EPOCHS = 3
+    RETRAIN_LEARNING_RATE = 1e-4
+    RETRAIN_REPLAY_RATIO = 4  # older windows replayed per new window
+    RETRAIN_REPLAY_MIN = 256
+    RETRAIN_HOLDOUT_SESSIONS = 10  # latest windows per symbol kept out of each refresh to validate it
+    RETRAIN_INTERVAL_HOURS = 24
+
+    # EODHD API limits (see your plan): requests per rolling minute and per UTC day
+    EODHD_BASE_URL = "https://eodhd.com/api"
+    EODHD_REQUESTS_PER_MINUTE = 1000
+    EODHD_DAILY_LIMIT = 100_000
+    EODHD_BURST = 10
+    EODHD_MAX_CONCURRENCY = 16
+    EODHD_MAX_RETRIES = 3
+    EODHD_QUOTA_PATH = BASE_DIR / "data" / "eodhd_quota.json"
+
+    # Stage-1 cascade (cascade.py): "logistic" or "gbm"; max week-accuracy loss allowed
+    CASCADE_MODEL = "logistic"
+    CASCADE_MAX_ACC_DROP = 0.005
+
+    # Distilled student model (distill.py): "gru", "conv" or "mlp"
+    STUDENT_KIND = "conv"
+    STUDENT_EPOCHS = 30
+    STUDENT_BATCH_SIZE = 256
+
+    # Portfolio construction (src.portfolio): per-name cap, gross exposure,
+    # max one-way turnover per rebalance, trading cost for the simulation
+    PORTFOLIO_MAX_WEIGHT = 0.25
+    PORTFOLIO_GROSS = 1.0
+    PORTFOLIO_MAX_TURNOVER = 0.5
+    PORTFOLIO_LONG_ONLY = False
+    PORTFOLIO_COST_BPS = 5.0
+    PORTFOLIO_SIGMA_FLOOR = 0.01  # added to the uncertainty before risk-scaling
+
+    # Monte Carlo dropout uncertainty (predict.py --uncertainty)
+    MC_DROPOUT_PASSES = 50
+    MC_DROPOUT_MAX_BATCH = 4096  # tiled rows per forward call
+
+    # Feature attribution (predict.py --explain): integrated-gradients steps
+    ATTRIBUTION_STEPS = 32
+    ATTRIBUTION_MAX_BATCH = 2048  # interpolated windows per gradient pass
+
+    # Serving: how often processes check the registry for a new model
+    MODEL_POLL_SECONDS = 30
+
+    # Prometheus-style /metrics endpoint (src.instrumentation.serve_metrics)
+    METRICS_PORT = 9108
+
+    # Streaming signals (stream.py, src.signal_stream): Server-Sent Events
+    STREAM_PORT = 8765
+    STREAM_URL = "http://localhost:8765"  # where app.py subscribes
+    STREAM_POLL_SECONDS = 5               # how often the daily CSVs are checked
+    STREAM_FETCH_SECONDS = 0              # > 0: also re-fetch from EODHD this often
+    STREAM_WARMUP_BARS = 500              # rows the indicators are recomputed on per update
+    STREAM_HEARTBEAT_SECONDS = 15
+    STREAM_QUEUE_SIZE = 256               # events buffered per client before the oldest are dropped
+    STREAM_UI_REFRESH_SECONDS = 2         # app.py live mode: how often it checks for a pushed signal
+
     # Decision logic thresholds (on confidence 0–1)
     WEEKLY_CONFIDENCE_STRONG = 0.60
     WEEKLY_CONFIDENCE_MILD = 0.55
 
+    # Neutral band on P(week UP): BUY above HIGH, SELL below LOW, else HOLD
+    NEUTRAL_LOW = 0.45
+    NEUTRAL_HIGH = 0.55
+
+    # Signal strength cut-offs on edge (distance from 0.5)
+    HIGH_EDGE = 0.15
+    MEDIUM_EDGE = 0.08
+
     # Utility
     @staticmethod
     def today_str() -> str:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Distil the current registry model into a small student for low-latency
+serving, then report BUY/SELL/HOLD agreement with the teacher and
+throughput at batch sizes 1-1024.
+
+Run:
+    python distill.py                    # Config.STUDENT_KIND student
+    python distill.py --student gru --epochs 50
+    python predict.py --universe --student
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.distill import STUDENT_KINDS, distill
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distil the LSTM into a serving student")
+    parser.add_argument("--student", choices=STUDENT_KINDS, default=Config.STUDENT_KIND)
+    parser.add_argument("--epochs", type=int, default=Config.STUDENT_EPOCHS)
+    args = parser.parse_args()
+
+    try:
+        r = distill(kind=args.student, epochs=args.epochs)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    agree, acc, tp = r["agreement"], r["accuracy"], r["throughput"]
+    print("\n" + "=" * 80)
+    print(f"🧑‍🎓 STUDENT ({r['kind']}) of {r['teacher']}: "
+          f"{r['params']['student']:,} vs {r['params']['teacher']:,} parameters")
+    print("🤝 Agreement with teacher (validation windows):")
+    print(f"   Action (BUY/SELL/HOLD): {agree['action']:.1%}")
+    print(f"   Week direction:         {agree['week_direction']:.1%}")
+    print(f"   Tomorrow direction:     {agree['tom_direction']:.1%}")
+    print(f"   Mean |ΔP(week UP)|:     {agree['p_week_mae']:.3f}")
+    print(f"📈 Accuracy vs labels: week {acc['teacher']['week']:.1%} → {acc['student']['week']:.1%} | "
+          f"tomorrow {acc['teacher']['tomorrow']:.1%} → {acc['student']['tomorrow']:.1%}")
+    print("\n⚡ Throughput (windows/s, compiled forward pass)")
+    print(f"{'batch':>7} {'teacher':>12} {'student':>12} {'speedup':>8}")
+    for batch in tp["teacher"]:
+        t, s = tp["teacher"][batch], tp["student"][batch]
+        print(f"{batch:>7} {t:>12,.0f} {s:>12,.0f} {s / t:>7.1f}x")
+    print("=" * 80)
+    print(f"💾 Published (not current): {Config.MODEL_REGISTRY_DIR / r['version']}")
+    print("🔥 Serve it: python predict.py --universe --student")
+
+
+if __name__ == "__main__":
+    main()
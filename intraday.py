@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Download intraday bars from EODHD into the date-partitioned store
+(data/processed/intraday/<SYMBOL>/<interval>/). Re-running only requests
+bars newer than the last stored one.
+
+Run:
+    python intraday.py --symbols AAPL MSFT --interval 5m --start 2024-01-01
+    python intraday.py --interval 1m --refresh
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.eodhd_client import run_sync
+from src.intraday_store import INTERVALS, fetch_intraday_async, list_partitions, stored_range
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch intraday bars into the partitioned store")
+    parser.add_argument("--symbols", nargs="+", default=Config.SUPPORTED_STOCKS)
+    parser.add_argument("--interval", choices=list(INTERVALS), default="5m")
+    parser.add_argument("--start", help="First day (default: one API request window back)")
+    parser.add_argument("--end", help="Last day (default: now)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-download the whole range instead of only newer bars")
+    args = parser.parse_args()
+
+    failed = 0
+    for symbol in args.symbols:
+        symbol = symbol.upper()
+        try:
+            n = run_sync(fetch_intraday_async(symbol, args.interval, args.start, args.end,
+                                              refresh=args.refresh))
+        except Exception as e:
+            print(f"  ❌ {symbol}: {e}")
+            failed += 1
+            continue
+        stored = stored_range(symbol, args.interval)
+        if stored is None:
+            print(f"  ⚠️ {symbol}: no {args.interval} bars returned")
+            continue
+        print(f"  ✅ {symbol}: {n:,} bars received | stored {stored[0]} → {stored[1]} "
+              f"in {len(list_partitions(symbol, args.interval))} partitions")
+
+    print(f"💾 {Config.INTRADAY_DIR}")
+    if failed:
+        print(f"❌ Error: {failed} symbol(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
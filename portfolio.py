@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Simulate the constrained portfolio on the cached validation outputs
+(same cache as tune_thresholds.py): weekly rebalances, capped weights,
+gross exposure target, turnover limit and trading costs.
+
+Run:
+    python portfolio.py
+    python portfolio.py --max-weight 0.1 --max-turnover 0.3 --long-only --refresh
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.model_registry import LEGACY_VERSION, current_version, load_bundle
+from src.portfolio import simulate
+from src.threshold_search import collect_validation_outputs, load_outputs, save_outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio simulation on validation windows")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-run the model instead of using cached outputs")
+    parser.add_argument("--max-weight", type=float, default=Config.PORTFOLIO_MAX_WEIGHT)
+    parser.add_argument("--gross", type=float, default=Config.PORTFOLIO_GROSS)
+    parser.add_argument("--max-turnover", type=float, default=Config.PORTFOLIO_MAX_TURNOVER)
+    parser.add_argument("--long-only", action="store_true", default=Config.PORTFOLIO_LONG_ONLY)
+    parser.add_argument("--cost-bps", type=float, default=Config.PORTFOLIO_COST_BPS)
+    args = parser.parse_args()
+
+    try:
+        outputs = None if args.refresh else load_outputs(current_version() or LEGACY_VERSION)
+        if outputs is None:
+            print("🤖 Running model over validation windows (one pass)...")
+            bundle = load_bundle()
+            outputs = collect_validation_outputs(bundle)
+            save_outputs(outputs, bundle.version)
+        else:
+            print(f"📂 Using cached outputs: {Config.VALIDATION_OUTPUTS_PATH}")
+        t0 = time.perf_counter()
+        history, summary = simulate(
+            outputs,
+            cost_bps=args.cost_bps,
+            max_weight=args.max_weight,
+            gross=args.gross,
+            max_turnover=args.max_turnover,
+            long_only=args.long_only,
+        )
+        seconds = time.perf_counter() - t0
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("\n" + "=" * 80)
+    print(f"💼 PORTFOLIO SIMULATION ({summary['symbols']} symbols, {summary['rebalances']} weekly rebalances)")
+    print(history.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print("=" * 80)
+    print(f"📈 Total return:   {summary['total_return']:+.2%} | annualized {summary['ann_return']:+.2%} "
+          f"(vol {summary['ann_vol']:.2%}, Sharpe {summary['sharpe']:.2f})")
+    print(f"📉 Max drawdown:   {summary['max_drawdown']:.2%} | hit rate {summary['hit_rate']:.1%}")
+    print(f"🔁 Avg turnover:   {summary['avg_turnover']:.2f} | costs {summary['total_cost']:.2%}")
+    print(f"⏱️ Simulated in {seconds * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,26 +10,38 @@ import numpy as np
 import tensorflow as tf
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Dict, List, Optional
 sys.path.append(str(Path(__file__).parent))
 
 from config import Config
 from src.data_loader import load_stock_data
+from sklearn.preprocessing import StandardScaler
 from src.feature_engineer import (
     create_technical_indicators,
     create_targets,
-    build_feature_matrix,
-    make_sequences,
+    feature_columns,
 )
+from src.feature_panel import get_panel
+from src.decision_engine import decide_batch
+from src.model_registry import HotSwapModel, ModelBundle, load_bundle
+from src.uncertainty import mc_dropout_predict
+from src.cascade import load_cascade, cascade_predict
+from src.distill import find_student, serving_forward
+from src.portfolio import target_weights
+from src.attribution import Attribution, integrated_gradients
+from src.instrumentation import timed, increment, log_json, profile_session
 
-# Validation accuracies
-_VAL_ACC_TOMORROW = 0.597
-_VAL_ACC_WEEK = 0.674
+# Thresholds (see Config / src.decision_engine)
+NEUTRAL_LOW = Config.NEUTRAL_LOW
+NEUTRAL_HIGH = Config.NEUTRAL_HIGH
+HIGH_EDGE = Config.HIGH_EDGE
+MEDIUM_EDGE = Config.MEDIUM_EDGE
 
-# Thresholds
-NEUTRAL_LOW = 0.45
-NEUTRAL_HIGH = 0.55
-HIGH_EDGE = 0.15
-MEDIUM_EDGE = 0.08
+# Serving handle: loads the current registry bundle once, hot-swaps on publish
+_MODEL = HotSwapModel()
+
+# Distilled students, keyed by teacher version
+_STUDENTS: Dict[str, ModelBundle] = {}
 
 @dataclass
 class UIMetrics:
@@ -43,75 +55,82 @@ class UIMetrics:
     signal_strength: str
     val_acc_tom: float
     val_acc_week: float
+    # MC dropout {head: {"mean", "std"}}; None unless uncertainty was requested
+    uncertainty: Optional[Dict[str, Dict[str, float]]] = None
+    mc_passes: int = 0
 
-def set_validation_accuracies(val_tom: float, val_week: float):
-    global _VAL_ACC_TOMORROW, _VAL_ACC_WEEK
-    _VAL_ACC_TOMORROW = float(val_tom)
-    _VAL_ACC_WEEK = float(val_week)
+def _feature_rows(symbol: str):
+    """
+    Unscaled feature rows for a symbol, oldest first, plus the column names.
+    Read from the shared feature panel when one is published (build_panel.py)
+    and still matches the symbol's CSV and the feature settings, otherwise
+    computed from the CSV cache in this process.
+    """
+    panel = get_panel() if Config.USE_FEATURE_PANEL else None
+    if panel is not None and symbol in panel and not panel.is_fresh(symbol):
+        increment("panel_stale")
+        panel = None
+    if panel is not None and symbol in panel:
+        increment("panel_hits")
+        with timed("panel_read"):
+            _, X_raw = panel.symbol_rows(symbol)
+        return X_raw, panel.features
 
-def _get_prediction(symbol: str):
-    """Core prediction logic - returns all metrics"""
-    symbol = symbol.upper()
-    
-    model_path = Path("models/lstm_stock_model.h5")
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model not found: {model_path}. Run: python train.py")
-    model = tf.keras.models.load_model(model_path)
-    
     df = load_stock_data(symbol)
-    df = create_technical_indicators(df)
+    df = create_technical_indicators(df, symbol=symbol)
     df = create_targets(df)
+    cols = feature_columns(df)
+    return df[cols].to_numpy(dtype="float32"), cols
+
+def _latest_window(bundle, symbol: str):
+    """Scaled (1, seq_len, features) window for the latest prediction, the current price and feature names."""
+    X_raw, cols = _feature_rows(symbol)
+    seq_len = Config.SEQUENCE_LENGTH
+    if len(X_raw) <= seq_len:
+        raise ValueError(f"Insufficient data for {symbol}")
+    
+    scaler = bundle.scalers.get(symbol) or StandardScaler().fit(X_raw)
+    # Same window make_sequences ends on: the seq_len rows before the last one
+    X_seq = scaler.transform(X_raw[-seq_len - 1:-1])[np.newaxis]
+    return X_seq, float(X_raw[-1, cols.index("Close")]), cols
+
+def _get_prediction(symbol: str, mc_passes: int = 0):
+    """Core prediction logic - returns all metrics (plus MC dropout spread if mc_passes > 0)"""
+    symbol = symbol.upper()
     
-    X_scaled, _, _, _, _, _ = build_feature_matrix(df)
-    X_seq, _, _, _, _ = make_sequences(X_scaled, *[np.zeros(len(X_scaled))]*4, seq_len=Config.SEQUENCE_LENGTH)
+    increment("predictions")
+    with timed("model_load"):
+        bundle = _MODEL.get()  # held for the whole request, even if a swap happens
     
-    if len(X_seq) == 0:
-        raise ValueError(f"Insufficient data for {symbol}")
+    X_seq, current_price, _ = _latest_window(bundle, symbol)
     
-    predictions = model.predict(X_seq[-1:], verbose=0)
-    p_tom_up = float(predictions[0][0, 0])
-    p_week_up = float(predictions[1][0, 0])
-    current_price = float(df["Close"].iloc[-1])
-    
-    # Direction logic
-    if p_week_up >= NEUTRAL_HIGH:
-        week_direction = "UP"
-        action = "BUY"
-    elif p_week_up <= NEUTRAL_LOW:
-        week_direction = "DOWN"
-        action = "SELL"
-    else:
-        week_direction = "HOLD"
-        action = "HOLD"
+    with timed("model_predict"):
+        predictions = bundle.model.predict(X_seq, verbose=0)
     
-    tom_direction = "UP" if p_tom_up >= 0.50 else "DOWN"
+    # Direction, action and signal strength (vectorized decision engine)
+    decision = decide_batch(predictions[0], predictions[1]).row(0)
     
-    # Signal strength
-    week_edge = abs(p_week_up - 0.5)
-    if week_edge >= HIGH_EDGE:
-        signal_strength = "HIGH"
-    elif week_edge >= MEDIUM_EDGE:
-        signal_strength = "MEDIUM"
-    else:
-        signal_strength = "LOW"
+    # Optional uncertainty: K dropout passes in one batched forward call
+    uncertainty = None
+    if mc_passes > 0:
+        uncertainty = mc_dropout_predict(bundle.model, X_seq, passes=mc_passes).as_dict(0)
     
     return {
         'symbol': symbol,
         'current_price': current_price,
-        'p_tom_up': p_tom_up,
-        'p_week_up': p_week_up,
-        'tom_direction': tom_direction,
-        'week_direction': week_direction,
-        'action': action,
-        'signal_strength': signal_strength,
-        'week_edge': week_edge
+        **decision,
+        # Validation accuracies from the bundle's metrics manifest (read at load time)
+        'val_acc_tom': bundle.metrics['val_acc_tomorrow'],
+        'val_acc_week': bundle.metrics['val_acc_week'],
+        'uncertainty': uncertainty,
+        'mc_passes': mc_passes,
     }
 
-def predict_for_symbol(symbol: str):
+def predict_for_symbol(symbol: str, mc_passes: int = 0):
     """CLI version - prints formatted output"""
     print(f"🔄 {symbol.upper()} Analysis...")
     
-    data = _get_prediction(symbol)
+    data = _get_prediction(symbol, mc_passes=mc_passes)
     
     print(f"📊 Raw Model Probabilities:")
     print(f"   P(Tomorrow UP): {data['p_tom_up']:.1%}")
@@ -125,8 +144,15 @@ def predict_for_symbol(symbol: str):
     print(f"📊 EDGE:     {data['week_edge']*100:.1f}% from neutral (50%)")
     print(f"💰 PRICE:    ${data['current_price']:.2f}")
     print("\n📈 MODEL PERFORMANCE (Historical Validation)")
-    print(f"   Tomorrow Direction: {int(_VAL_ACC_TOMORROW*100)}% accuracy")
-    print(f"   Weekly Direction:   {int(_VAL_ACC_WEEK*100)}% accuracy")
+    print(f"   Tomorrow Direction: {int(data['val_acc_tom']*100)}% accuracy")
+    print(f"   Weekly Direction:   {int(data['val_acc_week']*100)}% accuracy")
+    if data['uncertainty'] is not None:
+        u = data['uncertainty']
+        print(f"\n🎲 UNCERTAINTY (MC dropout, {data['mc_passes']} passes)")
+        print(f"   P(Tomorrow UP): {u['tomorrow_output']['mean']:.1%} ± {u['tomorrow_output']['std']:.1%}")
+        print(f"   P(Week UP):     {u['week_output']['mean']:.1%} ± {u['week_output']['std']:.1%}")
+        print(f"   Tomorrow ret:   {u['tomorrow_return']['mean']*100:+.2f}% ± {u['tomorrow_return']['std']*100:.2f}%")
+        print(f"   Week ret:       {u['week_return']['mean']*100:+.2f}% ± {u['week_return']['std']*100:.2f}%")
     print("\n📏 THRESHOLDS USED:")
     print(f"   UP signal:     ≥ {NEUTRAL_HIGH*100:.0f}%")
     print(f"   DOWN signal:   ≤ {NEUTRAL_LOW*100:.0f}%")
@@ -135,9 +161,9 @@ def predict_for_symbol(symbol: str):
     print("="*80)
     print("✅ Prediction complete.\n")
 
-def ui_predict_for_symbol(symbol: str) -> UIMetrics:
+def ui_predict_for_symbol(symbol: str, mc_passes: int = 0) -> UIMetrics:
     """Streamlit UI version - returns structured data"""
-    data = _get_prediction(symbol)
+    data = _get_prediction(symbol, mc_passes=mc_passes)
     
     return UIMetrics(
         symbol=data['symbol'],
@@ -148,17 +174,220 @@ def ui_predict_for_symbol(symbol: str) -> UIMetrics:
         week_direction=data['week_direction'],
         action=data['action'],
         signal_strength=data['signal_strength'],
-        val_acc_tom=_VAL_ACC_TOMORROW,
-        val_acc_week=_VAL_ACC_WEEK,
+        val_acc_tom=data['val_acc_tom'],
+        val_acc_week=data['val_acc_week'],
+        uncertainty=data['uncertainty'],
+        mc_passes=data['mc_passes'],
     )
 
+def explain(symbols, steps: Optional[int] = None):
+    """
+    Integrated-gradients attribution of both direction heads for the latest
+    window of each symbol, all symbols and interpolation steps in one batched
+    gradient pass (src.attribution). Returns (scored symbols, Attribution).
+    """
+    with timed("model_load"):
+        bundle = _MODEL.get()
+    windows, scored, cols = [], [], None
+    for symbol in symbols:
+        symbol = symbol.upper()
+        try:
+            X_seq, _, cols = _latest_window(bundle, symbol)
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+            continue
+        windows.append(X_seq)
+        scored.append(symbol)
+    if not scored:
+        raise RuntimeError("No symbol could be explained")
+    return scored, integrated_gradients(bundle.model, np.concatenate(windows), cols, steps=steps)
+
+def ui_explain_for_symbol(symbol: str, steps: Optional[int] = None) -> Attribution:
+    """Streamlit UI version - attribution heatmaps for one symbol"""
+    return explain([symbol], steps=steps)[1]
+
+def print_explanation(symbols, steps: Optional[int] = None, top: int = 5):
+    """CLI version - top features and days behind each symbol's probabilities"""
+    scored, attr = explain(symbols, steps=steps)
+    method = f"integrated gradients, {attr.steps} steps" if attr.steps else "gradient × input"
+    print(f"🔍 ATTRIBUTION ({method}, {attr.seconds_per_symbol * 1e3:.1f} ms/symbol)")
+    for i, symbol in enumerate(scored):
+        for h, head in enumerate(attr.heads):
+            label = "Tomorrow" if head == "tomorrow_output" else "Week"
+            ranked = list(attr.by_feature(head, i).items())[:top]
+            days = attr.by_day(head, i)
+            print(f"   {symbol:<6} {label:<8} P={attr.output[h, i]:.1%} | "
+                  + ", ".join(f"{name} {value:+.3f}" for name, value in ranked)
+                  + f" | most weight on day t-{len(days) - int(np.argmax(np.abs(days)))}")
+    if attr.steps:
+        print(f"   Completeness error: max {np.nanmax(np.abs(attr.delta)):.4f} (more --explain steps lowers it)")
+    print()
+    return scored, attr
+
+def ui_predict_windows(bundle: ModelBundle, symbols: List[str], X_seq: np.ndarray, prices) -> List[UIMetrics]:
+    """Streaming version - UIMetrics for prepared windows, one batched forward call"""
+    with timed("model_predict"):
+        predictions = serving_forward(bundle.model)(tf.constant(X_seq, dtype=tf.float32))
+    batch = decide_batch(predictions[0].numpy().reshape(-1), predictions[1].numpy().reshape(-1))
+    increment("predictions", len(symbols))
+    metrics = []
+    for i, symbol in enumerate(symbols):
+        row = batch.row(i)
+        metrics.append(UIMetrics(
+            symbol=symbol,
+            current_price=float(prices[i]),
+            p_tom_up=row['p_tom_up'],
+            p_week_up=row['p_week_up'],
+            tom_direction=row['tom_direction'],
+            week_direction=row['week_direction'],
+            action=row['action'],
+            signal_strength=row['signal_strength'],
+            val_acc_tom=bundle.metrics['val_acc_tomorrow'],
+            val_acc_week=bundle.metrics['val_acc_week'],
+        ))
+    return metrics
+
+def _student_for(bundle: ModelBundle) -> Optional[ModelBundle]:
+    """Distilled student of the serving model (python distill.py), loaded once."""
+    if bundle.version not in _STUDENTS:
+        version = find_student(bundle.version)
+        if version is None:
+            print(f"⚠️ No distilled student for model {bundle.version}: using the LSTM. "
+                  f"Run: python distill.py")
+            return None
+        _STUDENTS[bundle.version] = load_bundle(version)
+    return _STUDENTS[bundle.version]
+
+def predict_universe(symbols, use_cascade: bool = True, use_student: bool = False,
+                     portfolio: bool = False, mc_passes: int = 0):
+    """
+    Score many symbols in one batch. With a fitted cascade (python cascade.py)
+    confident symbols are decided by the stage-1 model and only the rest go
+    through the LSTM (or its distilled student with use_student).
+    With `portfolio`, every symbol goes through the model (the weights need
+    its week-return head) and constrained weights are added (src.portfolio);
+    mc_passes > 0 risk-scales them by the MC dropout spread of P(week UP).
+    """
+    with timed("model_load"):
+        bundle = _MODEL.get()
+    student = _student_for(bundle) if use_student else None
+    model = student.model if student is not None else bundle.model
+    model_name = f"student ({student.metadata['student_kind']})" if student is not None else "LSTM"
+    
+    windows, prices, scored = [], [], []
+    for symbol in symbols:
+        symbol = symbol.upper()
+        try:
+            X_seq, price, _ = _latest_window(bundle, symbol)
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+            continue
+        windows.append(X_seq)
+        prices.append(price)
+        scored.append(symbol)
+    if not scored:
+        raise RuntimeError("No symbol could be scored")
+    X_seq = np.concatenate(windows)
+    increment("predictions", len(scored))
+    
+    cascade = load_cascade(bundle.version) if use_cascade and not portfolio else None
+    weights = None
+    if portfolio:
+        if mc_passes:
+            est = mc_dropout_predict(model, X_seq, passes=mc_passes)
+            p_tom, p_week, ret_week, spread = est.mean[0], est.mean[1], est.mean[3], est.std[1]
+        else:
+            with timed("model_predict"):
+                predictions = serving_forward(model)(tf.constant(X_seq, dtype=tf.float32))
+            p_tom, p_week, ret_week = (predictions[h].numpy().reshape(-1) for h in (0, 1, 3))
+            spread = None
+        stage = np.full(len(scored), 2, dtype=np.int8)
+        with timed("portfolio_weights"):
+            weights = target_weights(p_week, ret_week, uncertainty=spread)
+    elif cascade is not None:
+        out = cascade_predict(cascade, model, X_seq)
+        p_tom, p_week, stage = out["p_tom_up"], out["p_week_up"], out["stage"]
+    else:
+        with timed("model_predict"):
+            predictions = serving_forward(model)(tf.constant(X_seq, dtype=tf.float32))
+        p_tom, p_week = predictions[0].numpy().reshape(-1), predictions[1].numpy().reshape(-1)
+        stage = np.full(len(scored), 2, dtype=np.int8)
+    batch = decide_batch(p_tom, p_week)
+    
+    print("\n" + "="*80)
+    print(f"📈 UNIVERSE SIGNALS ({len(scored)} symbols)")
+    weight_header = f" {'Weight':>7}" if weights is not None else ""
+    print(f"{'Symbol':<8} {'Price':>10} {'P(Tom UP)':>10} {'P(Week UP)':>11} {'Action':>7} {'Strength':>9}"
+          f"{weight_header}  Scored by")
+    for i, symbol in enumerate(scored):
+        row = batch.row(i)
+        by = "stage 1" if stage[i] == 1 else model_name
+        weight = f" {weights[i]:>+7.1%}" if weights is not None else ""
+        print(f"{symbol:<8} {prices[i]:>10.2f} {row['p_tom_up']:>10.1%} {row['p_week_up']:>11.1%} "
+              f"{row['action']:>7} {row['signal_strength']:>9}{weight}  {by}")
+    print("="*80)
+    if weights is not None:
+        print(f"💼 Portfolio: {int((weights != 0).sum())} names | gross {np.abs(weights).sum():.0%} | "
+              f"net {weights.sum():+.0%} | max weight {Config.PORTFOLIO_MAX_WEIGHT:.0%}")
+    skipped = int((stage == 1).sum())
+    if cascade is not None:
+        print(f"⚡ Cascade skipped the {model_name} for {skipped}/{len(scored)} symbols "
+              f"(margin {cascade['margin']:+.2f})")
+    elif not portfolio:
+        print(f"ℹ️ No cascade in use: every symbol went through the {model_name}")
+    print("✅ Prediction complete.\n")
+    return batch, stage, weights
+
 def main():
     parser = argparse.ArgumentParser(description="Professional LSTM Stock Signals")
-    parser.add_argument("--stock", "-s", required=True, help="Stock symbol (AAPL, MSFT, etc.)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--stock", "-s", help="Stock symbol (AAPL, MSFT, etc.)")
+    target.add_argument("--universe", nargs="*", metavar="SYMBOL",
+                        help="Score several symbols at once (default: all supported stocks)")
+    parser.add_argument("--no-cascade", action="store_true",
+                        help="With --universe, run every symbol through the LSTM")
+    parser.add_argument("--student", action="store_true",
+                        help="With --universe, use the distilled student instead of the LSTM")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="With --universe, add constrained portfolio weights "
+                             "(risk-scaled by MC dropout with --uncertainty)")
+    parser.add_argument("--explain", nargs="?", type=int, const=Config.ATTRIBUTION_STEPS, default=None,
+                        metavar="STEPS",
+                        help=f"Feature attribution by integrated gradients (default {Config.ATTRIBUTION_STEPS} "
+                             f"steps; 0 = gradient × input)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print stage timings and dump cProfile + TensorFlow profiler traces")
+    parser.add_argument("--uncertainty", "-u", nargs="?", type=int, const=Config.MC_DROPOUT_PASSES,
+                        default=0, metavar="PASSES",
+                        help=f"Monte Carlo dropout spread (default {Config.MC_DROPOUT_PASSES} passes)")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Print one JSON line with stage timings and counters after the run")
     args = parser.parse_args()
     
+    if args.universe is not None:
+        symbols = args.universe or Config.SUPPORTED_STOCKS
+        predict = lambda: predict_universe(symbols, use_cascade=not args.no_cascade,
+                                           use_student=args.student, portfolio=args.portfolio,
+                                           mc_passes=args.uncertainty)
+        label = "predict-universe"
+    else:
+        symbols = [args.stock]
+        predict = lambda: predict_for_symbol(args.stock, mc_passes=args.uncertainty)
+        label = f"predict-{args.stock.upper()}"
+    
+    def run():
+        predict()
+        if args.explain is not None:
+            print_explanation(symbols, steps=args.explain)
+    
     try:
-        predict_for_symbol(args.stock)
+        if args.profile:
+            with profile_session(label):
+                run()
+        else:
+            run()
+        if args.log_json:
+            log_json(label)
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
@@ -3,17 +3,36 @@ Helper to run FastAPI backend.
 
 Run:
     python run_backend.py
+    python run_backend.py --metrics-port   # + /metrics on Config.METRICS_PORT (disables auto-reload)
 """
 
+import argparse
+import sys
+from pathlib import Path
+
 import uvicorn
 
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.instrumentation import serve_metrics
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the FastAPI backend")
+    parser.add_argument("--metrics-port", type=int, nargs="?", const=Config.METRICS_PORT, default=None,
+                        help=f"Expose stage timings and counters on /metrics (default port {Config.METRICS_PORT})")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        # The reloader serves the app from a child process, whose counters this endpoint would not see
+        serve_metrics(args.metrics_port)
+        print(f"📊 Metrics on http://localhost:{args.metrics_port}/metrics")
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=not args.metrics_port,
     )
 
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Parallel time-series cross-validation and hyperparameter search for the
+multi-task LSTM. Trials run in worker processes, each pinned to its own CPU
+slice, over one shared memory-mapped dataset. Writes a leaderboard to
+models/search/<run_id>/.
+
+Run:
+    python search.py                                 # 20 random trials, all CPUs
+    python search.py --trials 50 --threads-per-worker 4
+    python search.py --grid --folds 3 --epochs 10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.hparam_search import run_search, default_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hyperparameter search with time-series CV")
+    parser.add_argument("--trials", type=int, help="Number of trials (random search default: 20)")
+    parser.add_argument("--grid", action="store_true", help="Exhaustive grid over Config.SEARCH_SPACE")
+    parser.add_argument("--folds", type=int, default=Config.SEARCH_FOLDS)
+    parser.add_argument("--epochs", type=int, default=Config.SEARCH_EPOCHS)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPUs / threads per worker)")
+    parser.add_argument("--threads-per-worker", type=int, default=Config.SEARCH_THREADS_PER_WORKER)
+    parser.add_argument("--no-prune", action="store_true", help="Run every trial on every fold")
+    parser.add_argument("--symbols", nargs="+", default=Config.SUPPORTED_STOCKS)
+    parser.add_argument("--top", type=int, default=10, help="Leaderboard rows to print")
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers(args.threads_per_worker)
+    try:
+        board, run_dir = run_search(
+            symbols=args.symbols,
+            n_trials=args.trials,
+            grid=args.grid,
+            n_folds=args.folds,
+            workers=workers,
+            threads_per_worker=args.threads_per_worker,
+            epochs=args.epochs,
+            prune=not args.no_prune,
+        )
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    hp_cols = list(Config.SEARCH_SPACE)
+    print("\n" + "=" * 80)
+    print(f"🏆 LEADERBOARD (mean over folds, {len(board)} trials)")
+    print(board[["trial", "status", "folds", "val_loss", "acc_week", "acc_tom"] + hp_cols]
+          .head(args.top).to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    print("=" * 80)
+    best = board.iloc[0]
+    print("🎯 Best hyperparameters:")
+    for col in hp_cols:
+        print(f"   {col}: {best[col]}")
+    print(f"💾 {run_dir / 'leaderboard.csv'}")
+    print(f"\n🔥 Train with them: python train.py --hparams {run_dir / 'best.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Gradient-based feature attribution for the direction heads.
+
+Integrated gradients: for a scaled window x (seq_len, features) and a
+baseline x' (zeros = the training mean after StandardScaler),
+
+    IG(x) = (x - x') * mean_k grad f(x' + a_k (x - x'))
+
+over `steps` interpolation points a_k (trapezoid rule). Every interpolated
+window of every symbol goes through one batched forward pass inside a
+GradientTape, and both heads are differentiated from that same pass, so
+S symbols × K steps cost one batched call (chunked by max_batch rows)
+instead of S × K model calls. steps=0 gives gradient × input at x.
+
+The attributions of a window sum to f(x) - f(x') (completeness); `delta`
+reports how far the Riemann sum is from that, per head and symbol.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+
+from config import Config
+from src.instrumentation import increment, timed
+
+# Model output index of each attributed head
+HEADS = {"tomorrow_output": 0, "week_output": 1}
+
+
+@dataclass
+class Attribution:
+    values: np.ndarray   # (heads, symbols, seq_len, features), heads in `heads` order
+    delta: np.ndarray    # (heads, symbols): sum of attributions - (f(x) - f(baseline)); NaN for steps=0
+    output: np.ndarray   # (heads, symbols): f(x)
+    heads: List[str]
+    features: List[str]
+    steps: int
+    seconds_per_symbol: float
+
+    def heatmap(self, head: str = "week_output", i: int = 0) -> np.ndarray:
+        """(seq_len, features) attributions of symbol i; row -1 is the latest day."""
+        return self.values[self.heads.index(head), i]
+
+    def by_feature(self, head: str = "week_output", i: int = 0) -> Dict[str, float]:
+        """Signed importance of each feature (summed over days), largest |value| first."""
+        total = self.heatmap(head, i).sum(axis=0)
+        order = np.argsort(-np.abs(total), kind="stable")
+        return {self.features[j]: float(total[j]) for j in order}
+
+    def by_day(self, head: str = "week_output", i: int = 0) -> np.ndarray:
+        """Signed importance of each day of the window (summed over features), oldest first."""
+        return self.heatmap(head, i).sum(axis=1)
+
+
+def _gradient_pass(model: tf.keras.Model, head_index: Sequence[int]):
+    """Compiled outputs + input gradients of the given heads, cached on the model per head set."""
+    cache = getattr(model, "_attribution_pass", None)
+    if cache is None:
+        cache = model._attribution_pass = {}
+    key = tuple(head_index)
+    if key not in cache:
+        def forward(x):
+            with tf.GradientTape(persistent=True) as tape:
+                tape.watch(x)
+                outputs = model(x, training=False)
+                selected = [tf.reshape(outputs[h], [-1]) for h in key]
+                # Windows are independent, so the gradient of the batch sum is per-row
+                totals = [tf.reduce_sum(out) for out in selected]
+            grads = [tape.gradient(total, x) for total in totals]
+            del tape
+            return tf.stack(selected), tf.stack(grads)
+        signature = [tf.TensorSpec([None, None, None], tf.float32)]
+        cache[key] = tf.function(forward, input_signature=signature)
+        cache[key].get_concrete_function()  # trace now, so it is not billed to the first request
+    return cache[key]
+
+
+def integrated_gradients(
+    model: tf.keras.Model,
+    X: np.ndarray,
+    features: Sequence[str],
+    steps: Optional[int] = None,
+    heads: Sequence[str] = tuple(HEADS),
+    baseline: Optional[np.ndarray] = None,
+    max_batch: Optional[int] = None,
+) -> Attribution:
+    """Attributions of windows X (symbols, seq_len, features) for `heads`; steps=0: gradient × input."""
+    steps = Config.ATTRIBUTION_STEPS if steps is None else steps
+    max_batch = max_batch or Config.ATTRIBUTION_MAX_BATCH
+    X = np.asarray(X, dtype=np.float32)
+    base = np.zeros_like(X[0]) if baseline is None else np.asarray(baseline, dtype=np.float32)
+    n, points = len(X), steps + 1
+    alphas = np.linspace(0.0, 1.0, points, dtype=np.float32) if steps else np.ones(1, np.float32)
+    trapezoid = np.full(points, 1.0 / max(steps, 1), dtype=np.float32)
+    if steps:
+        trapezoid[[0, -1]] /= 2
+    forward = _gradient_pass(model, [HEADS[h] for h in heads])
+
+    values = np.empty((len(heads), n) + X.shape[1:], dtype=np.float32)
+    delta = np.empty((len(heads), n), dtype=np.float32)
+    output = np.empty((len(heads), n), dtype=np.float32)
+    windows_per_call = max(1, max_batch // points)
+    t0 = time.perf_counter()
+    with timed("attribution"):
+        for start in range(0, n, windows_per_call):
+            chunk = X[start:start + windows_per_call]
+            diff = chunk - base
+            # (windows, points, seq_len, features): the copies of each window are adjacent
+            path = base + alphas[None, :, None, None] * diff[:, None]
+            outs, grads = forward(tf.convert_to_tensor(path.reshape((-1,) + X.shape[1:])))
+            outs = outs.numpy().reshape(len(heads), len(chunk), points)
+            grads = grads.numpy().reshape((len(heads), len(chunk), points) + X.shape[1:])
+            avg = np.einsum("hwpsf,p->hwsf", grads, trapezoid)
+            attr = avg * diff[None]
+            sl = slice(start, start + len(chunk))
+            values[:, sl] = attr
+            output[:, sl] = outs[:, :, -1]
+            # Completeness only holds for integrated gradients
+            delta[:, sl] = attr.sum(axis=(2, 3)) - (outs[:, :, -1] - outs[:, :, 0]) if steps else np.nan
+    seconds = time.perf_counter() - t0
+    increment("attribution_windows", n * points)
+    return Attribution(
+        values=values, delta=delta, output=output, heads=list(heads), features=list(features),
+        steps=steps, seconds_per_symbol=seconds / max(n, 1),
+    )
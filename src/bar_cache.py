@@ -0,0 +1,204 @@
+"""
+Weekly / monthly OHLCV bars maintained incrementally from the daily store.
+
+    bars = get_bars("AAPL", "weekly")     # Date index = period end (Fri / month end)
+
+Bars live next to the processed data as data/processed/bars/<SYMBOL>_<res>.csv
+with a small JSON manifest recording where the last stored bar's period
+starts in the daily CSV (a byte offset, one row early so gap filling sees
+the previous close) and a fingerprint of the daily rows from there on.
+When the daily CSV changes, only that tail is read back and re-aggregated;
+if those rows changed (e.g. a refresh with revised adjusted closes, which
+rewrites the whole history) the symbol is rebuilt from scratch. Within a
+process, bars are memoised until the daily CSV's mtime moves.
+"""
+
+import io
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.data_loader import load_stock_data, read_price_csv, PRICE_COLUMNS
+from src.instrumentation import increment, instrumented
+from src.trading_calendar import conform
+
+# Resolution name -> pandas period frequency (bars labelled by period end)
+RESOLUTIONS = {
+    "weekly": "W-FRI",
+    "monthly": "M",
+}
+
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+_memo: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+_memo_lock = threading.Lock()
+
+
+def _bars_dir() -> Path:
+    return Config.DATA_PROCESSED_DIR / "bars"
+
+
+def _paths(symbol: str, resolution: str) -> Tuple[Path, Path]:
+    base = _bars_dir() / f"{symbol}_{resolution}"
+    return base.with_suffix(".csv"), base.with_suffix(".json")
+
+
+def aggregate_bars(daily: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """Aggregate daily OHLCV into bars indexed by period end date."""
+    periods = daily.index.to_period(RESOLUTIONS[resolution])
+    # Sum volume in float64: float32 loses whole shares on monthly totals
+    bars = daily.astype({"Volume": "float64"}).groupby(periods).agg(AGGREGATIONS)
+    bars.index = bars.index.end_time.normalize()
+    bars.index.name = "Date"
+    return bars.astype({c: Config.PRICE_DTYPE for c in PRICE_COLUMNS})
+
+
+def _fingerprint(daily: pd.DataFrame) -> int:
+    """Order-sensitive hash of the daily rows (dates and prices)."""
+    hashed = pd.util.hash_pandas_object(daily, index=True).to_numpy()
+    return int(np.bitwise_xor.reduce(hashed * np.arange(1, len(hashed) + 1, dtype=np.uint64)))
+
+
+def _read_bars(path: Path) -> pd.DataFrame:
+    return pd.read_csv(
+        path,
+        index_col="Date",
+        parse_dates=True,
+        dtype={c: Config.PRICE_DTYPE for c in PRICE_COLUMNS},
+    )
+
+
+def _period_start(bars: pd.DataFrame, resolution: str) -> pd.Timestamp:
+    return pd.Period(bars.index[-1], RESOLUTIONS[resolution]).start_time
+
+
+def _line_offset(data: bytes, start: pd.Timestamp, base: int = 0) -> Optional[int]:
+    """
+    Byte offset (base + position in `data`) of the last CSV row dated before
+    `start`, or of the first row if none is. Scans backwards from the end.
+    """
+    key = start.strftime("%Y-%m-%d").encode()
+    end, offset = len(data), None
+    while end > 0:
+        line = data.rfind(b"\n", 0, end - 1) + 1
+        if not data[line:line + 1].isdigit():  # header
+            break
+        offset = line
+        if data[line:line + len(key)] < key:
+            break
+        end = line
+    return None if offset is None else base + offset
+
+
+def _read_tail(path: Path, offset: int) -> Optional[Tuple[pd.DataFrame, bytes]]:
+    """Daily rows of the CSV from byte `offset` on (conformed) and their raw bytes, if offset starts a row."""
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        header = f.readline()
+        if offset < len(header):
+            return None
+        f.seek(offset - 1)
+        if f.read(1) != b"\n":
+            return None
+        data = f.read()
+    if not data.strip():
+        return None
+    df = read_price_csv(io.BytesIO(header + data))
+    return conform(df), data
+
+
+@instrumented("update_bars")
+def update_bars(symbol: str, resolution: str) -> pd.DataFrame:
+    """Bring the stored bars for `symbol` up to date with the daily store."""
+    symbol = symbol.upper()
+    daily_csv = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+    bars_path, meta_path = _paths(symbol, resolution)
+
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+    bars = _read_bars(bars_path) if meta and meta.get("offset") is not None and bars_path.exists() else None
+
+    tail = None
+    if bars is not None and len(bars):
+        tail = _read_tail(daily_csv, meta["offset"])
+    if tail is not None:
+        known = tail[0].iloc[:meta["daily_rows"]]
+        if not (len(known) == meta["daily_rows"]
+                and known.index[-1] == pd.Timestamp(meta["through"])
+                and _fingerprint(known) == meta["fingerprint"]):
+            tail = None
+
+    if tail is not None:
+        # Re-aggregate from the start of the last stored (possibly partial) bar
+        daily, data = tail
+        base = meta["offset"]
+        start = _period_start(bars, resolution)
+        bars = pd.concat([bars.loc[:start - pd.Timedelta(days=1)], aggregate_bars(daily.loc[start:], resolution)])
+        increment("bars_incremental_updates")
+    else:
+        bars = aggregate_bars(load_stock_data(symbol), resolution)
+        data, base = (daily_csv.read_bytes(), 0) if daily_csv.exists() else (b"", 0)
+        increment("bars_full_rebuilds")
+
+    bars_path.parent.mkdir(parents=True, exist_ok=True)
+    bars.to_csv(bars_path)
+    offset = _line_offset(data, _period_start(bars, resolution), base)
+    tail = _read_tail(daily_csv, offset) if offset is not None else None
+    if tail is None:  # no usable offset: the next update rebuilds
+        meta_path.write_text(json.dumps({"offset": None}))
+        return bars
+    daily = tail[0]
+    meta_path.write_text(json.dumps({
+        "offset": offset,
+        "through": daily.index[-1].strftime("%Y-%m-%d"),
+        "daily_rows": len(daily),
+        "fingerprint": _fingerprint(daily),
+    }))
+    return bars
+
+
+def get_bars(symbol: str, resolution: str = "weekly") -> pd.DataFrame:
+    """
+    Pre-aggregated bars for a symbol. Reads the stored bars unless the daily
+    CSV changed since they were written, in which case they are updated first.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}'. Use one of {list(RESOLUTIONS)}")
+    symbol = symbol.upper()
+    key = (symbol, resolution)
+    daily_csv = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+    daily_mtime = daily_csv.stat().st_mtime if daily_csv.exists() else None
+
+    with _memo_lock:
+        cached = _memo.get(key)
+    if cached is not None and daily_mtime is not None and cached[0] == daily_mtime:
+        increment("bars_memo_hits")
+        return cached[1]
+
+    bars_path, meta_path = _paths(symbol, resolution)
+    fresh = (
+        daily_mtime is not None
+        and bars_path.exists()
+        and meta_path.exists()
+        and bars_path.stat().st_mtime >= daily_mtime
+    )
+    bars = _read_bars(bars_path) if fresh else update_bars(symbol, resolution)
+
+    if daily_mtime is None:  # fetched just now by load_stock_data
+        daily_mtime = daily_csv.stat().st_mtime
+    with _memo_lock:
+        _memo[key] = (daily_mtime, bars)
+    return bars
+
@@ -0,0 +1,239 @@
+"""
+Two-stage scoring cascade.
+
+Stage 1 is a cheap classifier (logistic regression or gradient boosting) on
+the latest day's feature vector. Windows where it is confident, i.e. its
+P(week UP) is at least `margin` outside the NEUTRAL_LOW/NEUTRAL_HIGH band,
+are decided from its probabilities. Only the ambiguous rest go through the
+60-step LSTM.
+
+`fit_cascade` trains stage 1 on the LSTM's own training windows, then sweeps
+the margin on its validation windows (the trainer's held-out period) and
+keeps the smallest one (most LSTM calls skipped) whose week-direction
+accuracy stays within Config.CASCADE_MAX_ACC_DROP of the LSTM alone. The
+result is saved to Config.CASCADE_PATH together with the model version its
+features were scaled for.
+"""
+
+import datetime as dt
+import time
+from typing import Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.feature_engineer import (
+    create_technical_indicators,
+    create_targets,
+    build_feature_matrix,
+    make_sequences,
+)
+from src.instrumentation import timed
+from src.model_registry import ModelBundle, load_bundle, validation_start
+
+MARGIN_GRID = np.round(np.arange(0.0, 0.3001, 0.01), 3)
+
+
+def make_stage1(kind: str = None):
+    kind = kind or Config.CASCADE_MODEL
+    if kind == "logistic":
+        return LogisticRegression(max_iter=1000)
+    if kind == "gbm":
+        return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.05,
+                                              random_state=Config.RANDOM_STATE)
+    raise ValueError(f"Unknown cascade model '{kind}'. Use 'logistic' or 'gbm'")
+
+
+def confident_mask(p_week_up: np.ndarray, margin: float,
+                   neutral_low: float = None, neutral_high: float = None) -> np.ndarray:
+    """True where stage 1 is decisive enough to skip the LSTM."""
+    neutral_low = Config.NEUTRAL_LOW if neutral_low is None else neutral_low
+    neutral_high = Config.NEUTRAL_HIGH if neutral_high is None else neutral_high
+    return (p_week_up <= neutral_low - margin) | (p_week_up >= neutral_high + margin)
+
+
+def collect_windows(bundle: ModelBundle, symbols: Sequence[str]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Windows of each symbol split where the bundle's validation period starts
+    (src.model_registry.validation_start), scaled with the bundle's scalers.
+    Returns {"train": {...}, "val": {...}} with X_seq, X_last, y_tom_dir,
+    y_week_dir.
+    """
+    parts = {"train": [], "val": []}
+    for symbol in symbols:
+        try:
+            df = load_stock_data(symbol)
+            df = create_technical_indicators(df, symbol=symbol)
+            df = create_targets(df)
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+            continue
+        X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, _ = build_feature_matrix(
+            df, scaler=bundle.scalers.get(symbol)
+        )
+        X_seq, y_tom_dir, y_week_dir, _, _ = make_sequences(
+            X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, seq_len=Config.SEQUENCE_LENGTH
+        )
+        split_idx = validation_start(bundle, symbol, df.index.values[Config.SEQUENCE_LENGTH:])
+        for name, sl in (("train", slice(None, split_idx)), ("val", slice(split_idx, None))):
+            parts[name].append({
+                "X_seq": X_seq[sl],
+                "y_tom_dir": y_tom_dir[sl],
+                "y_week_dir": y_week_dir[sl],
+            })
+
+    out = {}
+    for name, items in parts.items():
+        if not items:
+            raise RuntimeError("❌ No valid data for any symbol")
+        X_seq = np.concatenate([p["X_seq"] for p in items])
+        out[name] = {
+            "X_seq": X_seq,
+            "X_last": X_seq[:, -1, :],  # latest day of each window
+            "y_tom_dir": np.concatenate([p["y_tom_dir"] for p in items]),
+            "y_week_dir": np.concatenate([p["y_week_dir"] for p in items]),
+        }
+    return out
+
+
+def _accuracy(p_up: np.ndarray, y: np.ndarray) -> float:
+    return float(((p_up >= 0.5) == (y == 1)).mean())
+
+
+def sweep_margins(
+    stage1: Dict[str, np.ndarray],
+    lstm: Dict[str, np.ndarray],
+    y_tom_dir: np.ndarray,
+    y_week_dir: np.ndarray,
+    margins: np.ndarray = MARGIN_GRID,
+) -> pd.DataFrame:
+    """Accuracy and LSTM share of the cascade for each margin (vectorized over margins)."""
+    conf = confident_mask(stage1["p_week_up"][None, :], margins[:, None])  # (margins, n)
+
+    def accuracy(p_stage1, p_lstm, y):
+        hit_stage1 = (p_stage1 >= 0.5) == (y == 1)
+        hit_lstm = (p_lstm >= 0.5) == (y == 1)
+        return np.where(conf, hit_stage1[None, :], hit_lstm[None, :]).mean(axis=1)
+
+    acc_week = accuracy(stage1["p_week_up"], lstm["p_week_up"], y_week_dir)
+    acc_tom = accuracy(stage1["p_tom_up"], lstm["p_tom_up"], y_tom_dir)
+    lstm_acc_week = _accuracy(lstm["p_week_up"], y_week_dir)
+    lstm_acc_tom = _accuracy(lstm["p_tom_up"], y_tom_dir)
+    return pd.DataFrame({
+        "margin": margins,
+        "lstm_share": 1.0 - conf.mean(axis=1),
+        "acc_week": acc_week,
+        "acc_week_drop": lstm_acc_week - acc_week,
+        "acc_tom": acc_tom,
+        "acc_tom_drop": lstm_acc_tom - acc_tom,
+    })
+
+
+def fit_cascade(
+    symbols: Sequence[str] = Config.SUPPORTED_STOCKS,
+    kind: Optional[str] = None,
+    max_acc_drop: Optional[float] = None,
+) -> Dict:
+    """Fit stage 1, choose the margin on validation, save and return the cascade."""
+    kind = kind or Config.CASCADE_MODEL
+    max_acc_drop = Config.CASCADE_MAX_ACC_DROP if max_acc_drop is None else max_acc_drop
+    bundle = load_bundle()
+    data = collect_windows(bundle, symbols)
+    train, val = data["train"], data["val"]
+    print(f"📊 Stage-1 training rows: {len(train['X_last']):,} | validation: {len(val['X_last']):,}")
+
+    tom_clf = make_stage1(kind).fit(train["X_last"], train["y_tom_dir"])
+    week_clf = make_stage1(kind).fit(train["X_last"], train["y_week_dir"])
+
+    t0 = time.perf_counter()
+    stage1 = {
+        "p_tom_up": tom_clf.predict_proba(val["X_last"])[:, 1],
+        "p_week_up": week_clf.predict_proba(val["X_last"])[:, 1],
+    }
+    stage1_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    preds = bundle.model.predict(val["X_seq"], batch_size=1024, verbose=0)
+    lstm_seconds = time.perf_counter() - t0
+    lstm = {"p_tom_up": preds[0].reshape(-1), "p_week_up": preds[1].reshape(-1)}
+
+    sweep = sweep_margins(stage1, lstm, val["y_tom_dir"], val["y_week_dir"])
+    ok = sweep[sweep["acc_week_drop"] <= max_acc_drop]
+    if ok.empty:
+        margin = float("inf")  # stage 1 never good enough: cascade sends everything to the LSTM
+        chosen = None
+    else:
+        chosen = ok.iloc[0]
+        margin = float(chosen["margin"])
+
+    lstm_share = 1.0 if chosen is None else float(chosen["lstm_share"])
+    report = {
+        "kind": kind,
+        "margin": margin,
+        "max_acc_drop": max_acc_drop,
+        "val_windows": int(len(val["X_last"])),
+        "lstm_share": lstm_share,
+        "lstm_acc_week": _accuracy(lstm["p_week_up"], val["y_week_dir"]),
+        "lstm_acc_tom": _accuracy(lstm["p_tom_up"], val["y_tom_dir"]),
+        "cascade_acc_week": float(chosen["acc_week"]) if chosen is not None else None,
+        "cascade_acc_tom": float(chosen["acc_tom"]) if chosen is not None else None,
+        # Estimated cost per window relative to LSTM-only scoring
+        "stage1_ms_per_1k": 1e3 * stage1_seconds / len(val["X_last"]) * 1000,
+        "lstm_ms_per_1k": 1e3 * lstm_seconds / len(val["X_last"]) * 1000,
+    }
+    report["compute_saved"] = 1.0 - (
+        stage1_seconds + lstm_share * lstm_seconds
+    ) / lstm_seconds
+
+    cascade = {
+        "model_version": bundle.version,
+        "fitted_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "tom": tom_clf,
+        "week": week_clf,
+        "margin": margin,
+        "report": report,
+        "sweep": sweep,
+    }
+    Config.CASCADE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(cascade, Config.CASCADE_PATH)
+    return cascade
+
+
+def load_cascade(model_version: Optional[str] = None) -> Optional[Dict]:
+    """Saved cascade, or None if missing or fitted against another model version."""
+    if not Config.CASCADE_PATH.exists():
+        return None
+    cascade = joblib.load(Config.CASCADE_PATH)
+    if model_version is not None and cascade["model_version"] != model_version:
+        print(f"⚠️ Cascade was fitted for model {cascade['model_version']}, "
+              f"current is {model_version}: using the LSTM only. Re-run: python cascade.py")
+        return None
+    return cascade
+
+
+def cascade_predict(cascade: Dict, model, X_seq: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Score windows through the cascade. Returns p_tom_up, p_week_up and
+    `stage` (1 = decided by stage 1, 2 = LSTM).
+    """
+    X_last = X_seq[:, -1, :]
+    with timed("cascade_stage1"):
+        p_tom = cascade["tom"].predict_proba(X_last)[:, 1].astype(np.float32)
+        p_week = cascade["week"].predict_proba(X_last)[:, 1].astype(np.float32)
+    ambiguous = ~confident_mask(p_week, cascade["margin"])
+
+    if ambiguous.any():
+        with timed("model_predict"):
+            preds = model.predict(X_seq[ambiguous], batch_size=1024, verbose=0)
+        p_tom[ambiguous] = preds[0].reshape(-1)
+        p_week[ambiguous] = preds[1].reshape(-1)
+    return {
+        "p_tom_up": p_tom,
+        "p_week_up": p_week,
+        "stage": np.where(ambiguous, 2, 1).astype(np.int8),
+    }
@@ -0,0 +1,174 @@
+"""
+Resumable training: periodic checkpoints of everything model.fit needs to
+continue where it stopped.
+
+Layout (one in-progress run at a time):
+    models/checkpoints/
+      run.json               hyperparameters, data range, epochs (fixed at run start)
+      dataset.npz            feature matrix and targets (no recomputation on resume)
+      scalers.joblib         per-symbol scalers fitted for this run
+      ckpt-<epoch>.*         tf.train.Checkpoint: model weights + optimizer (slots, step, lr)
+      best_weights.npz       EarlyStopping's best weights (restore_best_weights)
+      state.json             epoch counter, EarlyStopping / ReduceLROnPlateau counters, history
+
+state.json is written after the TF checkpoint with an atomic os.replace,
+so it always names a checkpoint that exists.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import tensorflow as tf
+
+from config import Config
+
+RUN_FILE = "run.json"
+STATE_FILE = "state.json"
+DATASET_FILE = "dataset.npz"
+SCALERS_FILE = "scalers.joblib"
+BEST_WEIGHTS_FILE = "best_weights.npz"
+
+
+def _checkpoint_dir() -> Path:
+    return Config.CHECKPOINT_DIR
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def has_checkpoint() -> bool:
+    return (_checkpoint_dir() / STATE_FILE).exists()
+
+
+def clear_checkpoints() -> None:
+    shutil.rmtree(_checkpoint_dir(), ignore_errors=True)
+
+
+def start_run(run: Dict, arrays: Dict[str, np.ndarray], scalers: Dict) -> None:
+    """Begin a fresh run: drop old checkpoints, persist run settings and the prepared dataset."""
+    clear_checkpoints()
+    path = _checkpoint_dir()
+    path.mkdir(parents=True)
+    np.savez(path / DATASET_FILE, **arrays)
+    joblib.dump(scalers, path / SCALERS_FILE)
+    _write_json(path / RUN_FILE, run)
+
+
+def is_finished() -> bool:
+    """True if the checkpointed fit ran to completion (only evaluation/publish remain)."""
+    return json.loads((_checkpoint_dir() / STATE_FILE).read_text()).get("finished", False)
+
+
+def load_run() -> tuple:
+    """(run settings, dataset arrays, scalers) of the checkpointed run."""
+    path = _checkpoint_dir()
+    run = json.loads((path / RUN_FILE).read_text())
+    with np.load(path / DATASET_FILE, allow_pickle=False) as data:
+        arrays = {k: data[k] for k in data.files}
+    return run, arrays, joblib.load(path / SCALERS_FILE)
+
+
+def _save_weights(path: Path, weights: List[np.ndarray]) -> None:
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, *weights)
+    os.replace(tmp, path)
+
+
+def _load_weights(path: Path) -> List[np.ndarray]:
+    with np.load(path) as data:
+        return [data[f"arr_{i}"] for i in range(len(data.files))]
+
+
+class TrainingCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Saves model + optimizer and callback state every `every_epochs` epochs,
+    and restores it on resume. Put it LAST in the callback list: Keras runs
+    callbacks in order, so its on_train_begin undoes the other callbacks'
+    resets and its on_epoch_end sees their updated counters.
+    """
+
+    def __init__(self, early_stopping: tf.keras.callbacks.EarlyStopping,
+                 reduce_lr: tf.keras.callbacks.ReduceLROnPlateau,
+                 every_epochs: Optional[int] = None):
+        super().__init__()
+        self.early_stopping = early_stopping
+        self.reduce_lr = reduce_lr
+        self.every_epochs = every_epochs or Config.CHECKPOINT_EVERY_EPOCHS
+        self.path = _checkpoint_dir()
+        self.history: Dict[str, List[float]] = {}
+        self._state: Optional[Dict] = None
+        self._saved_best_epoch: Optional[int] = None
+        self._manager: Optional[tf.train.CheckpointManager] = None
+        self._epoch = 0
+
+    def _checkpoint_manager(self) -> tf.train.CheckpointManager:
+        if self._manager is None:
+            ckpt = tf.train.Checkpoint(model=self.model, optimizer=self.model.optimizer)
+            self._manager = tf.train.CheckpointManager(
+                ckpt, str(self.path), max_to_keep=Config.CHECKPOINT_KEEP, checkpoint_name="ckpt",
+            )
+        return self._manager
+
+    def restore(self, model: tf.keras.Model) -> int:
+        """Load the latest checkpoint into `model`. Returns the epoch to resume from (initial_epoch)."""
+        self.set_model(model)
+        state = json.loads((self.path / STATE_FILE).read_text())
+        # Create optimizer slots first so they are restored now, not deferred
+        model.optimizer.build(model.trainable_variables)
+        ckpt = tf.train.Checkpoint(model=model, optimizer=model.optimizer)
+        ckpt.restore(str(self.path / state["checkpoint"])).assert_existing_objects_matched()
+        self.history = state["history"]
+        self._state = state
+        self._saved_best_epoch = state["early_stopping"]["best_epoch"]
+        self._epoch = state["epoch"]
+        return state["epoch"]
+
+    def on_train_begin(self, logs=None):
+        if self._state is None:
+            return
+        es, lr = self._state["early_stopping"], self._state["reduce_lr"]
+        self.early_stopping.wait = es["wait"]
+        self.early_stopping.best = es["best"]
+        self.early_stopping.best_epoch = es["best_epoch"]
+        best_path = self.path / BEST_WEIGHTS_FILE
+        if self.early_stopping.restore_best_weights and best_path.exists():
+            self.early_stopping.best_weights = _load_weights(best_path)
+        self.reduce_lr.wait = lr["wait"]
+        self.reduce_lr.best = lr["best"]
+        self.reduce_lr.cooldown_counter = lr["cooldown_counter"]
+
+    def on_epoch_end(self, epoch, logs=None):
+        for key, value in (logs or {}).items():
+            self.history.setdefault(key, []).append(float(value))
+        self._epoch = epoch + 1
+        if self._epoch % self.every_epochs == 0 and not self.model.stop_training:
+            self.save(self._epoch)
+
+    def on_train_end(self, logs=None):
+        # Reached only when fit returns normally (epochs exhausted or early stop)
+        self.save(self._epoch, finished=True)
+
+    def save(self, epoch: int, finished: bool = False) -> None:
+        """Checkpoint after `epoch` completed epochs."""
+        saved = self._checkpoint_manager().save(checkpoint_number=epoch)
+        es, lr = self.early_stopping, self.reduce_lr
+        if es.best_weights is not None and es.best_epoch != self._saved_best_epoch:
+            _save_weights(self.path / BEST_WEIGHTS_FILE, es.best_weights)
+            self._saved_best_epoch = es.best_epoch
+        _write_json(self.path / STATE_FILE, {
+            "epoch": epoch,
+            "finished": finished,
+            "checkpoint": Path(saved).name,
+            "learning_rate": float(tf.keras.backend.get_value(self.model.optimizer.learning_rate)),
+            "early_stopping": {"wait": es.wait, "best": float(es.best), "best_epoch": es.best_epoch},
+            "reduce_lr": {"wait": lr.wait, "best": float(lr.best), "cooldown_counter": lr.cooldown_counter},
+            "history": self.history,
+        })
@@ -0,0 +1,37 @@
+"""
+CPU slicing for local worker processes: each worker is pinned to its own
+set of cores and TensorFlow's thread pools are sized to match, so N
+workers do not oversubscribe the machine.
+"""
+
+import os
+from typing import Iterable, List
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cpu_slices(workers: int, threads_per_worker: int) -> List[set]:
+    """Split the CPUs this process may use into one slice per worker (wrapping if oversubscribed)."""
+    cpus = available_cpus()
+    return [
+        {cpus[(w * threads_per_worker + t) % len(cpus)] for t in range(threads_per_worker)}
+        for w in range(workers)
+    ]
+
+
+def default_workers(threads_per_worker: int) -> int:
+    return max(1, len(available_cpus()) // threads_per_worker)
+
+
+def pin_to_cpus(cpus: Iterable[int], threads: int) -> None:
+    """Pin the calling process and size TensorFlow's pools. Call before the first TF op."""
+    import tensorflow as tf
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, set(cpus))
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
@@ -0,0 +1,205 @@
+"""
+Cross-sectional (market-relative) features.
+
+All symbols of the universe are aligned on one calendar (every date on which
+any of them traded) as a symbols × dates close matrix, and the features are
+computed for the whole matrix at once:
+
+- xs_ret_rank:  percentile rank of the 1-day return across the universe (0-1)
+- xs_ret_z:     z-score of the 1-day return across the universe
+- xs_sector_z:  z-score of the 1-day return within the symbol's sector
+                (Config.SECTORS; unlisted symbols form one "other" group)
+- xs_rs_20:     relative strength: RS-window log return minus that of the
+                equal-weight universe index
+
+Dates are joined by integer day number into a dense day grid, so aligning N
+rows costs O(N) instead of one index merge per symbol. A symbol's columns are
+NaN on days it has no row and until it has RS-window days of history.
+
+Enabled with Config.CROSS_SECTIONAL_FEATURES (changes the model inputs:
+retrain and rebuild the panel after switching). The table for
+Config.CROSS_SECTIONAL_UNIVERSE is memoised per process until a daily CSV
+changes; create_technical_indicators(df, symbol=...) joins it.
+"""
+
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.instrumentation import increment, instrumented
+
+CROSS_SECTIONAL_COLUMNS = ["xs_ret_rank", "xs_ret_z", "xs_sector_z", "xs_rs_20"]
+
+
+class CrossSectionalTable:
+    """Features of every universe symbol on the common calendar: values[symbol, date, feature]."""
+
+    def __init__(self, symbols: List[str], dates: pd.DatetimeIndex, values: np.ndarray):
+        self.symbols = symbols
+        self.dates = dates
+        self.values = values
+        self.features = list(CROSS_SECTIONAL_COLUMNS)
+        self._rows = {s: i for i, s in enumerate(symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def columns_for(self, symbol: str, index: pd.DatetimeIndex, dtype="float32") -> Dict[str, np.ndarray]:
+        """Feature columns for `symbol` on `index` (hash join on the calendar; NaN where unknown)."""
+        if symbol not in self._rows:
+            raise ValueError(f"{symbol} is not in the cross-sectional universe "
+                             f"(Config.CROSS_SECTIONAL_UNIVERSE)")
+        pos = self.dates.get_indexer(index)
+        rows = np.full((len(index), len(self.features)), np.nan, dtype=dtype)
+        hit = pos >= 0
+        rows[hit] = self.values[self._rows[symbol], pos[hit]]
+        return {c: rows[:, j] for j, c in enumerate(self.features)}
+
+
+def align_close(frames: Mapping[str, pd.DataFrame], column: str = "Close") -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    (calendar, close[symbol, date]) for `frames` in iteration order. The
+    calendar is every date any symbol has; missing rows are NaN.
+    """
+    days = {s: df.index.values.astype("datetime64[D]").astype(np.int64) for s, df in frames.items()}
+    lo = min(int(d[0]) for d in days.values() if len(d))
+    hi = max(int(d[-1]) for d in days.values() if len(d))
+    present = np.zeros(hi - lo + 1, dtype=bool)
+    for d in days.values():
+        present[d - lo] = True
+    slot = np.cumsum(present) - 1  # day grid -> calendar position
+    calendar = pd.DatetimeIndex((np.flatnonzero(present) + lo).astype("datetime64[D]"), name="Date")
+
+    close = np.full((len(frames), len(calendar)), np.nan)
+    for i, (symbol, df) in enumerate(frames.items()):
+        close[i, slot[days[symbol] - lo]] = df[column].to_numpy(dtype=np.float64)
+    return calendar, close
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along the date axis."""
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.take_along_axis(values, idx, axis=1)
+
+
+def _group_zscore(x: np.ndarray, valid: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """z-score of x[symbol, date] within each group of symbols, per date (0 where a group has < 2 values)."""
+    onehot = (groups[None, :] == np.unique(groups)[:, None]).astype(np.float64)  # (groups, symbols)
+    x0 = np.where(valid, x, 0.0)
+    count = onehot @ valid
+    mean = (onehot @ x0) / np.maximum(count, 1)
+    var = (onehot @ (x0 * x0)) / np.maximum(count, 1) - mean ** 2
+    member = onehot.argmax(axis=0)
+    std = np.sqrt(np.maximum(var, 0))[member]
+    z = (x - mean[member]) / (std + 1e-9)
+    return np.where(count[member] >= 2, z, 0.0)
+
+
+def _percentile_rank(x: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Rank of x[symbol, date] among the valid symbols of each date, scaled to 0-1."""
+    order = np.argsort(np.where(valid, x, np.inf), axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(x.shape[0])[:, None], axis=0)
+    n = valid.sum(axis=0)
+    return np.where(n > 1, ranks / np.maximum(n - 1, 1), 0.5)
+
+
+@instrumented("build_cross_sectional", track_memory=True)
+def build_table(
+    frames: Mapping[str, pd.DataFrame],
+    sectors: Optional[Mapping[str, str]] = None,
+    rs_window: Optional[int] = None,
+) -> CrossSectionalTable:
+    """Cross-sectional features for every symbol in `frames` (OHLCV with a Date index)."""
+    sectors = Config.SECTORS if sectors is None else sectors
+    rs_window = rs_window or Config.CROSS_SECTIONAL_RS_WINDOW
+    symbols = list(frames)
+    calendar, close = align_close(frames)
+
+    has_row = ~np.isnan(close)
+    filled = _ffill(close)
+    prev = np.concatenate([np.full((len(symbols), 1), np.nan), filled[:, :-1]], axis=1)
+    ret = close / prev - 1.0
+    valid = ~np.isnan(ret)
+
+    universe = np.zeros(len(symbols), dtype=np.int64)
+    groups = np.array([sectors.get(s, "other") for s in symbols])
+    ret_z = _group_zscore(ret, valid, universe)
+    sector_z = _group_zscore(ret, valid, groups)
+
+    # Equal-weight index: mean 1-day return of the symbols trading that day
+    n = valid.sum(axis=0)
+    index_ret = np.where(valid, ret, 0.0).sum(axis=0) / np.maximum(n, 1)
+    log_index = np.cumsum(np.log1p(index_ret))
+    log_close = np.log(filled)
+    rs = np.full_like(close, np.nan)
+    rs[:, rs_window:] = (
+        (log_close[:, rs_window:] - log_close[:, :-rs_window])
+        - (log_index[rs_window:] - log_index[:-rs_window])[None, :]
+    )
+
+    values = np.stack([_percentile_rank(ret, valid), ret_z, sector_z, rs], axis=-1)
+    values[~(has_row & valid)] = np.nan
+    return CrossSectionalTable(symbols, calendar, values.astype(np.float32))
+
+
+# Every symbol of a universe pass asks for the table: re-stat the CSVs at most this often
+_RECHECK_SECONDS = 5.0
+
+_memo: Dict[str, Tuple[float, tuple, CrossSectionalTable]] = {}
+_memo_lock = threading.Lock()
+
+
+def _universe() -> List[str]:
+    return [s.upper() for s in (Config.CROSS_SECTIONAL_UNIVERSE or Config.SUPPORTED_STOCKS)]
+
+
+def _stamps(symbols: Sequence[str]) -> tuple:
+    paths = ((s, Config.DATA_RAW_DIR / f"{s}_raw.csv") for s in symbols)
+    return tuple((s, p.stat().st_mtime_ns if p.exists() else None) for s, p in paths)
+
+
+def get_table(symbols: Optional[Sequence[str]] = None) -> CrossSectionalTable:
+    """
+    Table for `symbols` (default Config.CROSS_SECTIONAL_UNIVERSE), rebuilt
+    when any of their daily CSVs changed since it was last built.
+    """
+    symbols = [s.upper() for s in symbols] if symbols else _universe()
+    key = ",".join(symbols)
+
+    with _memo_lock:
+        cached = _memo.get(key)
+    if cached is not None:
+        checked_at, stamps, table = cached
+        now = time.monotonic()
+        if now - checked_at < _RECHECK_SECONDS or stamps == _stamps(symbols):
+            if now - checked_at >= _RECHECK_SECONDS:
+                with _memo_lock:
+                    _memo[key] = (now, stamps, table)
+            increment("cross_sectional_memo_hits")
+            return table
+
+    frames = {}
+    for symbol in symbols:
+        try:
+            frames[symbol] = load_stock_data(symbol)
+        except Exception as e:
+            print(f"  ⚠️ Cross-sectional universe: skipping {symbol}: {e}")
+    if not frames:
+        raise RuntimeError("❌ No data for any symbol of the cross-sectional universe")
+    table = build_table(frames)
+    with _memo_lock:
+        _memo[key] = (time.monotonic(), _stamps(symbols), table)
+    return table
+
+
+def cross_sectional_columns(symbol: str, index: pd.DatetimeIndex, dtype="float32") -> Dict[str, np.ndarray]:
+    """The cross-sectional feature columns of `symbol` on `index`."""
+    return get_table().columns_for(symbol.upper(), index, dtype)
@@ -1,19 +1,27 @@
+import asyncio
+import atexit
 import datetime as dt
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Union
 
 import pandas as pd
-import requests
 
 from config import Config
+from src.eodhd_client import EODHDClient, run_sync
+from src.instrumentation import increment, instrumented
+from src.trading_calendar import conform
 
 
 # TODO: paste your own EODHD API key here
 # You get this from your EODHD account dashboard.
 EODHD_API_KEY = " 6942667c267a86.58820444"
 
-# EODHD base URL for end-of-day prices
-EODHD_BASE_URL = "https://eodhd.com/api/eod"
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def _slim_prices(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast price/volume columns to Config.PRICE_DTYPE (float32 by default)."""
+    return df.astype({c: Config.PRICE_DTYPE for c in PRICE_COLUMNS}, copy=False)
 
 
 def ensure_dirs() -> None:
@@ -31,62 +39,8 @@ def _eodhd_symbol(symbol: str) -> str:
     return f"{symbol}.US"
 
 
-def fetch_stock_data(
-    symbol: str,
-    start: Optional[str] = None,
-    end: Optional[str] = None,
-    interval: str = Config.INTERVAL,
-) -> pd.DataFrame:
-    """
-    Fetch historical OHLCV data for a symbol using EODHD REST API.
-
-    - Uses explicit start/end dates (15+ years).
-    - Returns DataFrame with index 'Date' and columns:
-      Open, High, Low, Close, Adj Close, Volume
-    """
-    if EODHD_API_KEY == "YOUR_EODHD_API_KEY_HERE":
-        raise RuntimeError(
-            "Please set EODHD_API_KEY in src/data_loader.py "
-            "to your actual API key from eodhd.com."
-        )
-
-    ensure_dirs()
-
-    if start is None:
-        start = Config.START_DATE
-    if end is None:
-        end = Config.today_str()
-
-    # EODHD expects YYYY-MM-DD strings
-    start_date = start
-    end_date = end
-
-    # EODHD ticker format (e.g., AAPL.US)
-    eod_symbol = _eodhd_symbol(symbol)
-
-    params = {
-        "api_token": EODHD_API_KEY,
-        "from": start_date,
-        "to": end_date,
-        "fmt": "json",   # JSON response
-    }
-
-    # For daily bars, 'period' can be 'd'; EODHD daily is default.
-    # Many examples use '/eod/{symbol}', but here we use query param 's'.
-    url = f"{EODHD_BASE_URL}/{eod_symbol}"
-
-    resp = requests.get(url, params=params, timeout=30)
-    if resp.status_code != 200:
-        raise RuntimeError(
-            f"EODHD request failed for {symbol} "
-            f"with HTTP {resp.status_code}: {resp.text[:200]}"
-        )
-
-    try:
-        data = resp.json()
-    except Exception as exc:
-        raise RuntimeError(f"Failed to parse EODHD JSON for {symbol}: {exc}") from exc
-
+def _eod_frame(symbol: str, data, start_date: str, end_date: str) -> pd.DataFrame:
+    """EODHD /eod JSON rows -> DataFrame indexed by Date with OHLCV columns."""
     if not isinstance(data, list) or len(data) == 0:
         raise ValueError(
             f"No data returned from EODHD for {symbol} between {start_date} and {end_date}"
@@ -123,31 +77,155 @@ def fetch_stock_data(
     df = df.set_index("Date").sort_index()
 
     # Keep only expected columns in consistent order
-    df = df[["Open", "High", "Low", "Close", "Adj Close", "Volume"]]
+    df = df[PRICE_COLUMNS]
 
     if df.empty:
         raise ValueError(
             f"EODHD returned empty DataFrame for {symbol} "
             f"between {start_date} and {end_date}"
         )
+    return df
 
-    # Cache raw data to CSV
-    csv_path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
-    df.to_csv(csv_path)
 
-    return df
+def _check_api_key() -> None:
+    if EODHD_API_KEY == "YOUR_EODHD_API_KEY_HERE":
+        raise RuntimeError(
+            "Please set EODHD_API_KEY in src/data_loader.py "
+            "to your actual API key from eodhd.com."
+        )
+
+
+def eodhd_client(**kwargs) -> EODHDClient:
+    """New client configured from Config (rate limit, quota file, base URL)."""
+    return EODHDClient(EODHD_API_KEY.strip(), base_url=Config.EODHD_BASE_URL, **kwargs)
+
+
+_shared_client: Optional[EODHDClient] = None
+
+
+async def shared_client() -> EODHDClient:
+    """
+    The process-wide client (opened on first use, never closed): one token
+    bucket, semaphore and in-flight map for every fetch in this process, so
+    separate calls neither get a fresh burst each nor miss deduplication.
+    Only valid on the loop run_sync() uses.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = await eodhd_client().__aenter__()
+        atexit.register(lambda c=_shared_client: run_sync(c.__aexit__(None, None, None)))
+    return _shared_client
+
+
+async def fetch_many_async(
+    symbols: Sequence[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    client: Optional[EODHDClient] = None,
+) -> Dict[str, Union[pd.DataFrame, Exception]]:
+    """
+    Fetch and cache OHLCV for many symbols concurrently through one rate-limited
+    client (default: the process-wide one). Per-symbol failures are returned as
+    exceptions instead of raised.
+    """
+    _check_api_key()
+    ensure_dirs()
+    start = start or Config.START_DATE
+    end = end or Config.today_str()
+
+    def to_frame_and_cache(symbol: str, data) -> pd.DataFrame:
+        df = _eod_frame(symbol, data, start, end)
+        # Cache raw data to CSV
+        df.to_csv(Config.DATA_RAW_DIR / f"{symbol}_raw.csv")
+        return df
 
+    async def one(c: EODHDClient, symbol: str) -> pd.DataFrame:
+        data = await c.get_eod(_eodhd_symbol(symbol), start=start, end=end)
+        # Parse/write off the event loop so other downloads keep flowing
+        return await asyncio.to_thread(to_frame_and_cache, symbol, data)
 
+    c = client or await shared_client()
+    results = await asyncio.gather(*(one(c, s) for s in symbols), return_exceptions=True)
+    return dict(zip(symbols, results))
+
+
+@instrumented("fetch_stock_data")
+def fetch_stock_data(
+    symbol: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    interval: str = Config.INTERVAL,
+) -> pd.DataFrame:
+    """
+    Fetch historical OHLCV data for a symbol using EODHD REST API.
+
+    - Uses explicit start/end dates (15+ years).
+    - Returns DataFrame with index 'Date' and columns:
+      Open, High, Low, Close, Adj Close, Volume
+    - Intraday intervals ("1m", "5m", "1h") are written to the partitioned
+      store (src.intraday_store) and returned indexed by UTC 'Datetime';
+      for long intraday ranges stream with intraday_store.iter_bars instead.
+    """
+    if interval != "1d":
+        # Imported here: intraday_store builds on this module
+        from src.intraday_store import fetch_intraday_async, load_bars
+        run_sync(fetch_intraday_async(symbol, interval, start, end))
+        return load_bars(symbol, interval, start, end)
+    result = run_sync(fetch_many_async([symbol], start, end))[symbol]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+@instrumented("prefetch_stock_data")
+def prefetch_stock_data(symbols: Sequence[str], refresh: bool = False) -> List[str]:
+    """
+    Fetch every symbol whose CSV cache is missing (or all, with refresh)
+    concurrently, so the per-symbol load_stock_data calls that follow are
+    cache hits. Returns the symbols that were fetched.
+    """
+    todo = [s for s in symbols if refresh or not (Config.DATA_RAW_DIR / f"{s}_raw.csv").exists()]
+    if not todo:
+        return []
+    try:
+        results = run_sync(fetch_many_async(todo))
+    except Exception as e:
+        print(f"⚠️ Prefetch failed: {e}")
+        return []
+    for symbol, result in results.items():
+        if isinstance(result, Exception):
+            print(f"⚠️ {symbol}: fetch failed: {result}")
+    return [s for s, r in results.items() if not isinstance(r, Exception)]
+
+
+def read_price_csv(source) -> pd.DataFrame:
+    """Parse a daily price CSV (path or buffer) as stored under data/raw, without conforming it."""
+    return pd.read_csv(
+        source,
+        index_col="Date",
+        parse_dates=True,
+        usecols=["Date"] + PRICE_COLUMNS,
+        dtype={c: Config.PRICE_DTYPE for c in PRICE_COLUMNS},
+    )
+
+
+@instrumented("load_stock_data", track_memory=True)
 def load_stock_data(symbol: str, refresh: bool = False) -> pd.DataFrame:
     """
     Load cached raw data for a symbol, or fetch from EODHD if missing/refresh.
+    Prices and volume come back as Config.PRICE_DTYPE (float32) to keep
+    many symbols resident. Dates are sorted and unique, and sessions missing
+    from the history are forward-filled (src.trading_calendar.conform).
     """
     ensure_dirs()
     csv_path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
 
     if csv_path.exists() and not refresh:
-        df = pd.read_csv(csv_path, index_col="Date", parse_dates=True)
+        df = read_price_csv(csv_path)
         if not df.empty:
-            return df
+            increment("csv_cache_hits")
+            return conform(df)
+
+    increment("csv_cache_misses")
 
-    return fetch_stock_data(symbol)
+    return conform(_slim_prices(fetch_stock_data(symbol)))
@@ -1,8 +1,15 @@
-from typing import Dict, NamedTuple, Tuple
+from typing import Dict, NamedTuple, Sequence, Tuple
 from dataclasses import dataclass
 import numpy as np
 from config import Config
 
+# Integer codes used by the columnar decision arrays
+ACTION_LABELS = np.array(["SELL", "HOLD", "BUY"])        # action + 1
+DIRECTION_LABELS = np.array(["DOWN", "HOLD", "UP"])      # direction + 1
+LEVEL_LABELS = np.array(["LOW", "MEDIUM", "HIGH"])       # level
+
+LEVEL_LOW, LEVEL_MEDIUM, LEVEL_HIGH = 0, 1, 2
+
 @dataclass
 class PredictionResult:
     symbol: str
@@ -20,6 +27,103 @@ class PredictionResult:
     model_tomorrow_acc: float  # Raw validation accuracy
     model_week_acc: float      # Raw validation accuracy
 
+@dataclass
+class DecisionBatch:
+    """
+    Columnar trading decisions for N samples (symbols or backtest windows).
+    Directions/actions are int8 codes in {-1, 0, +1}, strength in {0, 1, 2};
+    use `labels()` or `row()` to get the string form.
+    """
+    p_tom_up: np.ndarray
+    p_week_up: np.ndarray
+    tom_direction: np.ndarray    # -1 DOWN, +1 UP
+    week_direction: np.ndarray   # -1 DOWN, 0 HOLD, +1 UP
+    action: np.ndarray           # -1 SELL, 0 HOLD, +1 BUY
+    tom_edge: np.ndarray         # |p_tom_up - 0.5|
+    week_edge: np.ndarray        # |p_week_up - 0.5|
+    signal_strength: np.ndarray  # 0 LOW, 1 MEDIUM, 2 HIGH
+
+    def __len__(self) -> int:
+        return len(self.action)
+
+    def labels(self, field: str) -> np.ndarray:
+        """String labels for a coded column (action, *_direction, signal_strength)."""
+        codes = getattr(self, field)
+        if field == "signal_strength":
+            return LEVEL_LABELS[codes]
+        if field == "action":
+            return ACTION_LABELS[codes + 1]
+        return DIRECTION_LABELS[codes + 1]
+
+    def row(self, i: int) -> Dict:
+        """Single decision in the dict form used by predict.py."""
+        return {
+            'p_tom_up': float(self.p_tom_up[i]),
+            'p_week_up': float(self.p_week_up[i]),
+            'tom_direction': str(DIRECTION_LABELS[self.tom_direction[i] + 1]),
+            'week_direction': str(DIRECTION_LABELS[self.week_direction[i] + 1]),
+            'action': str(ACTION_LABELS[self.action[i] + 1]),
+            'signal_strength': str(LEVEL_LABELS[self.signal_strength[i]]),
+            'week_edge': float(self.week_edge[i]),
+        }
+
+def _as_column(values) -> np.ndarray:
+    """Flatten scalars, lists or (N, 1) model outputs to a 1-D float64 array."""
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+def calibrate_edges(raw_prob, val_accuracy) -> np.ndarray:
+    """Array version of `RealisticConfidence.calibrate_edge`."""
+    raw_edge = np.abs(np.asarray(raw_prob) - 0.5) * 2  # Normalize to 0-1 edge
+    return raw_edge * val_accuracy  # Scale by actual validation accuracy
+
+def confidence_levels(
+    edge,
+    high_edge: float = Config.HIGH_EDGE,
+    medium_edge: float = Config.MEDIUM_EDGE,
+) -> np.ndarray:
+    """Edge → level codes (0 LOW, 1 MEDIUM, 2 HIGH)."""
+    edge = np.asarray(edge)
+    return (edge >= medium_edge).astype(np.int8) + (edge >= high_edge).astype(np.int8)
+
+def decide_batch(
+    p_tom_up,
+    p_week_up,
+    neutral_low: float = Config.NEUTRAL_LOW,
+    neutral_high: float = Config.NEUTRAL_HIGH,
+    high_edge: float = Config.HIGH_EDGE,
+    medium_edge: float = Config.MEDIUM_EDGE,
+) -> DecisionBatch:
+    """
+    Vectorized BUY/SELL/HOLD decisions from model probabilities.
+    Week-dominant: P(week UP) above the neutral band → BUY, below → SELL.
+    """
+    p_tom_up = _as_column(p_tom_up)
+    p_week_up = _as_column(p_week_up)
+
+    week_direction = (
+        (p_week_up >= neutral_high).astype(np.int8)
+        - (p_week_up <= neutral_low).astype(np.int8)
+    )
+    tom_direction = np.where(p_tom_up >= 0.50, 1, -1).astype(np.int8)
+
+    tom_edge = np.abs(p_tom_up - 0.5)
+    week_edge = np.abs(p_week_up - 0.5)
+
+    return DecisionBatch(
+        p_tom_up=p_tom_up,
+        p_week_up=p_week_up,
+        tom_direction=tom_direction,
+        week_direction=week_direction,
+        action=week_direction,  # action follows the weekly direction
+        tom_edge=tom_edge,
+        week_edge=week_edge,
+        signal_strength=confidence_levels(week_edge, high_edge, medium_edge),
+    )
+
+def decide_from_outputs(predictions: Sequence[np.ndarray], **thresholds) -> DecisionBatch:
+    """Decisions straight from `model.predict(X_seq)` (list of 4 heads, N rows each)."""
+    return decide_batch(predictions[0], predictions[1], **thresholds)
+
 class RealisticConfidence:
     """Convert raw model probabilities to realistic trading edges"""
     
@@ -29,83 +133,23 @@ class RealisticConfidence:
         Calibrate raw model probability to realistic trading edge.
         raw_prob=0.97 → calibrated_edge=0.12 (12% edge over random)
         """
-        raw_edge = abs(raw_prob - 0.5) * 2  # Normalize to 0-1 edge
-        return raw_edge * val_accuracy  # Scale by actual validation accuracy
+        return float(calibrate_edges(raw_prob, val_accuracy))
     
     @staticmethod
-    def get_confidence_level(edge: float) -> str:
-        """Convert edge to qualitative confidence"""
-        if edge >= 0.15:
-            return "HIGH"
-        elif edge >= 0.08:
-            return "MEDIUM"
-        else:
-            return "LOW"
-
-def make_trading_decision(
-    prob_tomorrow_up: float,
-    prob_week_up: float,
-    log_ret_tomorrow: float,
-    log_ret_week: float,
-    current_price: float,
-    val_acc_tomorrow: float,  # From training (e.g. 0.55)
-    val_acc_week: float,      # From training (e.g. 0.77)
-) -> PredictionResult:
-    """Professional trading decision with realistic confidence"""
-    
-    # Calculate realistic edges (not raw model probabilities)
-    tom_edge = RealisticConfidence.calibrate_edge(prob_tomorrow_up, val_acc_tomorrow)
-    week_edge = RealisticConfidence.calibrate_edge(prob_week_up, val_acc_week)
-    
-    # Convert log returns to %
-    tomorrow_pct = (np.exp(log_ret_tomorrow) - 1) * 100
-    week_pct = (np.exp(log_ret_week) - 1) * 100
-    
-    # Predicted prices
-    tomorrow_price = current_price * np.exp(log_ret_tomorrow)
-    week_price = current_price * np.exp(log_ret_week)
-    
-    # Directions
-    tomorrow_dir = "UP" if log_ret_tomorrow > 0 else "DOWN"
-    week_dir = "UP" if log_ret_week > 0 else "DOWN"
-    
-    # Trading decision (week-dominant, realistic thresholds)
-    week_conf_level = RealisticConfidence.get_confidence_level(week_edge)
-    
-    if week_conf_level == "HIGH":
-        action = "BUY" if week_dir == "UP" else "SELL"
-    elif week_conf_level == "MEDIUM":
-        action = "BUY" if week_dir == "UP" else "SELL"
-    else:
-        action = "HOLD"
-    
-    reason = (
-        f"{week_conf_level} weekly {week_dir} signal "
-        f"(model edge {week_edge*100:.0f}%). "
-        f"Week accuracy: {val_acc_week:.0%}"
-    )
-    
-    return PredictionResult(
-        symbol="AAPL",  # Will be set by caller
-        current_price=current_price,
-        tomorrow_direction=tomorrow_dir,
-        tomorrow_confidence=tom_edge,
-        tomorrow_pct_change=tomorrow_pct,
-        tomorrow_price=tomorrow_price,
-        week_direction=week_dir,
-        week_confidence=week_edge,
-        week_pct_change=week_pct,
-        week_price=week_price,
-        action=action,
-        reason=reason,
-        model_tomorrow_acc=val_acc_tomorrow,
-        model_week_acc=val_acc_week,
-    )
+    def get_confidence_level(edge: float, val_accuracy: float) -> str:
+        """
+        Qualitative level of a calibrated edge. HIGH_EDGE/MEDIUM_EDGE are
+        distances |p - 0.5|, so the edge is mapped back to that scale first;
+        the level then matches `decide_batch`'s signal strength.
+        """
+        return str(LEVEL_LABELS[confidence_levels(edge / (2 * val_accuracy))])
 
 def result_to_dict(result: PredictionResult) -> Dict:
     """Format professional output"""
-    tom_conf_level = RealisticConfidence.get_confidence_level(result.tomorrow_confidence)
-    week_conf_level = RealisticConfidence.get_confidence_level(result.week_confidence)
+    tom_conf_level = RealisticConfidence.get_confidence_level(
+        result.tomorrow_confidence, result.model_tomorrow_acc)
+    week_conf_level = RealisticConfidence.get_confidence_level(
+        result.week_confidence, result.model_week_acc)
     
     return {
         "symbol": result.symbol,
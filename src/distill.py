@@ -0,0 +1,214 @@
+"""
+Knowledge distillation of the multi-task LSTM into a small serving model.
+
+The student sees the same scaled 60-day windows as the teacher and is
+trained on the teacher's four outputs: its direction heads on the soft
+probabilities (binary cross-entropy against P(UP), not the 0/1 labels), its
+return heads on the teacher's predicted returns. Students:
+
+- "gru":  one 16-unit GRU
+- "conv": two strided temporal 1-D convolutions + global average pooling
+- "mlp":  dense layers over pooled features (last day, mean, max)
+
+The student is published to the registry as its own bundle (same scalers,
+metadata source="distilled", teacher=<version>) without becoming CURRENT,
+so serving can opt in per request (predict.py --universe --student).
+"""
+
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.layers import (
+    GRU,
+    Concatenate,
+    Conv1D,
+    Cropping1D,
+    Dense,
+    Flatten,
+    GlobalAveragePooling1D,
+    GlobalMaxPooling1D,
+    Input,
+)
+from tensorflow.keras.models import Model
+
+from config import Config
+from src.cascade import collect_windows
+from src.decision_engine import decide_batch
+from src.model_metrics import build_metrics_manifest
+from src.model_registry import list_versions, load_bundle, publish_bundle, read_metadata
+
+STUDENT_KINDS = ["gru", "conv", "mlp"]
+BATCH_SIZES = [1, 8, 64, 256, 1024]
+
+
+def build_student(input_shape, kind: Optional[str] = None) -> Model:
+    """Small model with the teacher's four named outputs."""
+    kind = kind or Config.STUDENT_KIND
+    inputs = Input(shape=input_shape, name='sequence_input')
+    if kind == "gru":
+        x = GRU(16)(inputs)
+    elif kind == "conv":
+        x = Conv1D(16, 5, strides=2, activation='relu')(inputs)
+        x = Conv1D(16, 5, strides=2, activation='relu')(x)
+        x = GlobalAveragePooling1D()(x)
+    elif kind == "mlp":
+        last_day = Flatten()(Cropping1D((input_shape[0] - 1, 0))(inputs))
+        x = Concatenate()([last_day, GlobalAveragePooling1D()(inputs), GlobalMaxPooling1D()(inputs)])
+        x = Dense(32, activation='relu')(x)
+    else:
+        raise ValueError(f"Unknown student '{kind}'. Use one of {STUDENT_KINDS}")
+    x = Dense(16, activation='relu')(x)
+
+    outputs = [
+        Dense(1, activation='sigmoid', name='tomorrow_output')(x),
+        Dense(1, activation='sigmoid', name='week_output')(x),
+        Dense(1, name='tomorrow_return')(x),
+        Dense(1, name='week_return')(x),
+    ]
+    model = Model(inputs=inputs, outputs=outputs, name=f"student_{kind}")
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+        loss={
+            'tomorrow_output': 'binary_crossentropy',  # soft targets: teacher P(UP)
+            'week_output': 'binary_crossentropy',
+            'tomorrow_return': 'mse',
+            'week_return': 'mse',
+        },
+        loss_weights=[1.0, 1.2, 0.1, 0.1],  # same weighting as the teacher
+    )
+    return model
+
+
+def serving_forward(model: tf.keras.Model):
+    """Compiled inference call, cached on the model (Keras predict overhead dominates small batches)."""
+    fn = getattr(model, "_serving_forward", None)
+    if fn is None:
+        def forward(x):
+            return model(x, training=False)
+        fn = tf.function(forward, reduce_retracing=True)
+        model._serving_forward = fn
+    return fn
+
+
+def throughput(model: tf.keras.Model, n_features: int, batch_sizes: Sequence[int] = BATCH_SIZES,
+               seconds: float = 0.5) -> Dict[int, float]:
+    """Windows per second of the compiled forward pass at each batch size."""
+    rng = np.random.default_rng(0)
+    forward = serving_forward(model)
+    out = {}
+    for batch in batch_sizes:
+        X = tf.constant(rng.standard_normal((batch, Config.SEQUENCE_LENGTH, n_features)), dtype=tf.float32)
+        forward(X)  # warm-up / tracing
+        calls, t0 = 0, time.perf_counter()
+        while True:
+            forward(X)
+            calls += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= seconds and calls >= 3:
+                break
+        out[batch] = calls * batch / elapsed
+    return out
+
+
+def action_agreement(teacher_preds, student_preds) -> Dict[str, float]:
+    """How often the student reproduces the teacher's BUY/SELL/HOLD and direction calls."""
+    teacher = decide_batch(teacher_preds[0], teacher_preds[1])
+    student = decide_batch(student_preds[0], student_preds[1])
+    return {
+        "action": float(np.mean(teacher.action == student.action)),
+        "week_direction": float(np.mean(teacher.week_direction == student.week_direction)),
+        "tom_direction": float(np.mean(teacher.tom_direction == student.tom_direction)),
+        "p_week_mae": float(np.mean(np.abs(teacher.p_week_up - student.p_week_up))),
+    }
+
+
+def distill(
+    symbols: Sequence[str] = Config.SUPPORTED_STOCKS,
+    kind: Optional[str] = None,
+    epochs: Optional[int] = None,
+) -> Dict:
+    """Train a student on the CURRENT model, publish it (not as CURRENT) and return a report."""
+    kind = kind or Config.STUDENT_KIND
+    epochs = epochs or Config.STUDENT_EPOCHS
+    t0 = time.perf_counter()
+    teacher = load_bundle()
+    data = collect_windows(teacher, symbols)
+    train, val = data["train"], data["val"]
+    print(f"📊 Distillation windows: {len(train['X_seq']):,} | validation: {len(val['X_seq']):,}")
+
+    print(f"👨‍🏫 Teacher {teacher.version} labelling windows...")
+    soft_train = teacher.model.predict(train["X_seq"], batch_size=1024, verbose=0)
+    soft_val = teacher.model.predict(val["X_seq"], batch_size=1024, verbose=0)
+
+    n_features = train["X_seq"].shape[2]
+    student = build_student((Config.SEQUENCE_LENGTH, n_features), kind)
+    print(f"🧑‍🎓 Training {kind} student ({student.count_params():,} vs "
+          f"{teacher.model.count_params():,} teacher parameters)...")
+    student.fit(
+        train["X_seq"], list(soft_train),
+        validation_data=(val["X_seq"], list(soft_val)),
+        epochs=epochs,
+        batch_size=Config.STUDENT_BATCH_SIZE,
+        callbacks=[tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss', patience=5, restore_best_weights=True)],
+        verbose=2,
+    )
+    student_val = student.predict(val["X_seq"], batch_size=1024, verbose=0)
+
+    print("⏱️ Measuring throughput...")
+    report = {
+        "kind": kind,
+        "teacher": teacher.version,
+        "params": {"teacher": int(teacher.model.count_params()), "student": int(student.count_params())},
+        "agreement": action_agreement(soft_val, student_val),
+        "accuracy": {
+            "teacher": {
+                "tomorrow": float(np.mean((soft_val[0].reshape(-1) > 0.5) == (val["y_tom_dir"] == 1))),
+                "week": float(np.mean((soft_val[1].reshape(-1) > 0.5) == (val["y_week_dir"] == 1))),
+            },
+            "student": {
+                "tomorrow": float(np.mean((student_val[0].reshape(-1) > 0.5) == (val["y_tom_dir"] == 1))),
+                "week": float(np.mean((student_val[1].reshape(-1) > 0.5) == (val["y_week_dir"] == 1))),
+            },
+        },
+        "throughput": {
+            "teacher": throughput(teacher.model, n_features),
+            "student": throughput(student, n_features),
+        },
+    }
+
+    metrics = build_metrics_manifest(
+        student_val, val["y_tom_dir"], val["y_week_dir"],
+        data_range=teacher.metrics.get("data_range"),
+        train_seconds=time.perf_counter() - t0,
+        n_train=len(train["X_seq"]),
+    )
+    metrics["distillation"] = {
+        "agreement": report["agreement"],
+        "throughput": {m: {str(b): v for b, v in tp.items()} for m, tp in report["throughput"].items()},
+    }
+    report["version"] = publish_bundle(
+        student,
+        scalers=teacher.scalers,
+        metrics=metrics,
+        metadata={
+            **{k: teacher.metadata[k] for k in ("trained_from", "trained_through", "validation_from")
+               if k in teacher.metadata},
+            "source": "distilled",
+            "teacher": teacher.version,
+            "student_kind": kind,
+        },
+        make_current=False,
+    )
+    return report
+
+
+def find_student(teacher_version: str) -> Optional[str]:
+    """Newest distilled bundle for `teacher_version`, or None."""
+    for version in reversed(list_versions()):
+        meta = read_metadata(version)
+        if meta.get("source") == "distilled" and meta.get("teacher") == teacher_version:
+            return version
+    return None
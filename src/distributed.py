@@ -0,0 +1,277 @@
+"""
+Opt-in data-parallel training across local worker processes
+(train.py --distributed N).
+
+The launcher builds the memory-mapped window dataset (src.window_dataset)
+once, then starts N worker processes with a TF_CONFIG cluster on localhost
+ports. Each worker is pinned to its own CPU slice, joins a
+tf.distribute.MultiWorkerMirroredStrategy (synchronous all-reduce of the
+gradients every step) and streams only its shard of the training windows
+from the shared memmap. Worker 0 is the chief: after fit it evaluates on the
+full validation period and publishes the bundle.
+
+The per-worker batch stays at BATCH_SIZE, so the global batch grows with the
+number of workers (weak scaling). Train/validation is a time split: windows
+labelled after the 1 - VALIDATION_SPLIT quantile of target dates are
+validation.
+
+Layout:
+    models/distributed/<run_id>/
+      dataset/            src.window_dataset layout (removed after the run)
+      worker-<i>.json     per-worker timings; the chief adds metrics + version
+"""
+
+import json
+import multiprocessing as mp
+import os
+import shutil
+import socket
+import time
+import uuid
+import datetime as dt
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from config import Config
+from src.cpu_affinity import available_cpus, cpu_slices, pin_to_cpus
+from src.model_builder import build_multi_task_model
+from src.model_metrics import build_metrics_manifest
+from src.model_registry import publish_bundle
+from src.retrainer import load_training_state, save_training_state
+from src.window_dataset import WindowDataset, build_window_dataset, load_frames
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _shard_dataset(data: WindowDataset, window_ids: np.ndarray, batch_size: int,
+                   shuffle: bool, seed: int):
+    """Endless tf.data pipeline of fixed-size batches gathered from the memmap."""
+    def batches():
+        rng = np.random.default_rng(seed)
+        while True:
+            order = rng.permutation(window_ids) if shuffle else window_ids
+            for i in range(0, len(order) - batch_size + 1, batch_size):
+                X, y = data.batch(order[i:i + batch_size])
+                yield X, tuple(y)
+
+    signature = (
+        tf.TensorSpec((batch_size, data.seq_len, len(data.features)), tf.float32),
+        tuple(tf.TensorSpec((batch_size,), tf.float32) for _ in range(4)),
+    )
+    return tf.data.Dataset.from_generator(batches, output_signature=signature).prefetch(2)
+
+
+class EpochTimer(tf.keras.callbacks.Callback):
+    """Wall time of the training part of each epoch (validation excluded)."""
+
+    def __init__(self):
+        super().__init__()
+        self.train_seconds: List[float] = []
+        self._t0 = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._t0 = time.perf_counter()
+
+    def on_test_begin(self, logs=None):
+        if self._t0 is not None:
+            self.train_seconds.append(time.perf_counter() - self._t0)
+            self._t0 = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        if self._t0 is not None:  # no validation this epoch
+            self.on_test_begin()
+
+
+def _worker_main(index: int, cluster: List[str], cpus: set, threads: int, dataset_dir: str,
+                 run_dir: str, hparams: Dict, epochs: int, publish: bool) -> None:
+    """One training process of the cluster."""
+    os.environ["TF_CONFIG"] = json.dumps({
+        "cluster": {"worker": cluster},
+        "task": {"type": "worker", "index": index},
+    })
+    pin_to_cpus(cpus, threads)  # before the strategy starts TF's runtime
+
+    n_workers = len(cluster)
+    chief = index == 0
+    data = WindowDataset(Path(dataset_dir))
+    train_ids, val_ids = data.fold(0)
+    batch_size = int(hparams.get("batch_size", Config.BATCH_SIZE))
+    val_batch = min(1024, max(1, len(val_ids) // n_workers))
+    steps = len(train_ids) // n_workers // batch_size
+    val_steps = len(val_ids) // n_workers // val_batch
+    if steps == 0:
+        raise ValueError(f"Too few training windows ({len(train_ids)}) for {n_workers} workers")
+
+    tf.keras.utils.set_random_seed(Config.RANDOM_STATE)
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    with strategy.scope():
+        model = build_multi_task_model((data.seq_len, len(data.features)), hparams=hparams, summary=False)
+
+    def input_fn(shuffle, ids, size, ctx):
+        shard = ids[ctx.input_pipeline_id::ctx.num_input_pipelines]
+        return _shard_dataset(data, shard, size, shuffle, seed=Config.RANDOM_STATE + ctx.input_pipeline_id)
+
+    train_ds = strategy.distribute_datasets_from_function(lambda ctx: input_fn(True, train_ids, batch_size, ctx))
+    val_ds = strategy.distribute_datasets_from_function(lambda ctx: input_fn(False, val_ids, val_batch, ctx))
+
+    timer = EpochTimer()
+    t0 = time.perf_counter()
+    history = model.fit(
+        train_ds,
+        validation_data=val_ds if val_steps else None,
+        epochs=epochs,
+        steps_per_epoch=steps,
+        validation_steps=val_steps or None,
+        callbacks=[
+            tf.keras.callbacks.EarlyStopping(
+                monitor='val_loss', patience=10, restore_best_weights=True, verbose=int(chief)),
+            tf.keras.callbacks.ReduceLROnPlateau(
+                monitor='val_loss', factor=0.5, patience=5, min_lr=1e-7, verbose=int(chief)),
+            timer,
+        ],
+        verbose=2 if chief else 0,
+    )
+    # Steady-state training throughput: skip the first epoch (tracing, pipeline warm-up)
+    steady = timer.train_seconds[1:] or timer.train_seconds
+    result = {
+        "worker": index,
+        "workers": n_workers,
+        "cpus": sorted(cpus),
+        "epochs": len(history.epoch),
+        "steps_per_epoch": steps,
+        "global_batch": batch_size * n_workers,
+        "epoch_train_seconds": timer.train_seconds,
+        "windows_per_sec": steps * batch_size * n_workers / float(np.median(steady)),
+        "fit_seconds": time.perf_counter() - t0,
+    }
+    if chief:
+        result.update(_finish_chief(model, data, val_ids, hparams, n_workers, publish))
+    Path(run_dir, f"worker-{index}.json").write_text(json.dumps(result, indent=2))
+    # Leave together: a worker that exits while others still heartbeat the
+    # coordination service (hosted by the chief) makes them log gRPC errors
+    _wait_for_workers(Path(run_dir), n_workers)
+
+
+def _wait_for_workers(run_dir: Path, n_workers: int, timeout: float = 600) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all((run_dir / f"worker-{i}.json").exists() for i in range(n_workers)):
+            return
+        time.sleep(0.2)
+
+
+def _finish_chief(model, data: WindowDataset, val_ids: np.ndarray, hparams: Dict,
+                  n_workers: int, publish: bool) -> Dict:
+    """Evaluate on the whole validation period and (optionally) publish. Chief only."""
+    # Plain copy outside the strategy: predict without collectives
+    plain = build_multi_task_model((data.seq_len, len(data.features)), hparams=hparams, summary=False)
+    plain.set_weights(model.get_weights())
+    X_val, y_val = data.batch(val_ids)
+    preds = plain.predict(X_val, batch_size=1024, verbose=0)
+    y_tom_dir, y_week_dir = y_val[0].astype(int), y_val[1].astype(int)
+    val_tom_acc = float(np.mean((preds[0].reshape(-1) > 0.5) == (y_tom_dir == 1)))
+    val_week_acc = float(np.mean((preds[1].reshape(-1) > 0.5) == (y_week_dir == 1)))
+    out = {"val_acc_tomorrow": val_tom_acc, "val_acc_week": val_week_acc}
+    if not publish:
+        return out
+
+    days = data.day.astype("datetime64[D]")
+    trained_from, trained_through = str(days.min()), str(days.max())
+    # One date cut for every symbol: fold 0 validates from the first cutoff
+    cut = str(np.datetime64(int(data.cutoffs[0]), "D"))
+    validation_from = {symbol: cut for symbol in data.symbols}
+    metrics = build_metrics_manifest(
+        preds, y_tom_dir, y_week_dir,
+        symbols=np.asarray(data.symbols)[data.symbol[val_ids]],
+        data_range={"from": trained_from, "through": trained_through},
+        n_train=int(len(data.fold(0)[0])),
+        validation_from=validation_from,
+    )
+    version = publish_bundle(
+        plain,
+        scalers=data.scalers(),
+        metrics=metrics,
+        metadata={
+            "source": "distributed",
+            "workers": n_workers,
+            "trained_from": trained_from,
+            "trained_through": trained_through,
+            "validation_from": validation_from,
+            "hparams": hparams,
+        },
+    )
+    state = load_training_state() or {}
+    state.update({
+        "trained_through": trained_through,
+        "version": version,
+        "val_acc_tomorrow": val_tom_acc,
+        "val_acc_week": val_week_acc,
+    })
+    save_training_state(state)
+    out["version"] = version
+    return out
+
+
+def train_distributed(
+    n_workers: int,
+    hparams: Optional[Dict] = None,
+    epochs: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+    publish: bool = True,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """
+    Launch `n_workers` local MultiWorkerMirroredStrategy workers and wait for
+    them. Returns the chief's result (throughput, accuracies, version).
+    """
+    hparams = hparams or {}
+    epochs = epochs or Config.EPOCHS
+    threads_per_worker = threads_per_worker or max(1, len(available_cpus()) // n_workers)
+
+    run_dir = Config.DISTRIBUTED_DIR / f"{dt.datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    run_dir.mkdir(parents=True)
+    frames = frames if frames is not None else load_frames(Config.SUPPORTED_STOCKS)
+    dataset_dir = build_window_dataset(frames, run_dir / "dataset", n_folds=1,
+                                       min_train_fraction=1 - Config.VALIDATION_SPLIT)
+
+    cluster = [f"localhost:{_free_port()}" for _ in range(n_workers)]
+    slices = cpu_slices(n_workers, threads_per_worker)
+    print(f"🚀 {n_workers} workers × {threads_per_worker} threads on {', '.join(cluster)}")
+
+    # spawn, not fork: each worker starts its own TensorFlow runtime
+    ctx = mp.get_context("spawn")
+    procs = [
+        ctx.Process(
+            target=_worker_main,
+            args=(i, cluster, slices[i], threads_per_worker, str(dataset_dir), str(run_dir),
+                  hparams, epochs, publish),
+            name=f"train-worker-{i}",
+        )
+        for i in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join(timeout)
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+    failed = [p.name for p in procs if p.exitcode != 0]
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    if failed:
+        raise RuntimeError(f"❌ Worker(s) failed: {', '.join(failed)} (see output above)")
+
+    result = json.loads((run_dir / "worker-0.json").read_text())
+    result["run_dir"] = str(run_dir)
+    return result
@@ -0,0 +1,75 @@
+"""
+Downsampling for charts: cap the points sent to the browser while keeping
+what the eye looks for.
+
+- downsample_ohlc: contiguous buckets of rows -> one candle each
+  (first Open, max High, min Low, last Close, summed Volume), so every
+  high/low extreme of the full series is still drawn.
+- lttb_indices: Largest-Triangle-Three-Buckets selection for line/bar
+  series (keeps spikes and turning points, unlike every-k-th sampling).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _bucket_starts(n: int, max_points: int) -> np.ndarray:
+    size = int(np.ceil(n / max_points))
+    return np.arange(0, n, size)
+
+
+def downsample_ohlc(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Aggregate consecutive rows into at most `max_points` candles (index = bucket start)."""
+    n = len(df)
+    if n <= max_points:
+        return df
+    starts = _bucket_starts(n, max_points)
+    ends = np.append(starts[1:], n) - 1
+
+    out = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }
+    if "Volume" in df:
+        out["Volume"] = np.add.reduceat(df["Volume"].to_numpy(dtype="float64"), starts)
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Row indices of the Largest-Triangle-Three-Buckets sample of (x, y).
+    Always keeps the first and last point; returns all indices if n <= n_out.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # n_out - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+        # Twice the triangle area (a, candidate, next-bucket average)
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def lttb(series: pd.Series, n_out: int) -> pd.Series:
+    """LTTB-downsampled copy of a datetime-indexed series."""
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+    return series.iloc[lttb_indices(x, series.to_numpy(), n_out)]
@@ -0,0 +1,240 @@
+"""
+Async EODHD client for universe-wide refreshes.
+
+- Token bucket keeps requests under EODHD's per-minute limit: with capacity
+  B and refill (limit - B) per window, no rolling window ever sees more than
+  `limit` requests, so bursts never trip HTTP 429.
+- Daily quota is persisted (Config.EODHD_QUOTA_PATH, reset at 00:00 UTC) and
+  checked before each request; exhausting it raises QuotaExceededError
+  instead of sending a request the API would reject.
+- Concurrent callers asking for the same (endpoint, symbol, params) share
+  one in-flight request.
+- Responses are requested gzip-compressed (decoded transparently by aiohttp).
+
+    async with EODHDClient(api_key) as client:
+        rows = await client.get_eod("AAPL.US", start="2010-01-01", end="2025-12-31")
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import datetime as dt
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from config import Config
+from src.instrumentation import increment, record
+
+
+class QuotaExceededError(RuntimeError):
+    """Daily EODHD request quota is used up."""
+
+
+class TokenBucket:
+    """Async token bucket: at most `limit` acquisitions in any `window` seconds."""
+
+    def __init__(self, limit: int, window: float = 60.0, burst: int = 10):
+        self.capacity = max(1, min(burst, limit))
+        self.rate = max(limit - self.capacity, 1) / window  # tokens per second
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:  # FIFO: waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                increment("eodhd_rate_limited_waits")
+                await asyncio.sleep(wait)
+
+
+class DailyQuota:
+    """
+    Persisted request counter for the current UTC day. The file is re-read on
+    every reservation so separate processes sharing it stay roughly in sync.
+    """
+
+    def __init__(self, path: Path = None, limit: int = None):
+        self.path = Path(path or Config.EODHD_QUOTA_PATH)
+        self.limit = limit or Config.EODHD_DAILY_LIMIT
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%d")
+
+    def _read(self) -> Dict:
+        today = self._today()
+        try:
+            state = json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            state = {}
+        if state.get("date") != today:
+            state = {"date": today, "used": 0}
+        return state
+
+    def used(self) -> int:
+        return self._read()["used"]
+
+    def remaining(self) -> int:
+        return max(self.limit - self.used(), 0)
+
+    def reserve(self, calls: int = 1) -> None:
+        with self._lock:
+            state = self._read()
+            if state["used"] + calls > self.limit:
+                raise QuotaExceededError(
+                    f"EODHD daily quota used up ({state['used']}/{self.limit} on {state['date']} UTC)"
+                )
+            state["used"] += calls
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.path)
+
+
+class EODHDClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://eodhd.com/api",
+        requests_per_minute: int = None,
+        window_seconds: float = 60.0,
+        quota: Optional[DailyQuota] = None,
+        max_concurrency: int = None,
+        max_retries: int = None,
+        timeout: float = 30,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.bucket = TokenBucket(requests_per_minute or Config.EODHD_REQUESTS_PER_MINUTE,
+                                  window=window_seconds, burst=Config.EODHD_BURST)
+        self.quota = quota or DailyQuota()
+        self.max_retries = Config.EODHD_MAX_RETRIES if max_retries is None else max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency or Config.EODHD_MAX_CONCURRENCY)
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "EODHDClient":
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            headers={"Accept-Encoding": "gzip"},
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+
+    async def get_json(self, endpoint: str, symbol: str, **params):
+        """GET {base_url}/{endpoint}/{symbol}; identical concurrent calls share one request."""
+        key = (endpoint, symbol, tuple(sorted(params.items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(endpoint, symbol, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            increment("eodhd_deduplicated")
+        return await asyncio.shield(task)
+
+    async def get_eod(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        params = {"fmt": "json"}
+        if start:
+            params["from"] = start
+        if end:
+            params["to"] = end
+        return await self.get_json("eod", symbol, **params)
+
+    async def get_intraday(self, symbol: str, interval: str, start: Optional[int] = None,
+                           end: Optional[int] = None) -> List[Dict]:
+        """Intraday bars ("1m", "5m", "1h"); start/end are UNIX seconds (UTC)."""
+        params = {"fmt": "json", "interval": interval}
+        if start is not None:
+            params["from"] = int(start)
+        if end is not None:
+            params["to"] = int(end)
+        return await self.get_json("intraday", symbol, **params)
+
+    async def _request(self, endpoint: str, symbol: str, params: Dict):
+        url = f"{self.base_url}/{endpoint}/{symbol}"
+        query = {**params, "api_token": self.api_key}
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                self.quota.reserve()
+                increment("eodhd_requests")
+                t0 = time.perf_counter()
+                async with self._session.get(url, params=query) as resp:
+                    body = await resp.read()
+                    record("eodhd_request", time.perf_counter() - t0)
+                    if resp.status == 200:
+                        return json.loads(body)
+                    retryable = resp.status == 429 or resp.status >= 500
+                    if not retryable or attempt == self.max_retries:
+                        raise RuntimeError(
+                            f"EODHD request failed for {symbol} "
+                            f"with HTTP {resp.status}: {body[:200].decode(errors='replace')}"
+                        )
+                    increment("eodhd_retries")
+                    delay = _retry_after(resp.headers.get("Retry-After"), default=2 ** attempt)
+                await asyncio.sleep(delay)
+
+
+def _retry_after(value: Optional[str], default: float) -> float:
+    """Seconds to wait from a Retry-After header: delay-seconds or an HTTP date (RFC 9110)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=dt.timezone.utc)
+    return max(0.0, (when - dt.datetime.now(dt.timezone.utc)).total_seconds())
+
+
+# Every sync entry point runs its coroutine on this one loop thread, so a
+# process-wide client (aiohttp session, token bucket, in-flight map) can be
+# shared by all of them; asyncio primitives are bound to a single loop.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def client_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide EODHD event loop (started on first use, daemon thread)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="eodhd-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the EODHD loop from sync code (any thread, even one with a running loop)."""
+    loop = client_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called on the EODHD loop: await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -1,55 +1,117 @@
-from typing import Tuple
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
 from config import Config
+from src.cross_sectional import cross_sectional_columns
+from src.instrumentation import instrumented
+from src.indicator_kernels import INDICATOR_COLUMNS, KERNELS
 
 
-def create_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def _with_columns(df: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    df's columns plus `columns`. The new columns go into their own blocks of a
+    shallow copy, so df's existing blocks (the OHLCV prices) are shared, not
+    re-materialized; constructing one frame from all columns, or pd.concat,
+    would consolidate them into a fresh copy at every stage.
+    """
+    out = df.copy(deep=False)
+    for name, values in columns.items():
+        out[name] = values
+    return out
+
+
+def _drop_incomplete_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """dropna() that slices (no copy) when the NaNs are only leading/trailing warm-up rows."""
+    valid = df.notna().to_numpy().all(axis=1)
+    if valid.all():
+        return df
+    if not valid.any():
+        return df.iloc[0:0]
+    first = int(valid.argmax())
+    last = len(valid) - int(valid[::-1].argmax())
+    if valid[first:last].all():
+        return df.iloc[first:last]
+    return df[valid]
+
+
+@instrumented("create_technical_indicators", track_memory=True)
+def create_technical_indicators(df: pd.DataFrame, backend: Optional[str] = None,
+                                symbol: Optional[str] = None) -> pd.DataFrame:
     """
     Create standard technical indicators on OHLCV data.
     Assumes columns: Open, High, Low, Close, Adj Close, Volume
+    backend: "pandas" (default), or an array kernel from
+    src.indicator_kernels ("numpy", "numba"); see Config.INDICATOR_BACKEND.
+    Indicator columns use the dtype of df["Close"] (float32 from load_stock_data).
+    With Config.CROSS_SECTIONAL_FEATURES, passing the daily frame's `symbol`
+    also joins its market-relative columns (src.cross_sectional).
     """
-    df = df.copy()
+    backend = backend or Config.INDICATOR_BACKEND
+    if backend != "pandas":
+        return _indicators_from_kernel(df, backend, symbol)
+
+    close = df["Close"]
+    volume = df["Volume"]
+    cols = {}
 
     # Daily returns
-    df["ret_1d"] = df["Close"].pct_change()
+    cols["ret_1d"] = close.pct_change()
 
     # Moving averages
-    df["sma_10"] = df["Close"].rolling(10).mean()
-    df["sma_20"] = df["Close"].rolling(20).mean()
-    df["sma_50"] = df["Close"].rolling(50).mean()
+    cols["sma_10"] = close.rolling(10).mean()
+    cols["sma_20"] = close.rolling(20).mean()
+    cols["sma_50"] = close.rolling(50).mean()
 
     # Exponential moving averages
-    df["ema_12"] = df["Close"].ewm(span=12, adjust=False).mean()
-    df["ema_26"] = df["Close"].ewm(span=26, adjust=False).mean()
+    cols["ema_12"] = close.ewm(span=12, adjust=False).mean()
+    cols["ema_26"] = close.ewm(span=26, adjust=False).mean()
 
     # MACD
-    df["macd"] = df["ema_12"] - df["ema_26"]
-    df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
+    cols["macd"] = cols["ema_12"] - cols["ema_26"]
+    cols["macd_signal"] = cols["macd"].ewm(span=9, adjust=False).mean()
 
     # RSI(14)
-    delta = df["Close"].diff()
+    delta = close.diff()
     gain = delta.clip(lower=0.0)
     loss = -delta.clip(upper=0.0)
     avg_gain = gain.rolling(14).mean()
     avg_loss = loss.rolling(14).mean()
     rs = avg_gain / (avg_loss + 1e-9)
-    df["rsi_14"] = 100.0 - (100.0 / (1.0 + rs))
+    cols["rsi_14"] = 100.0 - (100.0 / (1.0 + rs))
 
     # Volatility (rolling std of returns)
-    df["volatility_20"] = df["ret_1d"].rolling(20).std()
+    cols["volatility_20"] = cols["ret_1d"].rolling(20).std()
 
     # Volume features
-    df["vol_sma_20"] = df["Volume"].rolling(20).mean()
-    df["vol_ratio"] = df["Volume"] / (df["vol_sma_20"] + 1e-9)
+    cols["vol_sma_20"] = volume.rolling(20).mean()
+    cols["vol_ratio"] = volume / (cols["vol_sma_20"] + 1e-9)
+
+    dtype = close.dtype
+    cols = {k: v.to_numpy(dtype=dtype) for k, v in cols.items()}
+    if symbol is not None and Config.CROSS_SECTIONAL_FEATURES:
+        cols.update(cross_sectional_columns(symbol, df.index, dtype))
+    return _drop_incomplete_rows(_with_columns(df, cols))
+
+
+def _indicators_from_kernel(df: pd.DataFrame, backend: str, symbol: Optional[str] = None) -> pd.DataFrame:
+    """Same columns as the pandas path, computed in one kernel call (float32)."""
+    if backend not in KERNELS:
+        raise ValueError(f"Unknown indicator backend '{backend}'. Use: pandas, {', '.join(KERNELS)}")
+    values = KERNELS[backend](df["Close"].to_numpy(), df["Volume"].to_numpy())
+    cols = {c: values[:, j] for j, c in enumerate(INDICATOR_COLUMNS)}
+    if symbol is not None and Config.CROSS_SECTIONAL_FEATURES:
+        cols.update(cross_sectional_columns(symbol, df.index, values.dtype))
+    return _drop_incomplete_rows(_with_columns(df, cols))
 
-    df = df.dropna()
-    return df
 
+# Bars ahead for the "week" targets (the longest look-ahead in create_targets)
+WEEK_HORIZON = 7
 
+
+@instrumented("create_targets", track_memory=True)
 def create_targets(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create binary direction targets and continuous log-return targets.
@@ -57,50 +119,63 @@ def create_targets(df: pd.DataFrame) -> pd.DataFrame:
     - target_week_dir: 1 if Close[t+7] > Close[t] else 0
     - target_tomorrow_ret: log(C[t+1] / C[t])
     - target_week_ret: log(C[t+7] / C[t])
+    Offsets are rows: daily frames from load_stock_data have one row per
+    session (gaps filled by src.trading_calendar.conform).
     """
-    df = df.copy()
     close = df["Close"]
 
-    df["target_tomorrow_dir"] = (close.shift(-1) > close).astype(int)
-    df["target_week_dir"] = (close.shift(-7) > close).astype(int)
+    out = _with_columns(df, {
+        "target_tomorrow_dir": (close.shift(-1) > close).to_numpy(dtype="int32"),
+        "target_week_dir": (close.shift(-WEEK_HORIZON) > close).to_numpy(dtype="int32"),
+        "target_tomorrow_ret": np.log(close.shift(-1) / close).to_numpy(),
+        "target_week_ret": np.log(close.shift(-WEEK_HORIZON) / close).to_numpy(),
+    })
+    return _drop_incomplete_rows(out)
+
+
+TARGET_COLUMNS = [
+    "target_tomorrow_dir",
+    "target_week_dir",
+    "target_tomorrow_ret",
+    "target_week_ret",
+]
 
-    df["target_tomorrow_ret"] = np.log(close.shift(-1) / close)
-    df["target_week_ret"] = np.log(close.shift(-7) / close)
 
-    df = df.dropna()
-    return df
+def feature_columns(df: pd.DataFrame) -> list:
+    """Model input columns: everything that is not a target."""
+    return [c for c in df.columns if c not in TARGET_COLUMNS]
 
 
+@instrumented("build_feature_matrix", track_memory=True)
 def build_feature_matrix(
     df: pd.DataFrame,
+    scaler: Optional[StandardScaler] = None,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler]:
     """
     Build scaled feature matrix and target arrays.
+    Pass a fitted `scaler` (e.g. from the model bundle) to reuse training-time
+    scaling; otherwise a new StandardScaler is fitted on df.
     Returns:
         X_scaled, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, scaler
     """
-    df = df.copy()
-
-    target_cols = [
-        "target_tomorrow_dir",
-        "target_week_dir",
-        "target_tomorrow_ret",
-        "target_week_ret",
-    ]
-    feature_cols = [c for c in df.columns if c not in target_cols]
-
-    X_raw = df[feature_cols].values.astype("float32")
-    y_tom_dir = df["target_tomorrow_dir"].values.astype("int32")
-    y_week_dir = df["target_week_dir"].values.astype("int32")
-    y_tom_ret = df["target_tomorrow_ret"].values.astype("float32")
-    y_week_ret = df["target_week_ret"].values.astype("float32")
+    feature_cols = feature_columns(df)
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X_raw)
+    X_raw = df[feature_cols].to_numpy(dtype="float32")
+    y_tom_dir = df["target_tomorrow_dir"].to_numpy(dtype="int32")
+    y_week_dir = df["target_week_dir"].to_numpy(dtype="int32")
+    y_tom_ret = df["target_tomorrow_ret"].to_numpy(dtype="float32")
+    y_week_ret = df["target_week_ret"].to_numpy(dtype="float32")
+
+    if scaler is None:
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X_raw)
+    else:
+        X_scaled = scaler.transform(X_raw)
 
     return X_scaled, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, scaler
 
 
+@instrumented("make_sequences", track_memory=True)
 def make_sequences(X: np.ndarray, y1: np.ndarray, y2: np.ndarray, y3: np.ndarray, y4: np.ndarray, 
                   seq_len: int = 60) -> tuple:
     """Create sequences for LSTM input."""
@@ -141,3 +216,69 @@ def make_sequences(X: np.ndarray, y1: np.ndarray, y2: np.ndarray, y3: np.ndarray
         np.asarray(seq_tom_ret, dtype="float32"),
         np.asarray(seq_week_ret, dtype="float32"),
     )
+
+
+def iter_feature_chunks(
+    chunks: Iterable[pd.DataFrame],
+    warmup: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    create_technical_indicators + create_targets over a stream of OHLCV
+    chunks (e.g. src.intraday_store.iter_bars), without concatenating them.
+    Each step computes on the last `warmup` already-emitted rows plus the
+    new rows, and holds back the final WEEK_HORIZON rows until the next
+    chunk supplies their targets. Rolling windows come out exactly as on
+    the full frame; EWM terms older than `warmup` bars (default
+    Config.INTRADAY_WARMUP_BARS) are below float32 resolution.
+    """
+    warmup = warmup or Config.INTRADAY_WARMUP_BARS
+    carry = None    # raw rows already emitted (indicator warm-up)
+    pending = None  # raw rows waiting for look-ahead
+    for chunk in chunks:
+        pending = chunk if pending is None else pd.concat([pending, chunk])
+        if len(pending) <= WEEK_HORIZON:
+            continue
+        ready = pending.iloc[:-WEEK_HORIZON]
+        frame = pending if carry is None else pd.concat([carry, pending])
+        out = create_targets(create_technical_indicators(frame, backend))
+        out = out.loc[ready.index[0]:ready.index[-1]]
+        if len(out):
+            yield out
+        carry = ready if carry is None else pd.concat([carry, ready])
+        carry = carry.iloc[-warmup:]
+        pending = pending.iloc[-WEEK_HORIZON:]
+    # The last WEEK_HORIZON rows never get targets, as with create_targets
+
+
+def fit_scaler_streaming(feature_chunks: Iterable[pd.DataFrame]) -> StandardScaler:
+    """StandardScaler fitted chunk by chunk (partial_fit); same statistics as one fit."""
+    scaler = StandardScaler()
+    for df in feature_chunks:
+        scaler.partial_fit(df[feature_columns(df)].to_numpy(dtype="float32"))
+    return scaler
+
+
+def iter_sequences(
+    feature_chunks: Iterable[pd.DataFrame],
+    scaler: StandardScaler,
+    seq_len: Optional[int] = None,
+) -> Iterator[tuple]:
+    """
+    make_sequences over a stream of feature frames: yields
+    (X_seq, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret) per chunk, carrying
+    the last seq_len rows across chunk boundaries, so the windows are the
+    ones make_sequences would build on the concatenated frame.
+    """
+    seq_len = seq_len or Config.SEQUENCE_LENGTH
+    tail = None
+    for df in feature_chunks:
+        X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, _ = build_feature_matrix(df, scaler=scaler)
+        arrays = (X.astype("float32", copy=False), y_tom_dir, y_week_dir, y_tom_ret, y_week_ret)
+        if tail is not None:
+            arrays = tuple(np.concatenate([t, a]) for t, a in zip(tail, arrays))
+        n = len(arrays[0]) - seq_len
+        if n > 0:
+            windows = np.lib.stride_tricks.sliding_window_view(arrays[0], seq_len, axis=0)[:n]
+            yield (np.ascontiguousarray(windows.transpose(0, 2, 1)),) + tuple(y[seq_len:] for y in arrays[1:])
+        tail = tuple(a[-seq_len:] for a in arrays)
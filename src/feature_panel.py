@@ -0,0 +1,226 @@
+"""
+Process-shared, read-only feature panel for multi-worker serving.
+
+One loader process (`python build_panel.py`) computes the unscaled model
+features for every symbol and writes them as a single float32 array
+(symbols × days × features). Every Streamlit session / API worker maps it
+with np.load(mmap_mode="r"), so the pages live once in the OS page cache
+instead of once per process.
+
+Layout:
+    data/processed/panel/
+      CURRENT                    # text file holding the live version id
+      <version>/features.npy     # float32, NaN where a symbol has no row that day
+      <version>/index.json       # symbols, dates, features, built_at, sources, config
+
+`sources` holds the mtime of every daily CSV the panel was computed from and
+`config` the feature settings (indicator backend, cross-sectional features).
+A symbol whose CSV (or, with cross-sectional features, any universe CSV)
+changed since, or a panel built under other settings, is stale: readers
+check `is_fresh()` and compute that symbol from the CSV cache instead until
+the panel is rebuilt.
+
+Versions are written to a hidden temp directory and renamed into place, then
+CURRENT is swapped with os.replace (same scheme as src.model_registry).
+Workers that still map an older version keep reading it until they reopen.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import datetime as dt
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.data_loader import load_stock_data, prefetch_stock_data
+from src.feature_engineer import create_technical_indicators, create_targets, feature_columns
+from src.instrumentation import instrumented, increment
+
+VALUES_FILE = "features.npy"
+INDEX_FILE = "index.json"
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+
+# Freshness is re-checked (a stat per CSV) at most this often per symbol
+_RECHECK_SECONDS = 5.0
+
+
+def _panel_dir() -> Path:
+    return Config.FEATURE_PANEL_DIR
+
+
+def _universe() -> List[str]:
+    return [s.upper() for s in (Config.CROSS_SECTIONAL_UNIVERSE or Config.SUPPORTED_STOCKS)]
+
+
+def _mtime(symbol: str) -> Optional[int]:
+    path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def feature_config() -> Dict:
+    """Settings that change the computed features; a panel built under others is stale."""
+    cross = bool(Config.CROSS_SECTIONAL_FEATURES)
+    return {
+        "indicator_backend": Config.INDICATOR_BACKEND,
+        "cross_sectional": cross,
+        "cross_sectional_universe": _universe() if cross else None,
+        "cross_sectional_rs_window": Config.CROSS_SECTIONAL_RS_WINDOW if cross else None,
+    }
+
+
+def current_version() -> Optional[str]:
+    pointer = _panel_dir() / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    version = pointer.read_text().strip()
+    return version or None
+
+
+class FeaturePanel:
+    """Read-only view over a published panel version."""
+
+    def __init__(self, version: str):
+        path = _panel_dir() / version
+        index = json.loads((path / INDEX_FILE).read_text())
+        self.version = version
+        self.values: np.ndarray = np.load(path / VALUES_FILE, mmap_mode="r")
+        self.symbols: List[str] = index["symbols"]
+        self.dates = pd.DatetimeIndex(index["dates"], name="Date")
+        self.features: List[str] = index["features"]
+        self.built_at: str = index["built_at"]
+        # Panels built before staleness tracking have neither: always stale
+        self.sources: Dict[str, Optional[int]] = index.get("sources", {})
+        self.config: Optional[Dict] = index.get("config")
+        self._rows: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self._checked: Dict[str, Tuple[float, bool]] = {}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def is_fresh(self, symbol: str) -> bool:
+        """True if the symbol's rows match its daily CSV(s) and the current feature settings."""
+        now = time.monotonic()
+        checked = self._checked.get(symbol)
+        if checked is not None and now - checked[0] < _RECHECK_SECONDS:
+            return checked[1]
+        fresh = self.config == feature_config()
+        if fresh:
+            depends = [symbol] + (self.config["cross_sectional_universe"] or [])
+            fresh = all(s in self.sources and self.sources[s] == _mtime(s) for s in depends)
+        self._checked[symbol] = (now, fresh)
+        return fresh
+
+    def symbol_rows(self, symbol: str, tail: Optional[int] = None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        (dates, X_raw) for the days the symbol has data, oldest first.
+        `tail` limits the result to the last `tail` rows.
+        """
+        row = self.values[self._rows[symbol]]
+        days = np.flatnonzero(~np.isnan(row[:, 0]))
+        if tail is not None:
+            days = days[-tail:]
+        return self.dates[days], np.asarray(row[days])
+
+    def column(self, name: str) -> int:
+        return self.features.index(name)
+
+
+@instrumented("build_feature_panel")
+def build_panel(symbols: Sequence[str] = None, refresh_data: bool = False) -> str:
+    """Compute features for all symbols, publish a new panel version. Returns the version id."""
+    symbols = [s.upper() for s in (symbols or Config.SUPPORTED_STOCKS)]
+
+    frames = {}
+    features = None
+    prefetch_stock_data(symbols, refresh=refresh_data)
+    config = feature_config()
+    # Stamped before reading, so a CSV rewritten during the build shows up as stale
+    sources = {s: _mtime(s) for s in dict.fromkeys(symbols + (config["cross_sectional_universe"] or []))}
+    for symbol in symbols:
+        df = load_stock_data(symbol)
+        df = create_technical_indicators(df, symbol=symbol)
+        df = create_targets(df)
+        cols = feature_columns(df)
+        if features is None:
+            features = cols
+        elif cols != features:
+            raise ValueError(f"{symbol}: feature columns differ from {symbols[0]}")
+        frames[symbol] = df[features]
+        print(f"  {symbol}: {len(df):,} rows")
+
+    dates = frames[symbols[0]].index
+    for df in frames.values():
+        dates = dates.union(df.index)
+
+    reg = _panel_dir()
+    reg.mkdir(parents=True, exist_ok=True)
+    version = f"{dt.datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    tmp = reg / f".tmp-{version}"
+    tmp.mkdir()
+
+    values = np.lib.format.open_memmap(
+        tmp / VALUES_FILE, mode="w+", dtype=np.float32,
+        shape=(len(symbols), len(dates), len(features)),
+    )
+    values[:] = np.nan
+    for i, symbol in enumerate(symbols):
+        df = frames[symbol]
+        values[i, dates.get_indexer(df.index)] = df.to_numpy(dtype=np.float32)
+    values.flush()
+    del values
+
+    (tmp / INDEX_FILE).write_text(json.dumps({
+        "symbols": symbols,
+        "dates": [d.strftime("%Y-%m-%d") for d in dates],
+        "features": features,
+        "built_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "sources": sources,
+        "config": config,
+    }))
+    os.rename(tmp, reg / version)
+
+    pointer = reg / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    pointer.write_text(version)
+    os.replace(pointer, reg / CURRENT_FILE)
+
+    _prune_old_versions(keep=KEEP_VERSIONS)
+    return version
+
+
+def _prune_old_versions(keep: int) -> None:
+    """Delete all but the newest `keep` versions (mapped files stay readable on POSIX)."""
+    reg = _panel_dir()
+    versions = sorted(p for p in reg.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for path in versions[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+_panel: Optional[FeaturePanel] = None
+_panel_lock = threading.Lock()
+
+
+def get_panel() -> Optional[FeaturePanel]:
+    """
+    The process-wide panel following CURRENT, or None if none is published.
+    Reopens (a cheap re-map) when CURRENT changes.
+    """
+    global _panel
+    version = current_version()
+    if version is None:
+        return None
+    panel = _panel
+    if panel is None or panel.version != version:
+        with _panel_lock:
+            if _panel is None or _panel.version != version:
+                _panel = FeaturePanel(version)
+                increment("panel_opens")
+            panel = _panel
+    return panel
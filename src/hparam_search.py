@@ -0,0 +1,241 @@
+"""
+Parallel time-series cross-validation and hyperparameter search.
+
+The dataset is built once and written as a memory-mapped window dataset
+(src.window_dataset) that every worker process maps read-only.
+
+Folds are expanding windows on the target date. Fold k trains on every
+window labelled at least SEARCH_EMBARGO_SESSIONS trading sessions before
+cutoff k (so 7-session week targets do not reach the validation period) and
+validates on [cutoff k, cutoff k+1).
+
+Trials run in a process pool. Each worker is pinned to its own slice of
+CPUs (os.sched_setaffinity) and TensorFlow is limited to that many threads.
+After each fold a trial's mean validation loss is compared with the other
+trials at the same fold, and it is pruned if it is worse than the
+SEARCH_PRUNE_QUANTILE of them.
+
+Layout:
+    models/search/<run_id>/
+      dataset/                src.window_dataset layout
+      progress.jsonl          one line per finished fold (read by the pruner)
+      leaderboard.csv
+      best.json
+"""
+
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+import uuid
+import datetime as dt
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from config import Config
+from src.cpu_affinity import cpu_slices, default_workers, pin_to_cpus
+from src.model_builder import HPARAM_DEFAULTS, build_multi_task_model
+from src.window_dataset import WindowBatches, WindowDataset, build_window_dataset, load_frames
+
+PROGRESS_FILE = "progress.jsonl"
+
+
+def _search_dir() -> Path:
+    return Config.SEARCH_DIR
+
+
+# ----------------------------------------------------------------------------
+# Trials
+# ----------------------------------------------------------------------------
+
+def sample_trials(space: Dict[str, list], n_trials: Optional[int] = None,
+                  grid: bool = False, seed: int = Config.RANDOM_STATE) -> List[Dict]:
+    """Full grid (optionally truncated to n_trials) or n_trials distinct random draws."""
+    keys = list(space)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    rng = random.Random(seed)
+    if grid:
+        return combos[:n_trials] if n_trials else combos
+    rng.shuffle(combos)
+    return combos[:n_trials or 20]
+
+
+def _record_fold(run_dir: Path, record: Dict) -> None:
+    # One short O_APPEND write per line, so concurrent workers do not interleave
+    line = (json.dumps(record) + "\n").encode()
+    fd = os.open(run_dir / PROGRESS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def read_progress(run_dir: Path) -> pd.DataFrame:
+    path = Path(run_dir) / PROGRESS_FILE
+    if not path.exists():
+        return pd.DataFrame(columns=["trial", "fold", "val_loss"])
+    return pd.read_json(path, lines=True)
+
+
+def should_prune(run_dir: Path, trial: int, fold: int, mean_loss: float,
+                 quantile: Optional[float] = None, min_trials: Optional[int] = None) -> bool:
+    """True if `mean_loss` over folds 0..fold is worse than `quantile` of the other trials."""
+    quantile = Config.SEARCH_PRUNE_QUANTILE if quantile is None else quantile
+    min_trials = min_trials or Config.SEARCH_PRUNE_MIN_TRIALS
+    progress = read_progress(run_dir)
+    others = progress[(progress["trial"] != trial) & (progress["fold"] <= fold)]
+    counts = others.groupby("trial")["fold"].count()
+    reached = counts[counts == fold + 1].index  # trials that finished this fold too
+    if len(reached) < min_trials:
+        return False
+    others_mean = others[others["trial"].isin(reached)].groupby("trial")["val_loss"].mean()
+    return mean_loss > float(np.quantile(others_mean, quantile))
+
+
+_WORKER_CPUS: List[int] = []
+
+
+def _init_worker(cpu_slots, threads: int) -> None:
+    """Pin this worker to its CPU slice and size TensorFlow's thread pools to it."""
+    global _WORKER_CPUS
+    cpus = cpu_slots.get()
+    pin_to_cpus(cpus, threads)
+    _WORKER_CPUS = sorted(cpus)
+
+
+def run_trial(trial: int, hparams: Dict, dataset_dir: str, run_dir: str,
+              epochs: int, patience: int, prune: bool = True) -> Dict:
+    """Cross-validate one hyperparameter set. Runs inside a worker process."""
+    t0 = time.perf_counter()
+    run_dir = Path(run_dir)
+    data = WindowDataset(Path(dataset_dir))
+    hp = {**HPARAM_DEFAULTS, **hparams}
+    losses, acc_tom, acc_week = [], [], []
+    status = "complete"
+
+    for k in range(data.n_folds):
+        train_ids, val_ids = data.fold(k)
+        if len(train_ids) == 0 or len(val_ids) == 0:
+            continue
+        tf.keras.backend.clear_session()
+        tf.keras.utils.set_random_seed(Config.RANDOM_STATE + trial)
+        model = build_multi_task_model((data.seq_len, len(data.features)), hparams=hp, summary=False)
+        val = WindowBatches(data, val_ids, batch_size=1024)
+        history = model.fit(
+            WindowBatches(data, train_ids, int(hp["batch_size"]), shuffle=True, seed=trial),
+            validation_data=val,
+            epochs=epochs,
+            callbacks=[tf.keras.callbacks.EarlyStopping(
+                monitor="val_loss", patience=patience, restore_best_weights=True)],
+            verbose=0,
+        )
+        scores = model.evaluate(val, verbose=0, return_dict=True)
+        losses.append(scores["loss"])
+        acc_tom.append(scores["tomorrow_output_accuracy"])
+        acc_week.append(scores["week_output_accuracy"])
+        _record_fold(run_dir, {
+            "trial": trial, "fold": k, "val_loss": scores["loss"],
+            "acc_tom": acc_tom[-1], "acc_week": acc_week[-1], "epochs": len(history.epoch),
+        })
+        if prune and k < data.n_folds - 1 and should_prune(run_dir, trial, k, float(np.mean(losses))):
+            status = "pruned"
+            break
+
+    return {
+        "trial": trial,
+        "status": status,
+        "folds": len(losses),
+        "val_loss": float(np.mean(losses)) if losses else float("nan"),
+        "acc_tom": float(np.mean(acc_tom)) if acc_tom else float("nan"),
+        "acc_week": float(np.mean(acc_week)) if acc_week else float("nan"),
+        "seconds": time.perf_counter() - t0,
+        "cpus": ",".join(map(str, _WORKER_CPUS)),
+        **hparams,
+    }
+
+
+def _leaderboard(results: List[Dict]) -> pd.DataFrame:
+    board = pd.DataFrame(results)
+    # Complete trials first, then by mean validation loss across folds
+    board["_pruned"] = board["status"] != "complete"
+    board = board.sort_values(["_pruned", "val_loss"]).drop(columns="_pruned")
+    return board.reset_index(drop=True)
+
+
+def run_search(
+    symbols: Sequence[str] = Config.SUPPORTED_STOCKS,
+    n_trials: Optional[int] = None,
+    grid: bool = False,
+    space: Optional[Dict[str, list]] = None,
+    n_folds: Optional[int] = None,
+    workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    epochs: Optional[int] = None,
+    patience: Optional[int] = None,
+    prune: bool = True,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+) -> tuple:
+    """Build the shared dataset, run all trials in parallel, write the leaderboard. Returns (leaderboard, run_dir)."""
+    threads_per_worker = threads_per_worker or Config.SEARCH_THREADS_PER_WORKER
+    workers = workers or default_workers(threads_per_worker)
+    epochs = epochs or Config.SEARCH_EPOCHS
+    patience = patience or Config.SEARCH_PATIENCE
+    trials = sample_trials(space or Config.SEARCH_SPACE, n_trials=n_trials, grid=grid)
+
+    run_dir = _search_dir() / f"{dt.datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    run_dir.mkdir(parents=True)
+    print(f"📊 Building shared dataset in {run_dir / 'dataset'}")
+    frames = frames if frames is not None else load_frames([s.upper() for s in symbols])
+    dataset_dir = build_window_dataset(frames, run_dir / "dataset", n_folds=n_folds)
+    data = WindowDataset(dataset_dir)
+    for k in range(data.n_folds):
+        train_ids, val_ids = data.fold(k)
+        print(f"  fold {k}: train {len(train_ids):,} | validation {len(val_ids):,} windows")
+
+    slices = cpu_slices(workers, threads_per_worker)
+    print(f"🚀 {len(trials)} trials × {data.n_folds} folds on {workers} workers "
+          f"× {threads_per_worker} threads")
+
+    # spawn, not fork: TensorFlow's runtime is not fork-safe
+    ctx = mp.get_context("spawn")
+    cpu_queue = ctx.Queue()
+    for cpus in slices:
+        cpu_queue.put(cpus)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(cpu_queue, threads_per_worker)) as pool:
+        futures = {
+            pool.submit(run_trial, i, hp, str(dataset_dir), str(run_dir), epochs, patience, prune): i
+            for i, hp in enumerate(trials)
+        }
+        for future in as_completed(futures):
+            try:
+                r = future.result()
+            except Exception as e:
+                print(f"  ❌ Trial {futures[future]} failed: {e}")
+                continue
+            results.append(r)
+            mark = "✂️ pruned" if r["status"] == "pruned" else "✅"
+            print(f"  {mark} trial {r['trial']:>3} | folds {r['folds']} | loss {r['val_loss']:.4f} | "
+                  f"week acc {r['acc_week']:.2%} | {r['seconds']:.0f}s on CPUs {r['cpus']}")
+
+    if not results:
+        raise RuntimeError("❌ Every trial failed")
+    board = _leaderboard(results)
+    board.to_csv(run_dir / "leaderboard.csv", index=False)
+    best = board.iloc[0]
+    (run_dir / "best.json").write_text(json.dumps({
+        "hparams": {k: best[k].item() if hasattr(best[k], "item") else best[k] for k in trials[0]},
+        "val_loss": float(best["val_loss"]),
+        "acc_tom": float(best["acc_tom"]),
+        "acc_week": float(best["acc_week"]),
+    }, indent=2))
+    return board, run_dir
@@ -0,0 +1,202 @@
+"""
+Array kernels for the `create_technical_indicators` feature set.
+
+Both backends read the Close/Volume arrays once and write every indicator
+into one preallocated float32 (n, len(INDICATOR_COLUMNS)) array, with the
+same NaN warm-up rows as the pandas implementation:
+  - "numpy": cumulative-sum rolling windows + lfilter EMAs (no extra deps)
+  - "numba": a single fused loop, JIT-compiled (requires `pip install numba`)
+"""
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+INDICATOR_COLUMNS = [
+    "ret_1d",
+    "sma_10",
+    "sma_20",
+    "sma_50",
+    "ema_12",
+    "ema_26",
+    "macd",
+    "macd_signal",
+    "rsi_14",
+    "volatility_20",
+    "vol_sma_20",
+    "vol_ratio",
+]
+(RET_1D, SMA_10, SMA_20, SMA_50, EMA_12, EMA_26, MACD, MACD_SIGNAL,
+ RSI_14, VOLATILITY_20, VOL_SMA_20, VOL_RATIO) = range(len(INDICATOR_COLUMNS))
+
+EPS = 1e-9
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Sums of x[i-window+1 : i+1] for i >= window-1 (float64)."""
+    c = np.cumsum(x, dtype=np.float64)
+    out = c[window - 1:].copy()
+    out[1:] -= c[:-window]
+    return out
+
+
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+    """ewm(span, adjust=False).mean() seeded with x[0]."""
+    alpha = 2.0 / (span + 1.0)
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=[(1.0 - alpha) * x[0]])
+    return y
+
+
+def indicators_numpy(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    n = len(close)
+    out = np.full((n, len(INDICATOR_COLUMNS)), np.nan, dtype=np.float32)
+    if n < 2:
+        return out
+
+    ret = np.empty(n)
+    ret[0] = np.nan
+    ret[1:] = close[1:] / close[:-1] - 1.0
+    out[:, RET_1D] = ret
+
+    for col, w in ((SMA_10, 10), (SMA_20, 20), (SMA_50, 50)):
+        if n >= w:
+            out[w - 1:, col] = _rolling_sum(close, w) / w
+
+    ema_12 = _ema(close, 12)
+    ema_26 = _ema(close, 26)
+    macd = ema_12 - ema_26
+    out[:, EMA_12] = ema_12
+    out[:, EMA_26] = ema_26
+    out[:, MACD] = macd
+    out[:, MACD_SIGNAL] = _ema(macd, 9)
+
+    # RSI(14) on simple rolling means of gains/losses (delta[0] is NaN)
+    if n > 14:
+        delta = np.diff(close)
+        avg_gain = _rolling_sum(np.maximum(delta, 0.0), 14) / 14
+        avg_loss = _rolling_sum(np.maximum(-delta, 0.0), 14) / 14
+        rs = avg_gain / (avg_loss + EPS)
+        out[14:, RSI_14] = 100.0 - 100.0 / (1.0 + rs)
+
+    # Rolling sample std (ddof=1) of returns
+    if n > 20:
+        r = ret[1:]
+        s1 = _rolling_sum(r, 20)
+        s2 = _rolling_sum(r * r, 20)
+        var = np.maximum((s2 - s1 * s1 / 20) / 19, 0.0)
+        out[20:, VOLATILITY_20] = np.sqrt(var)
+
+    if n >= 20:
+        vol_sma = _rolling_sum(volume, 20) / 20
+        out[19:, VOL_SMA_20] = vol_sma
+        out[19:, VOL_RATIO] = volume[19:] / (vol_sma + EPS)
+
+    return out
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _indicators_fused(close, volume, out):
+        n = close.shape[0]
+        a12 = 2.0 / 13.0
+        a26 = 2.0 / 27.0
+        a9 = 2.0 / 10.0
+        sum10 = sum20 = sum50 = 0.0
+        gain14 = loss14 = 0.0
+        r20 = r2_20 = 0.0
+        v20 = 0.0
+        ema12 = ema26 = sig = 0.0
+        for i in range(n):
+            c = close[i]
+            v = volume[i]
+
+            # Moving averages
+            sum10 += c
+            sum20 += c
+            sum50 += c
+            if i >= 10:
+                sum10 -= close[i - 10]
+            if i >= 20:
+                sum20 -= close[i - 20]
+            if i >= 50:
+                sum50 -= close[i - 50]
+            if i >= 9:
+                out[i, SMA_10] = sum10 / 10
+            if i >= 19:
+                out[i, SMA_20] = sum20 / 20
+            if i >= 49:
+                out[i, SMA_50] = sum50 / 50
+
+            # EMAs / MACD
+            if i == 0:
+                ema12 = c
+                ema26 = c
+            else:
+                ema12 = a12 * c + (1.0 - a12) * ema12
+                ema26 = a26 * c + (1.0 - a26) * ema26
+            macd = ema12 - ema26
+            sig = macd if i == 0 else a9 * macd + (1.0 - a9) * sig
+            out[i, EMA_12] = ema12
+            out[i, EMA_26] = ema26
+            out[i, MACD] = macd
+            out[i, MACD_SIGNAL] = sig
+
+            # Volume
+            v20 += v
+            if i >= 20:
+                v20 -= volume[i - 20]
+            if i >= 19:
+                vsma = v20 / 20
+                out[i, VOL_SMA_20] = vsma
+                out[i, VOL_RATIO] = v / (vsma + EPS)
+
+            if i == 0:
+                continue
+
+            # Returns, RSI, volatility
+            d = c - close[i - 1]
+            ret = c / close[i - 1] - 1.0
+            out[i, RET_1D] = ret
+
+            gain14 += max(d, 0.0)
+            loss14 += max(-d, 0.0)
+            if i > 14:
+                d_old = close[i - 14] - close[i - 15]
+                gain14 -= max(d_old, 0.0)
+                loss14 -= max(-d_old, 0.0)
+            if i >= 14:
+                rs = (gain14 / 14) / (loss14 / 14 + EPS)
+                out[i, RSI_14] = 100.0 - 100.0 / (1.0 + rs)
+
+            r20 += ret
+            r2_20 += ret * ret
+            if i > 20:
+                r_old = close[i - 20] / close[i - 21] - 1.0
+                r20 -= r_old
+                r2_20 -= r_old * r_old
+            if i >= 20:
+                var = (r2_20 - r20 * r20 / 20) / 19
+                out[i, VOLATILITY_20] = np.sqrt(max(var, 0.0))
+
+
+def indicators_numba(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    if numba is None:
+        raise ImportError("Indicator backend 'numba' requires numba: pip install numba")
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    volume = np.ascontiguousarray(volume, dtype=np.float64)
+    out = np.full((len(close), len(INDICATOR_COLUMNS)), np.nan, dtype=np.float32)
+    _indicators_fused(close, volume, out)
+    return out
+
+
+KERNELS = {
+    "numpy": indicators_numpy,
+    "numba": indicators_numba,
+}
@@ -0,0 +1,232 @@
+"""
+Lightweight stage timers and counters for the prediction/training pipeline.
+
+    with timed("model_predict"):
+        model.predict(...)
+
+    @instrumented("create_technical_indicators")
+    def create_technical_indicators(df): ...
+
+With `track_memory=True` the size of the stage's output (DataFrame/arrays)
+is recorded too, giving a per-stage memory footprint.
+
+Collected stats can be exported as a JSON log line, a text table, or a
+Prometheus-style text endpoint (`serve_metrics`). `profile_session` wraps a
+run in cProfile plus the TensorFlow profiler for `--profile` CLI flags.
+"""
+
+import cProfile
+import datetime as dt
+import functools
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from config import Config
+
+_lock = threading.Lock()
+_stages: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, float] = {}
+_memory: Dict[str, Dict[str, int]] = {}
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add one observation for a stage."""
+    with _lock:
+        s = _stages.get(stage)
+        if s is None:
+            _stages[stage] = {"calls": 1, "total": seconds, "min": seconds, "max": seconds, "last": seconds}
+        else:
+            s["calls"] += 1
+            s["total"] += seconds
+            s["min"] = min(s["min"], seconds)
+            s["max"] = max(s["max"], seconds)
+            s["last"] = seconds
+
+
+def record_memory(stage: str, nbytes: int) -> None:
+    """Record the in-memory size of a stage's output (last and peak)."""
+    with _lock:
+        m = _memory.setdefault(stage, {"last_bytes": 0, "peak_bytes": 0})
+        m["last_bytes"] = int(nbytes)
+        m["peak_bytes"] = max(m["peak_bytes"], int(nbytes))
+
+
+def nbytes_of(obj) -> int:
+    """Shallow size of DataFrames/Series/arrays (or tuples/lists of them)."""
+    if isinstance(obj, (tuple, list)):
+        return sum(nbytes_of(o) for o in obj)
+    if hasattr(obj, "memory_usage"):  # pandas
+        usage = obj.memory_usage(index=True, deep=False)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    return int(getattr(obj, "nbytes", 0))
+
+
+def increment(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+@contextmanager
+def timed(stage: str):
+    """Time the enclosed block under `stage`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - t0)
+
+
+def instrumented(stage: str, track_memory: bool = False):
+    """Decorator form of `timed`; optionally records the size of the return value."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                result = func(*args, **kwargs)
+            if track_memory:
+                record_memory(stage, nbytes_of(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def snapshot() -> Dict:
+    with _lock:
+        return {
+            "stages": {k: dict(v) for k, v in _stages.items()},
+            "counters": dict(_counters),
+            "memory": {k: dict(v) for k, v in _memory.items()},
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _memory.clear()
+
+
+def log_json(event: str = "pipeline_timings") -> str:
+    """One structured log line (JSON) with all stage stats and counters."""
+    line = json.dumps({
+        "event": event,
+        "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+        **snapshot(),
+    })
+    print(line)
+    return line
+
+
+def format_table() -> str:
+    snap = snapshot()
+    lines = [f"{'stage':<30} {'calls':>6} {'total (s)':>10} {'mean (ms)':>10} {'max (ms)':>10}"]
+    for stage, s in sorted(snap["stages"].items(), key=lambda kv: -kv[1]["total"]):
+        lines.append(
+            f"{stage:<30} {int(s['calls']):>6} {s['total']:>10.3f} "
+            f"{s['total'] / s['calls'] * 1e3:>10.1f} {s['max'] * 1e3:>10.1f}"
+        )
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"{name:<30} {value:>6g}")
+    if snap["memory"]:
+        lines.append(f"{'output memory':<30} {'last (MB)':>17} {'peak (MB)':>10}")
+        for stage, m in sorted(snap["memory"].items()):
+            lines.append(f"{stage:<30} {m['last_bytes'] / 2**20:>17.2f} {m['peak_bytes'] / 2**20:>10.2f}")
+    return "\n".join(lines)
+
+
+def to_prometheus(prefix: str = "stock_oracle") -> str:
+    """Prometheus text exposition format."""
+    snap = snapshot()
+    out = [
+        f"# HELP {prefix}_stage_seconds_total Total wall time spent per pipeline stage.",
+        f"# TYPE {prefix}_stage_seconds_total counter",
+    ]
+    for stage, s in sorted(snap["stages"].items()):
+        out.append(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {s["total"]:.6f}')
+    out += [
+        f"# HELP {prefix}_stage_calls_total Number of times each pipeline stage ran.",
+        f"# TYPE {prefix}_stage_calls_total counter",
+    ]
+    for stage, s in sorted(snap["stages"].items()):
+        out.append(f'{prefix}_stage_calls_total{{stage="{stage}"}} {int(s["calls"])}')
+    out += [
+        f"# HELP {prefix}_stage_last_seconds Duration of the most recent run of each stage.",
+        f"# TYPE {prefix}_stage_last_seconds gauge",
+    ]
+    for stage, s in sorted(snap["stages"].items()):
+        out.append(f'{prefix}_stage_last_seconds{{stage="{stage}"}} {s["last"]:.6f}')
+    out += [
+        f"# HELP {prefix}_events_total Pipeline event counters.",
+        f"# TYPE {prefix}_events_total counter",
+    ]
+    for name, value in sorted(snap["counters"].items()):
+        out.append(f'{prefix}_events_total{{name="{name}"}} {value:g}')
+    out += [
+        f"# HELP {prefix}_stage_output_bytes Size of the most recent output of each stage.",
+        f"# TYPE {prefix}_stage_output_bytes gauge",
+    ]
+    for stage, m in sorted(snap["memory"].items()):
+        out.append(f'{prefix}_stage_output_bytes{{stage="{stage}"}} {m["last_bytes"]}')
+    return "\n".join(out) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = to_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port: int = Config.METRICS_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Expose /metrics on a daemon thread. Returns the server (call .shutdown() to stop)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+@contextmanager
+def profile_session(name: str, tf_trace: bool = True):
+    """
+    cProfile (+ TensorFlow profiler trace) around a run. Writes
+    profiles/<name>-<timestamp>.prof and profiles/<name>-<timestamp>-tf/.
+    """
+    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    Config.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    prof_path = Config.PROFILE_DIR / f"{name}-{stamp}.prof"
+    tf_dir: Optional[str] = str(Config.PROFILE_DIR / f"{name}-{stamp}-tf") if tf_trace else None
+
+    if tf_dir:
+        import tensorflow as tf
+        tf.profiler.experimental.start(tf_dir)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if tf_dir:
+            tf.profiler.experimental.stop()
+        profiler.dump_stats(prof_path)
+
+        print("\n⏱️ STAGE TIMINGS")
+        print(format_table())
+        print("\n🔬 TOP FUNCTIONS (cumulative)")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+        print(f"💾 cProfile: {prof_path}")
+        if tf_dir:
+            print(f"💾 TensorFlow trace: {tf_dir} (open with TensorBoard → Profile)")
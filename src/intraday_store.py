@@ -0,0 +1,265 @@
+"""
+Date-partitioned columnar store for intraday bars.
+
+Minute bars are ~400x the rows of the daily history, so they are never held
+as one DataFrame. Each symbol/interval is split into one file per calendar
+period (Config.INTRADAY_PARTITION, monthly by default: a single session of
+1-minute bars is only ~390 rows), and each file keeps every column as its
+own array, so a reader loads only the partitions that overlap its window
+and only the columns it asks for.
+
+Layout:
+    data/processed/intraday/<SYMBOL>/<interval>/
+      2024-01.npz        timestamp (int64 ns, UTC) + Open ... Volume (PRICE_DTYPE)
+      2024-02.npz
+
+fetch_intraday downloads a range from EODHD in request-sized windows
+(INTERVALS: the API caps how many days one intraday call may span) and
+writes each window as it arrives.
+
+Writes merge new bars into the existing partition (new rows win on equal
+timestamps) and replace the file with os.replace, so readers never see a
+half-written partition. One writer process per symbol/interval.
+
+    for chunk in iter_bars("AAPL", "1m", start="2024-01-01"):   # one partition at a time
+        ...
+    week = load_bars("AAPL", "1m", "2024-03-04", "2024-03-08")  # small windows only
+
+iter_features / iter_windows run the daily feature and sequence pipeline
+over the partitions (src.feature_engineer.iter_feature_chunks,
+iter_sequences): horizons are then in bars, e.g. "tomorrow" is the next bar.
+"""
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.data_loader import PRICE_COLUMNS, _check_api_key, _eodhd_symbol, shared_client
+from src.eodhd_client import EODHDClient
+from src.feature_engineer import fit_scaler_streaming, iter_feature_chunks, iter_sequences
+from src.instrumentation import increment, instrumented
+
+TIMESTAMP = "timestamp"
+
+# EODHD intraday intervals -> max days of history per request
+INTERVALS = {
+    "1m": 120,
+    "5m": 600,
+    "1h": 7200,
+}
+
+_write_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def _intraday_dir() -> Path:
+    return Config.INTRADAY_DIR
+
+
+def _series_dir(symbol: str, interval: str) -> Path:
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown intraday interval '{interval}'. Use one of {list(INTERVALS)}")
+    return _intraday_dir() / symbol.upper() / interval
+
+
+def _write_lock(symbol: str, interval: str) -> threading.Lock:
+    with _write_locks_guard:
+        return _write_locks.setdefault((symbol.upper(), interval), threading.Lock())
+
+
+def partition_key(ts) -> str:
+    """Partition holding timestamp `ts`, e.g. '2024-03' for monthly partitions."""
+    return str(pd.Period(pd.Timestamp(ts), Config.INTRADAY_PARTITION))
+
+
+def _range_end(end) -> Optional[pd.Timestamp]:
+    """Inclusive upper bound: a date without a time of day covers that whole day."""
+    if end is None:
+        return None
+    end = pd.Timestamp(end)
+    return end + pd.Timedelta(days=1) - pd.Timedelta(1, "ns") if end == end.normalize() else end
+
+
+def list_partitions(symbol: str, interval: str, start=None, end=None) -> List[str]:
+    """Stored partition keys (oldest first) overlapping [start, end]."""
+    path = _series_dir(symbol, interval)
+    if not path.exists():
+        return []
+    keys = sorted(p.stem for p in path.glob("*.npz"))
+    start = pd.Timestamp(start) if start is not None else None
+    end = _range_end(end)
+    out = []
+    for key in keys:
+        period = pd.Period(key, Config.INTRADAY_PARTITION)
+        if start is not None and period.end_time < start:
+            continue
+        if end is not None and period.start_time > end:
+            continue
+        out.append(key)
+    return out
+
+
+def _frame(arrays: Dict[str, np.ndarray], columns: Sequence[str]) -> pd.DataFrame:
+    index = pd.DatetimeIndex(arrays[TIMESTAMP].view("datetime64[ns]"), name="Datetime")
+    return pd.DataFrame({c: arrays[c] for c in columns}, index=index)
+
+
+def read_partition(symbol: str, interval: str, key: str,
+                   columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """One partition as a DataFrame (Datetime index, UTC); only `columns` are read."""
+    columns = PRICE_COLUMNS if columns is None else list(columns)
+    with np.load(_series_dir(symbol, interval) / f"{key}.npz") as data:
+        arrays = {c: data[c] for c in [TIMESTAMP] + columns}
+    increment("intraday_partitions_read")
+    return _frame(arrays, columns)
+
+
+def _write_partition(path: Path, df: pd.DataFrame) -> None:
+    arrays = {TIMESTAMP: df.index.to_numpy(dtype="datetime64[ns]").view("int64")}
+    arrays.update({c: df[c].to_numpy(dtype=Config.PRICE_DTYPE) for c in PRICE_COLUMNS})
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+@instrumented("write_intraday_bars")
+def write_bars(symbol: str, interval: str, bars: pd.DataFrame) -> List[str]:
+    """
+    Merge `bars` (Datetime index, UTC, OHLCV columns) into the store.
+    Returns the partition keys that were written.
+    """
+    if bars.empty:
+        return []
+    path = _series_dir(symbol, interval)
+    path.mkdir(parents=True, exist_ok=True)
+    bars = bars[PRICE_COLUMNS].sort_index()
+    keys = bars.index.to_period(Config.INTRADAY_PARTITION).astype(str)
+
+    written = []
+    with _write_lock(symbol, interval):
+        for key, part in bars.groupby(keys, sort=True):
+            file = path / f"{key}.npz"
+            if file.exists():
+                part = pd.concat([read_partition(symbol, interval, key), part])
+                part = part[~part.index.duplicated(keep="last")].sort_index()
+            _write_partition(file, part)
+            written.append(key)
+    increment("intraday_partitions_written", len(written))
+    return written
+
+
+def iter_bars(symbol: str, interval: str, start=None, end=None,
+              columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """Bars in [start, end] (a date-only end includes that day), one partition at a time (oldest first)."""
+    start = pd.Timestamp(start) if start is not None else None
+    end = _range_end(end)
+    for key in list_partitions(symbol, interval, start, end):
+        part = read_partition(symbol, interval, key, columns).loc[start:end]
+        if len(part):
+            yield part
+
+
+def load_bars(symbol: str, interval: str, start=None, end=None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Bars in [start, end] as one DataFrame, reading only the overlapping
+    partitions. For long ranges, stream with iter_bars instead.
+    """
+    parts = list(iter_bars(symbol, interval, start, end, columns))
+    if not parts:
+        raise ValueError(f"No {interval} bars stored for {symbol} between {start} and {end}")
+    return pd.concat(parts)
+
+
+def iter_features(symbol: str, interval: str, start=None, end=None) -> Iterator[pd.DataFrame]:
+    """Indicator + target frames, one per partition."""
+    return iter_feature_chunks(iter_bars(symbol, interval, start, end))
+
+
+def fit_scaler(symbol: str, interval: str, start=None, end=None):
+    """StandardScaler over the features of [start, end], fitted one partition at a time."""
+    return fit_scaler_streaming(iter_features(symbol, interval, start, end))
+
+
+def iter_windows(symbol: str, interval: str, scaler, start=None, end=None,
+                 seq_len: Optional[int] = None) -> Iterator[tuple]:
+    """(X_seq, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret) batches, one per partition."""
+    return iter_sequences(iter_features(symbol, interval, start, end), scaler, seq_len)
+
+
+def stored_range(symbol: str, interval: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """(first, last) stored bar timestamp, or None if nothing is stored."""
+    keys = list_partitions(symbol, interval)
+    if not keys:
+        return None
+    first = read_partition(symbol, interval, keys[0], columns=[]).index[0]
+    last = read_partition(symbol, interval, keys[-1], columns=[]).index[-1]
+    return first, last
+
+
+def _intraday_frame(symbol: str, data) -> pd.DataFrame:
+    """EODHD /intraday JSON rows -> DataFrame indexed by UTC Datetime with OHLCV columns."""
+    if not isinstance(data, list) or len(data) == 0:
+        return pd.DataFrame(columns=PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Datetime"))
+    df = pd.DataFrame(data)
+    missing = {"timestamp", "open", "high", "low", "close", "volume"} - set(df.columns)
+    if missing:
+        raise RuntimeError(f"Missing columns {sorted(missing)} in EODHD intraday data for {symbol}")
+    df = df.dropna(subset=["close"])
+    df.index = pd.DatetimeIndex(pd.to_datetime(df["timestamp"], unit="s"), name="Datetime")
+    df = df.rename(columns={"open": "Open", "high": "High", "low": "Low",
+                            "close": "Close", "volume": "Volume"})
+    df["Volume"] = df["Volume"].fillna(0)
+    df["Adj Close"] = df["Close"]  # intraday bars are not split/dividend adjusted
+    return df[PRICE_COLUMNS].astype(Config.PRICE_DTYPE).sort_index()
+
+
+def _request_windows(interval: str, start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[int, int]]:
+    """[from, to] UNIX-second ranges no longer than the API allows for `interval`."""
+    step = pd.Timedelta(days=INTERVALS[interval])
+    windows, t = [], start
+    while t < end:
+        stop = min(t + step, end)
+        windows.append((int(t.timestamp()), int(stop.timestamp())))
+        t = stop
+    return windows
+
+
+async def fetch_intraday_async(
+    symbol: str,
+    interval: str,
+    start=None,
+    end=None,
+    refresh: bool = False,
+    client: Optional[EODHDClient] = None,
+) -> int:
+    """
+    Download `interval` bars for [start, end] and write them partition by
+    partition. Without `refresh`, a range that starts inside the stored
+    history only requests bars after the last stored one. Returns the number
+    of bars received.
+    """
+    _check_api_key()
+    symbol = symbol.upper()
+    end = _range_end(end) if end is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+    start = pd.Timestamp(start) if start is not None else end - pd.Timedelta(days=INTERVALS[interval])
+    stored = None if refresh else stored_range(symbol, interval)
+    if stored is not None and start >= stored[0]:
+        start = max(start, stored[1])
+
+    async def one(c: EODHDClient, window: Tuple[int, int]) -> int:
+        data = await c.get_intraday(_eodhd_symbol(symbol), interval, start=window[0], end=window[1])
+        bars = await asyncio.to_thread(_intraday_frame, symbol, data)
+        await asyncio.to_thread(write_bars, symbol, interval, bars)
+        return len(bars)
+
+    c = client or await shared_client()
+    counts = await asyncio.gather(*(one(c, w) for w in _request_windows(interval, start, end)))
+    return int(sum(counts))
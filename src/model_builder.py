@@ -1,27 +1,45 @@
+from typing import Dict, Optional
+
 import tensorflow as tf
 from tensorflow.keras.models import Model
 from tensorflow.keras.layers import Input, LSTM, Dense, Dropout
 from config import Config
 
-def build_multi_task_model(input_shape=(60, 20)) -> Model:  # FIXED: (60, 20)
+# Tunable hyperparameters (search.py) and their Config defaults
+HPARAM_DEFAULTS = {
+    "lstm_units_1": Config.LSTM_UNITS_1,
+    "lstm_units_2": Config.LSTM_UNITS_2,
+    "dense_units_1": Config.DENSE_UNITS_1,
+    "dense_units_2": Config.DENSE_UNITS_2,
+    "dropout_1": Config.DROPOUT_1,
+    "dropout_2": Config.DROPOUT_2,
+    "dropout_3": Config.DROPOUT_3,
+    "learning_rate": 1e-3,  # Keras Adam default
+    "batch_size": Config.BATCH_SIZE,
+}
+
+def build_multi_task_model(input_shape=(60, 20), hparams: Optional[Dict] = None,
+                           summary: bool = True) -> Model:  # FIXED: (60, 20)
     """
     Multi-task LSTM: 60 days x 20 features → 4 outputs
+    `hparams` overrides entries of HPARAM_DEFAULTS (batch_size is used by the caller).
     """
+    hp = {**HPARAM_DEFAULTS, **(hparams or {})}
     inputs = Input(shape=input_shape, name='sequence_input')
     
     # LSTM layers (fixed dropout parameter)
-    lstm1 = LSTM(Config.LSTM_UNITS_1, return_sequences=True)(inputs)
-    lstm1 = Dropout(Config.DROPOUT_1)(lstm1)
+    lstm1 = LSTM(hp["lstm_units_1"], return_sequences=True)(inputs)
+    lstm1 = Dropout(hp["dropout_1"])(lstm1)
     
-    lstm2 = LSTM(Config.LSTM_UNITS_2)(lstm1)
-    lstm2 = Dropout(Config.DROPOUT_1)(lstm2)
+    lstm2 = LSTM(hp["lstm_units_2"])(lstm1)
+    lstm2 = Dropout(hp["dropout_1"])(lstm2)
     
     # Dense layers
-    dense1 = Dense(Config.DENSE_UNITS_1, activation='relu')(lstm2)
-    dense1 = Dropout(Config.DROPOUT_2)(dense1)
+    dense1 = Dense(hp["dense_units_1"], activation='relu')(lstm2)
+    dense1 = Dropout(hp["dropout_2"])(dense1)
     
-    dense2 = Dense(Config.DENSE_UNITS_2, activation='relu')(dense1)
-    dense2 = Dropout(Config.DROPOUT_3)(dense2)
+    dense2 = Dense(hp["dense_units_2"], activation='relu')(dense1)
+    dense2 = Dropout(hp["dropout_3"])(dense2)
     
     # 4 Outputs
     tomorrow_dir = Dense(1, activation='sigmoid', name='tomorrow_output')(dense2)
@@ -32,7 +50,7 @@ def build_multi_task_model(input_shape=(60, 20)) -> Model:  # FIXED: (60, 20)
     model = Model(inputs=inputs, outputs=[tomorrow_dir, week_dir, tomorrow_ret, week_ret])
     
     model.compile(
-        optimizer='adam',
+        optimizer=tf.keras.optimizers.Adam(learning_rate=hp["learning_rate"]),
         loss={
             'tomorrow_output': 'binary_crossentropy',
             'week_output': 'binary_crossentropy',
@@ -43,5 +61,6 @@ def build_multi_task_model(input_shape=(60, 20)) -> Model:  # FIXED: (60, 20)
         metrics={'tomorrow_output': 'accuracy', 'week_output': 'accuracy'}
     )
     
-    model.summary()
+    if summary:
+        model.summary()
     return model
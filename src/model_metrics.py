@@ -0,0 +1,82 @@
+"""
+Metrics manifest written next to each model bundle (metrics.json).
+Holds per-head validation accuracy and calibration, per-symbol accuracy,
+data range and training time, so serving never has to re-evaluate.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Used only for legacy single-file models that predate the manifest
+LEGACY_METRICS = {"val_acc_tomorrow": 0.597, "val_acc_week": 0.674}
+
+
+def calibration_stats(y_true: np.ndarray, p_up: np.ndarray, n_bins: int = 10) -> Dict:
+    """Accuracy, Brier score and expected calibration error for one sigmoid head."""
+    y = np.asarray(y_true).reshape(-1).astype(np.float64)
+    p = np.asarray(p_up).reshape(-1).astype(np.float64)
+
+    bins = np.minimum((p * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    mean_p = np.bincount(bins, weights=p, minlength=n_bins)
+    mean_y = np.bincount(bins, weights=y, minlength=n_bins)
+    nonzero = counts > 0
+    mean_p[nonzero] /= counts[nonzero]
+    mean_y[nonzero] /= counts[nonzero]
+
+    return {
+        "accuracy": float(np.mean((p > 0.5) == (y > 0.5))),
+        "brier": float(np.mean((p - y) ** 2)),
+        "ece": float(np.sum(counts[nonzero] * np.abs(mean_p - mean_y)[nonzero]) / len(p)),
+        "mean_prob": float(p.mean()),
+        "base_rate": float(y.mean()),
+        "reliability": [
+            {"bin": i, "count": int(counts[i]), "mean_prob": float(mean_p[i]), "hit_rate": float(mean_y[i])}
+            for i in range(n_bins) if counts[i] > 0
+        ],
+    }
+
+
+def build_metrics_manifest(
+    predictions: Sequence[np.ndarray],
+    y_tom_dir: np.ndarray,
+    y_week_dir: np.ndarray,
+    symbols: Optional[np.ndarray] = None,
+    data_range: Optional[Dict] = None,
+    train_seconds: Optional[float] = None,
+    n_train: Optional[int] = None,
+    validation_from: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """
+    Manifest from validation predictions (model.predict output, 4 heads).
+    `symbols` labels each validation row for the per-symbol breakdown;
+    `validation_from` is the first validation target date of each symbol.
+    """
+    p_tom = np.asarray(predictions[0]).reshape(-1)
+    p_week = np.asarray(predictions[1]).reshape(-1)
+
+    tomorrow = calibration_stats(y_tom_dir, p_tom)
+    week = calibration_stats(y_week_dir, p_week)
+
+    per_symbol = {}
+    if symbols is not None:
+        for symbol in np.unique(symbols):
+            mask = symbols == symbol
+            per_symbol[str(symbol)] = {
+                "windows": int(mask.sum()),
+                "from": (validation_from or {}).get(str(symbol)),
+                "tomorrow": float(np.mean((p_tom[mask] > 0.5) == (y_tom_dir[mask] > 0.5))),
+                "week": float(np.mean((p_week[mask] > 0.5) == (y_week_dir[mask] > 0.5))),
+            }
+
+    return {
+        "val_acc_tomorrow": tomorrow["accuracy"],
+        "val_acc_week": week["accuracy"],
+        "heads": {"tomorrow": tomorrow, "week": week},
+        "per_symbol": per_symbol,
+        "symbols": sorted(per_symbol),  # symbols covered by the validation set
+        "data_range": data_range or {},
+        "samples": {"train": n_train, "validation": int(len(p_tom))},
+        "train_seconds": train_seconds,
+    }
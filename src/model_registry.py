@@ -0,0 +1,229 @@
+"""
+Versioned model registry with an atomic "current" pointer.
+
+Layout:
+    models/registry/
+      CURRENT                     # text file holding the live version id
+      <version>/model.h5
+      <version>/scalers.joblib    # {symbol: StandardScaler} fitted at training time
+      <version>/metrics.json      # validation metrics manifest (src.model_metrics)
+      <version>/metadata.json     # data range, validation period, lineage
+
+Bundles are written to a hidden temp directory and renamed into place, so
+readers only ever see complete bundles. CURRENT is replaced with os.replace.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+import datetime as dt
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import tensorflow as tf
+from sklearn.preprocessing import StandardScaler
+
+from config import Config
+from src.model_metrics import LEGACY_METRICS
+from src.instrumentation import instrumented
+
+MODEL_FILE = "model.h5"
+SCALERS_FILE = "scalers.joblib"
+METADATA_FILE = "metadata.json"
+METRICS_FILE = "metrics.json"
+CURRENT_FILE = "CURRENT"
+LEGACY_VERSION = "legacy"
+
+
+@dataclass
+class ModelBundle:
+    version: str
+    model: tf.keras.Model
+    scalers: Dict[str, StandardScaler] = field(default_factory=dict)
+    metadata: Dict = field(default_factory=dict)
+    metrics: Dict = field(default_factory=lambda: dict(LEGACY_METRICS))
+
+
+def _registry_dir() -> Path:
+    return Config.MODEL_REGISTRY_DIR
+
+
+def _new_version() -> str:
+    return f"{dt.datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def list_versions() -> List[str]:
+    """Published versions, oldest first."""
+    reg = _registry_dir()
+    if not reg.exists():
+        return []
+    return sorted(
+        p.name for p in reg.iterdir()
+        if p.is_dir() and not p.name.startswith(".") and (p / METADATA_FILE).exists()
+    )
+
+
+def current_version() -> Optional[str]:
+    pointer = _registry_dir() / CURRENT_FILE
+    if not pointer.exists():
+        return None
+    version = pointer.read_text().strip()
+    return version or None
+
+
+def set_current(version: str) -> None:
+    """Atomically point CURRENT at an existing version (also used for rollback)."""
+    reg = _registry_dir()
+    if not (reg / version / METADATA_FILE).exists():
+        raise FileNotFoundError(f"Model version not found in registry: {version}")
+    tmp = reg / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, reg / CURRENT_FILE)
+
+
+@instrumented("publish_bundle")
+def publish_bundle(
+    model: tf.keras.Model,
+    scalers: Optional[Dict[str, StandardScaler]] = None,
+    metadata: Optional[Dict] = None,
+    metrics: Optional[Dict] = None,
+    make_current: bool = True,
+) -> str:
+    """Write an immutable bundle and (optionally) make it current. Returns the version id."""
+    reg = _registry_dir()
+    reg.mkdir(parents=True, exist_ok=True)
+
+    version = _new_version()
+    tmp = reg / f".tmp-{version}"
+    tmp.mkdir()
+
+    model.save(tmp / MODEL_FILE)
+    joblib.dump(scalers or {}, tmp / SCALERS_FILE)
+    if metrics is not None:
+        (tmp / METRICS_FILE).write_text(json.dumps(metrics, indent=2))
+    meta = dict(metadata or {})
+    meta.update({
+        "version": version,
+        "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "parent": current_version(),
+    })
+    (tmp / METADATA_FILE).write_text(json.dumps(meta, indent=2))
+
+    # Bundle appears complete or not at all
+    os.rename(tmp, reg / version)
+
+    if make_current:
+        set_current(version)
+    return version
+
+
+def read_metadata(version: Optional[str] = None) -> Dict:
+    version = version or current_version()
+    if version is None:
+        return {}
+    return json.loads((_registry_dir() / version / METADATA_FILE).read_text())
+
+
+def read_metrics(version: Optional[str] = None) -> Dict:
+    """Metrics manifest of a version (default: CURRENT) without loading the model."""
+    version = version or current_version()
+    path = _registry_dir() / version / METRICS_FILE if version else None
+    if path is None or not path.exists():
+        return dict(LEGACY_METRICS)
+    return json.loads(path.read_text())
+
+
+def validation_start(bundle: ModelBundle, symbol: str, target_dates: np.ndarray) -> int:
+    """
+    Index of the first validation window of `symbol`, given the target date of
+    each of its windows (oldest first). Uses the per-symbol date cut the trainer
+    recorded in metadata["validation_from"], so callers score exactly the
+    windows the model was not fitted on. Bundles published before the cut was
+    recorded fall back to the last VALIDATION_SPLIT of the windows.
+    """
+    cut = bundle.metadata.get("validation_from", {}).get(symbol)
+    if cut is None:
+        return int(len(target_dates) * (1 - Config.VALIDATION_SPLIT))
+    days = np.asarray(target_dates).astype("datetime64[D]")
+    return int(np.searchsorted(days, np.datetime64(cut, "D")))
+
+
+@instrumented("load_bundle")
+def load_bundle(version: Optional[str] = None) -> ModelBundle:
+    """
+    Load a bundle (default: CURRENT). Falls back to the single-file
+    Config.MODEL_PATH for models trained before the registry existed.
+    """
+    version = version or current_version()
+    if version is None:
+        if not Config.MODEL_PATH.exists():
+            raise FileNotFoundError(
+                f"No model in registry {_registry_dir()} or at {Config.MODEL_PATH}. Run: python train.py"
+            )
+        return ModelBundle(LEGACY_VERSION, tf.keras.models.load_model(Config.MODEL_PATH))
+
+    path = _registry_dir() / version
+    bundle = ModelBundle(
+        version=version,
+        model=tf.keras.models.load_model(path / MODEL_FILE),
+        scalers=joblib.load(path / SCALERS_FILE),
+        metadata=json.loads((path / METADATA_FILE).read_text()),
+    )
+    if (path / METRICS_FILE).exists():
+        bundle.metrics = json.loads((path / METRICS_FILE).read_text())
+    return bundle
+
+
+class HotSwapModel:
+    """
+    Serving handle that follows CURRENT. The new bundle is loaded in a
+    background thread and swapped in with a single reference assignment;
+    requests that already called `get()` keep using the bundle they got.
+    """
+
+    def __init__(self, poll_seconds: float = Config.MODEL_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._bundle: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self) -> ModelBundle:
+        bundle = self._bundle
+        if bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = load_bundle()
+                    self._start_polling()
+                bundle = self._bundle
+        return bundle
+
+    def refresh(self) -> bool:
+        """Swap to CURRENT if it changed. Returns True if a new version was loaded."""
+        target = current_version()
+        loaded = self._bundle.version if self._bundle is not None else None
+        if target is None or target == loaded:
+            return False
+        new_bundle = load_bundle(target)  # load outside the lock; serving continues
+        with self._lock:
+            self._bundle = new_bundle
+        print(f"🔁 Hot-swapped model {loaded} → {target}")
+        return True
+
+    def _start_polling(self) -> None:
+        if self.poll_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._poll, name="model-hot-swap", daemon=True)
+        self._thread.start()
+
+    def _poll(self) -> None:
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Model hot-swap failed, keeping current model: {e}")
@@ -0,0 +1,166 @@
+"""
+Portfolio weights from batched model outputs, and a historical simulation.
+
+For N symbols with P(week UP) p, predicted week log return r and an optional
+uncertainty u (e.g. MC dropout std), the expected-return score is
+
+    alpha = (2p - 1) * |r|     (0 inside the NEUTRAL_LOW/HIGH band)
+
+and the weights solve a mean-variance problem with diagonal risk
+sigma = u + PORTFOLIO_SIGMA_FLOOR (1 without u) under a per-name cap and a
+gross exposure target:
+
+    max  sum(alpha * w) - sum(sigma^2 * w^2) / (2k)
+    s.t. |w_i| <= max_weight,  sum(|w_i|) = gross
+
+Its solution is w_i = sign(alpha_i) * min(k * |alpha_i| / sigma_i^2, max_weight),
+with k found exactly from the sorted cap breakpoints (water-filling,
+O(N log N)); no iterative solver. A turnover limit then moves only part of
+the way from the previous weights: w = w_prev + (T / turnover) * (w - w_prev),
+which keeps the cap and stays at or below the gross target because both
+endpoints do.
+
+simulate() replays the cached validation outputs (src.threshold_search) as
+a dates × symbols panel, rebalancing every WEEK_HORIZON sessions so holding
+periods do not overlap.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.decision_engine import decide_batch
+from src.feature_engineer import WEEK_HORIZON
+from src.instrumentation import instrumented
+
+
+def alpha_scores(p_week_up, ret_week, long_only: Optional[bool] = None) -> np.ndarray:
+    """Signed expected-return score; zero for HOLD decisions (and shorts when long-only)."""
+    long_only = Config.PORTFOLIO_LONG_ONLY if long_only is None else long_only
+    p = np.asarray(p_week_up, dtype=np.float64).reshape(-1)
+    r = np.asarray(ret_week, dtype=np.float64).reshape(-1)
+    action = decide_batch(p, p).action  # the action depends only on P(week UP)
+    alpha = np.where(action != 0, (2 * p - 1) * np.abs(r), 0.0)
+    if long_only:
+        alpha = np.maximum(alpha, 0.0)
+    return np.nan_to_num(alpha)
+
+
+def _capped_scale(a: np.ndarray, max_weight: float, gross: float) -> np.ndarray:
+    """min(k * a, max_weight) with k such that the sum equals `gross` (a >= 0)."""
+    active = a > 0
+    n_active = int(active.sum())
+    if n_active == 0:
+        return np.zeros_like(a)
+    if n_active * max_weight <= gross:  # even every name at the cap stays below target
+        return np.where(active, max_weight, 0.0)
+
+    order = np.argsort(-a[active], kind="stable")  # largest first: hits the cap first
+    a_sorted = a[active][order]
+    cap_at = max_weight / a_sorted                 # k at which each name reaches the cap
+    uncapped_after = a_sorted.sum() - np.cumsum(a_sorted)
+    gross_at = max_weight * np.arange(1, n_active + 1) + cap_at * uncapped_after
+    j = int(np.searchsorted(gross_at, gross))      # first breakpoint reaching the target
+    uncapped = a_sorted[j:].sum()
+    k = (gross - max_weight * j) / uncapped
+    return np.minimum(k * a, max_weight)
+
+
+@instrumented("portfolio_weights")
+def target_weights(
+    p_week_up,
+    ret_week,
+    uncertainty=None,
+    prev_weights: Optional[np.ndarray] = None,
+    max_weight: Optional[float] = None,
+    gross: Optional[float] = None,
+    max_turnover: Optional[float] = None,
+    long_only: Optional[bool] = None,
+) -> np.ndarray:
+    """Weights for one rebalance (see module docstring). Positive = long."""
+    max_weight = Config.PORTFOLIO_MAX_WEIGHT if max_weight is None else max_weight
+    gross = Config.PORTFOLIO_GROSS if gross is None else gross
+    max_turnover = Config.PORTFOLIO_MAX_TURNOVER if max_turnover is None else max_turnover
+
+    alpha = alpha_scores(p_week_up, ret_week, long_only)
+    if uncertainty is None:
+        risk = np.ones_like(alpha)
+    else:
+        sigma = np.asarray(uncertainty, dtype=np.float64).reshape(-1) + Config.PORTFOLIO_SIGMA_FLOOR
+        risk = sigma ** 2
+    weights = np.sign(alpha) * _capped_scale(np.abs(alpha) / risk, max_weight, gross)
+
+    if prev_weights is not None and max_turnover is not None:
+        trade = weights - prev_weights
+        turnover = np.abs(trade).sum()
+        if turnover > max_turnover:
+            weights = prev_weights + trade * (max_turnover / turnover)
+    return weights
+
+
+def _panel(outputs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Flat per-window outputs -> (dates, symbols, {name: dates × symbols array})."""
+    symbols, s_idx = np.unique(outputs["symbol"], return_inverse=True)
+    dates, d_idx = np.unique(outputs["date"], return_inverse=True)
+    shape = (len(dates), len(symbols))
+    panel = {}
+    for key, fill in (("p_week_up", 0.5), ("ret_week", 0.0), ("y_week_ret", np.nan)):
+        values = np.full(shape, fill, dtype=np.float64)
+        values[d_idx, s_idx] = outputs[key]
+        panel[key] = values
+    return dates, symbols, panel
+
+
+def simulate(
+    outputs: Dict[str, np.ndarray],
+    horizon: int = WEEK_HORIZON,
+    cost_bps: Optional[float] = None,
+    **constraints,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Rebalance every `horizon` sessions on the validation outputs and realise
+    the following week's returns. Returns (one row per rebalance, summary).
+    `constraints` are passed to target_weights.
+    """
+    cost_bps = Config.PORTFOLIO_COST_BPS if cost_bps is None else cost_bps
+    dates, symbols, panel = _panel(outputs)
+    weights = np.zeros(len(symbols))
+    rows = []
+    for t in range(0, len(dates), horizon):
+        listed = ~np.isnan(panel["y_week_ret"][t])
+        p = np.where(listed, panel["p_week_up"][t], 0.5)  # no window that day: HOLD
+        new = target_weights(p, panel["ret_week"][t], prev_weights=weights, **constraints)
+        turnover = float(np.abs(new - weights).sum())
+        gross_ret = float(np.sum(new[listed] * np.expm1(panel["y_week_ret"][t][listed])))
+        cost = turnover * cost_bps / 1e4
+        rows.append({
+            "date": pd.Timestamp(dates[t]),
+            "names": int((new != 0).sum()),
+            "gross": float(np.abs(new).sum()),
+            "net": float(new.sum()),
+            "turnover": turnover,
+            "return": gross_ret - cost,
+            "cost": cost,
+        })
+        weights = new
+
+    history = pd.DataFrame(rows)
+    returns = history["return"].to_numpy()
+    periods_per_year = 252 / horizon
+    equity = np.cumprod(1 + returns)
+    vol = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    summary = {
+        "rebalances": len(history),
+        "symbols": len(symbols),
+        "total_return": float(equity[-1] - 1) if len(equity) else 0.0,
+        "ann_return": float(np.mean(returns) * periods_per_year) if len(returns) else 0.0,
+        "ann_vol": float(vol * np.sqrt(periods_per_year)),
+        "sharpe": float(np.mean(returns) / vol * np.sqrt(periods_per_year)) if vol > 0 else 0.0,
+        "max_drawdown": float((equity / np.maximum.accumulate(equity) - 1).min()) if len(equity) else 0.0,
+        "hit_rate": float(np.mean(returns > 0)) if len(returns) else 0.0,
+        "avg_turnover": float(history["turnover"].mean()) if len(history) else 0.0,
+        "total_cost": float(history["cost"].sum()) if len(history) else 0.0,
+    }
+    return history, summary
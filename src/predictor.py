@@ -1,41 +1,33 @@
+import asyncio
 from typing import Dict
 import numpy as np
 import tensorflow as tf
-import requests
 import pandas as pd
+import datetime as dt
 from pathlib import Path
 
 from config import Config
-from src.data_loader import load_stock_data, EODHD_API_KEY, EODHD_BASE_URL, _eodhd_symbol
+from src.data_loader import load_stock_data, shared_client, EODHD_API_KEY, _eodhd_symbol
+from src.eodhd_client import run_sync
 from src.feature_engineer import (
     create_technical_indicators,
     create_targets,
     build_feature_matrix,
     make_sequences,
 )
-from src.decision_engine import make_trading_decision, PredictionResult
+from src.decision_engine import decide_batch, result_to_dict, PredictionResult, RealisticConfidence
+from src.model_registry import load_bundle, ModelBundle
 
-# Global validation accuracies (set by training: 59.7%, 67.4%)
-_VAL_ACC_TOMORROW: float = 0.597
-_VAL_ACC_WEEK: float = 0.674
+def _load_model() -> ModelBundle:
+    return load_bundle()
 
-def set_validation_accuracies(val_tom: float, val_week: float):
-    global _VAL_ACC_TOMORROW, _VAL_ACC_WEEK
-    _VAL_ACC_TOMORROW = val_tom
-    _VAL_ACC_WEEK = val_week
-
-def _load_model():
-    if not Config.MODEL_PATH.exists():
-        raise FileNotFoundError(f"Model not found: {Config.MODEL_PATH}. Run: python train.py")
-    return tf.keras.models.load_model(Config.MODEL_PATH)
-
-def _latest_sequence_for_symbol(symbol: str):
+def _latest_sequence_for_symbol(symbol: str, scaler=None):
     """Build latest 60-day sequence - FIXED shape handling"""
     df = load_stock_data(symbol)
-    df = create_technical_indicators(df)
+    df = create_technical_indicators(df, symbol=symbol)
     df = create_targets(df)
     
-    X_scaled, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, _ = build_feature_matrix(df)
+    X_scaled, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, _ = build_feature_matrix(df, scaler=scaler)
     X_seq, _, _, _, _ = make_sequences(
         X_scaled, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, 
         seq_len=Config.SEQUENCE_LENGTH,
@@ -51,13 +43,15 @@ def _current_price(symbol: str) -> float:
     try:
         # Try EODHD recent data
         if EODHD_API_KEY != "YOUR_EODHD_API_KEY_HERE":
-            eod_symbol = _eodhd_symbol(symbol)
-            params = {"api_token": EODHD_API_KEY, "fmt": "json", "from": "2025-11-01"}
-            resp = requests.get(f"{EODHD_BASE_URL}/{eod_symbol}", params=params, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                if isinstance(data, list) and len(data) > 0:
-                    return float(pd.DataFrame(data)["close"].iloc[-1])
+            start = (dt.date.today() - dt.timedelta(days=10)).isoformat()
+
+            async def recent():
+                client = await shared_client()
+                return await asyncio.wait_for(client.get_eod(_eodhd_symbol(symbol), start=start), timeout=10)
+
+            data = run_sync(recent())
+            if isinstance(data, list) and len(data) > 0:
+                return float(pd.DataFrame(data)["close"].iloc[-1])
     except:
         pass  # Silent fallback
     
@@ -75,13 +69,13 @@ def predict_for_symbol(symbol: str) -> Dict:
         raise ValueError(f"{symbol} not supported. Use: {Config.SUPPORTED_STOCKS}")
     
     print(f"🔄 Loading model for {symbol}...")
-    model = _load_model()
+    bundle = _load_model()
     
     print(f"📊 Building latest 60-day sequence...")
-    X_last = _latest_sequence_for_symbol(symbol)
+    X_last = _latest_sequence_for_symbol(symbol, scaler=bundle.scalers.get(symbol))
     
     print("🤖 Running prediction...")
-    predictions = model.predict(X_last, verbose=0)  # List of 4 outputs
+    predictions = bundle.model.predict(X_last, verbose=0)  # List of 4 outputs
     
     # FIXED: Handle single prediction outputs correctly
     # Each output is shape (1,1) - extract scalar values
@@ -97,16 +91,32 @@ def predict_for_symbol(symbol: str) -> Dict:
     print(f"   P(Week UP):     {week_cls:.1%}")
     print(f"   Current price:  ${current_price:.2f}")
     
-    result = make_trading_decision(
-        prob_tomorrow_up=tomorrow_cls,
-        prob_week_up=week_cls,
-        log_ret_tomorrow=tomorrow_ret,
-        log_ret_week=week_ret,
+    # Direction, action and signal strength from the vectorized decision engine (as predict.py)
+    decision = decide_batch(predictions[0], predictions[1]).row(0)
+    val_acc_tom = bundle.metrics["val_acc_tomorrow"]  # from metrics manifest
+    val_acc_week = bundle.metrics["val_acc_week"]
+    week_edge = RealisticConfidence.calibrate_edge(week_cls, val_acc_week)
+    
+    result = PredictionResult(
+        symbol=symbol,
         current_price=current_price,
-        val_acc_tomorrow=_VAL_ACC_TOMORROW,
-        val_acc_week=_VAL_ACC_WEEK,
+        tomorrow_direction=decision["tom_direction"],
+        tomorrow_confidence=RealisticConfidence.calibrate_edge(tomorrow_cls, val_acc_tom),
+        tomorrow_pct_change=(np.exp(tomorrow_ret) - 1) * 100,
+        tomorrow_price=current_price * np.exp(tomorrow_ret),
+        week_direction=decision["week_direction"],
+        week_confidence=week_edge,
+        week_pct_change=(np.exp(week_ret) - 1) * 100,
+        week_price=current_price * np.exp(week_ret),
+        action=decision["action"],
+        reason=(
+            f"{decision['signal_strength']} weekly {decision['week_direction']} signal "
+            f"(model edge {week_edge*100:.0f}%). "
+            f"Week accuracy: {val_acc_week:.0%}"
+        ),
+        model_tomorrow_acc=val_acc_tom,
+        model_week_acc=val_acc_week,
     )
-    result.symbol = symbol
     
     return result_to_dict(result)
 
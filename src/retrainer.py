@@ -0,0 +1,260 @@
+"""
+Walk-forward retraining with warm-start from the saved model.
+Windows are scaled with the bundle's scalers. The model fine-tunes on the
+windows dated after the last training date (plus a replay sample of windows
+before the parent's validation cut), except for the latest
+RETRAIN_HOLDOUT_SESSIONS windows of each symbol: those are the refresh's
+validation period and become fine-tuning data at the next refresh, once
+newer bars have replaced them. Tracks drift on the bars after the last
+training date and publishes a new registry bundle per refresh.
+"""
+
+import json
+import time
+import datetime as dt
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import StandardScaler
+
+from config import Config
+from src.data_loader import load_stock_data, prefetch_stock_data
+from src.feature_engineer import (
+    create_technical_indicators,
+    create_targets,
+    build_feature_matrix,
+    make_sequences,
+)
+from src.model_registry import load_bundle, publish_bundle, validation_start
+from src.model_metrics import build_metrics_manifest
+
+
+def build_symbol_windows(symbol: str, scaler: Optional[StandardScaler] = None,
+                         refresh: bool = False) -> tuple:
+    """
+    60-day windows for one symbol with the date of each window's target row,
+    scaled with `scaler` (the model's training-time scaler); a new one is
+    fitted only when None.
+    Returns (windows, scaler); window keys: X, y_tom_dir, y_week_dir,
+    y_tom_ret, y_week_ret, date, symbol
+    """
+    df = load_stock_data(symbol, refresh=refresh)
+    df = create_technical_indicators(df, symbol=symbol)
+    df = create_targets(df)
+
+    X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, scaler = build_feature_matrix(df, scaler=scaler)
+    X_seq, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret = make_sequences(
+        X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret,
+        seq_len=Config.SEQUENCE_LENGTH,
+    )
+    windows = {
+        "X": X_seq,
+        "y_tom_dir": y_tom_dir,
+        "y_week_dir": y_week_dir,
+        "y_tom_ret": y_tom_ret,
+        "y_week_ret": y_week_ret,
+        "date": df.index.values[Config.SEQUENCE_LENGTH:],
+        "symbol": np.full(len(X_seq), symbol),
+    }
+    return windows, scaler
+
+
+def load_training_state() -> Optional[Dict]:
+    if not Config.TRAINING_STATE_PATH.exists():
+        return None
+    return json.loads(Config.TRAINING_STATE_PATH.read_text())
+
+
+def save_training_state(state: Dict) -> None:
+    Config.TRAINING_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    Config.TRAINING_STATE_PATH.write_text(json.dumps(state, indent=2))
+
+
+def _concat(parts: List[Dict[str, np.ndarray]], key: str) -> np.ndarray:
+    return np.concatenate([p[key] for p in parts], axis=0)
+
+
+def _direction_accuracies(model: tf.keras.Model, data: Dict[str, np.ndarray]) -> tuple:
+    preds = model.predict(data["X"], batch_size=1024, verbose=0)
+    tom_acc = accuracy_score(data["y_tom_dir"], (preds[0] > 0.5).astype(int).flatten())
+    week_acc = accuracy_score(data["y_week_dir"], (preds[1] > 0.5).astype(int).flatten())
+    return float(tom_acc), float(week_acc)
+
+
+def retrain_incremental(
+    symbols: Sequence[str] = Config.SUPPORTED_STOCKS,
+    refresh_data: bool = False,
+    epochs: int = Config.RETRAIN_EPOCHS,
+    replay_ratio: float = Config.RETRAIN_REPLAY_RATIO,
+) -> Optional[Dict]:
+    """
+    Warm-start fine-tune on bars since the last training date.
+    Returns the drift/accuracy record for this refresh, or None if no new bars.
+    """
+    t0 = time.perf_counter()
+    print("🤖 Loading current model (warm start)...")
+    bundle = load_bundle()
+    model = bundle.model
+
+    state = load_training_state() or {}
+    if "trained_through" in state:
+        trained_through = np.datetime64(state["trained_through"])
+    elif "trained_through" in bundle.metadata:
+        trained_through = np.datetime64(bundle.metadata["trained_through"])
+    else:
+        # Legacy model trained before state tracking existed: fall back to the file's mtime
+        mtime = dt.datetime.fromtimestamp(Config.MODEL_PATH.stat().st_mtime)
+        trained_through = np.datetime64(mtime.date())
+        print(f"⚠️ No training state found, assuming data through {trained_through}")
+
+    print(f"🔄 Collecting windows after {trained_through}...")
+    new_parts, unseen_parts, replay_parts, val_parts = [], [], [], []
+    scalers, validation_from = dict(bundle.scalers), {}
+    prefetch_stock_data(symbols, refresh=refresh_data)
+    for symbol in symbols:
+        try:
+            w, scalers[symbol] = build_symbol_windows(symbol, scaler=bundle.scalers.get(symbol))
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+            continue
+
+        # Parent: trained before `cut`, never on the windows from it on. Refresh:
+        # fine-tune on the windows after trained_through, holding out the latest
+        # ones (never earlier than `cut`, so the holdout stays unseen)
+        n = len(w["X"])
+        n_old = int(np.sum(w["date"] <= trained_through))
+        cut = validation_start(bundle, symbol, w["date"][:n_old])
+        holdout = max(n - Config.RETRAIN_HOLDOUT_SESSIONS, cut)
+        replay_parts.append({k: v[:cut] for k, v in w.items()})
+        new_parts.append({k: v[n_old:max(holdout, n_old)] for k, v in w.items()})
+        val_parts.append({k: v[holdout:] for k, v in w.items()})
+        unseen_parts.append({k: v[n_old:] for k, v in w.items()})
+        if holdout < n:
+            validation_from[symbol] = str(pd.Timestamp(w["date"][holdout]).date())
+        print(f"  → {symbol}: {n - n_old:,} new windows "
+              f"(fine-tune {max(holdout - n_old, 0):,}, validate {n - holdout:,})")
+
+    if sum(len(p["X"]) for p in unseen_parts) == 0:
+        print("✅ No new bars since last training - model is up to date.")
+        return None
+    n_new = sum(len(p["X"]) for p in new_parts)
+    if n_new == 0:
+        print(f"✅ All new bars are in the {Config.RETRAIN_HOLDOUT_SESSIONS}-session holdout "
+              f"- nothing to fine-tune yet.")
+        return None
+
+    new = {k: _concat(new_parts, k) for k in new_parts[0]}
+    old = {k: _concat(replay_parts, k) for k in replay_parts[0]}
+    val = {k: _concat(val_parts, k) for k in val_parts[0]}
+    unseen = {k: _concat(unseen_parts, k) for k in unseen_parts[0]}
+
+    # Drift: the current model has never seen the windows after its last training date
+    fwd_tom, fwd_week = _direction_accuracies(model, unseen)
+    base_tom = bundle.metrics.get("val_acc_tomorrow")
+    base_week = bundle.metrics.get("val_acc_week")
+
+    # Replay sample of the parent's training windows to limit forgetting
+    rng = np.random.default_rng(Config.RANDOM_STATE)
+    n_replay = min(len(old["X"]), max(Config.RETRAIN_REPLAY_MIN, int(replay_ratio * n_new)))
+    if n_replay:
+        replay_idx = rng.choice(len(old["X"]), size=n_replay, replace=False)
+    else:
+        replay_idx = np.array([], dtype=int)
+    train = {
+        k: np.concatenate([new[k], old[k][replay_idx]], axis=0)
+        for k in ("X", "y_tom_dir", "y_week_dir", "y_tom_ret", "y_week_ret")
+    }
+    print(f"📈 Fine-tuning on {n_new:,} new + {n_replay:,} replay windows "
+          f"(validating on {len(val['X']):,})...")
+
+    model.optimizer.learning_rate.assign(Config.RETRAIN_LEARNING_RATE)
+    model.fit(
+        train["X"],
+        [train["y_tom_dir"], train["y_week_dir"], train["y_tom_ret"], train["y_week_ret"]],
+        epochs=epochs,
+        batch_size=Config.BATCH_SIZE,
+        shuffle=True,
+        verbose=1,
+    )
+
+    # The holdout windows are after this date, so the next refresh fine-tunes on them
+    trained_through = str(pd.Timestamp(new["date"].max()).date())
+    metrics = build_metrics_manifest(
+        model.predict(val["X"], batch_size=1024, verbose=0),
+        val["y_tom_dir"],
+        val["y_week_dir"],
+        symbols=val["symbol"],
+        data_range={"from": bundle.metadata.get("trained_from"), "through": trained_through},
+        train_seconds=time.perf_counter() - t0,
+        n_train=len(train["X"]),
+        validation_from=validation_from,
+    )
+    val_tom, val_week = metrics["val_acc_tomorrow"], metrics["val_acc_week"]
+    version = publish_bundle(
+        model,
+        scalers=scalers,
+        metrics=metrics,
+        metadata={
+            "source": "warm_start",
+            "trained_from": bundle.metadata.get("trained_from"),
+            "trained_through": trained_through,
+            "validation_from": validation_from,
+        },
+    )
+    elapsed = time.perf_counter() - t0
+
+    record = {
+        "version": version,
+        "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+        "new_windows": int(n_new),
+        "replay_windows": int(n_replay),
+        "validation_windows": int(len(val["X"])),
+        "forward_acc_tomorrow": fwd_tom,
+        "forward_acc_week": fwd_week,
+        "drift_tomorrow": None if base_tom is None else fwd_tom - base_tom,
+        "drift_week": None if base_week is None else fwd_week - base_week,
+        "val_acc_tomorrow": val_tom,
+        "val_acc_week": val_week,
+        "seconds": elapsed,
+    }
+
+    state.update({
+        "trained_through": trained_through,
+        "version": version,
+        "val_acc_tomorrow": val_tom,
+        "val_acc_week": val_week,
+    })
+    state.setdefault("history", []).append(record)
+    save_training_state(state)
+
+    print(f"✅ Refreshed model {version} in {elapsed:.1f}s")
+    print(f"   Forward accuracy on new bars → Tomorrow: {fwd_tom:.1%} | Week: {fwd_week:.1%}")
+    if record["drift_week"] is not None:
+        print(f"   Drift vs. last validation  → Tomorrow: {record['drift_tomorrow']:+.1%} | "
+              f"Week: {record['drift_week']:+.1%}")
+    if state.get("full_train_seconds"):
+        print(f"   Wall time: {elapsed / state['full_train_seconds']:.0%} of full training")
+    return record
+
+
+def run_retrain_schedule(
+    interval_hours: float = Config.RETRAIN_INTERVAL_HOURS,
+    max_runs: Optional[int] = None,
+    refresh_data: bool = True,
+) -> None:
+    """Rolling walk-forward refresh: retrain every `interval_hours` until stopped."""
+    runs = 0
+    while max_runs is None or runs < max_runs:
+        started = time.time()
+        print(f"\n🗓️ Walk-forward refresh #{runs + 1} at {dt.datetime.now():%Y-%m-%d %H:%M}")
+        try:
+            retrain_incremental(refresh_data=refresh_data)
+        except Exception as e:
+            print(f"❌ Refresh failed: {e}")
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            break
+        time.sleep(max(0.0, interval_hours * 3600 - (time.time() - started)))
@@ -0,0 +1,367 @@
+"""
+Streaming signal updates over Server-Sent Events.
+
+A StreamWorker thread polls the daily CSV cache (stat only) and, with
+Config.STREAM_FETCH_SECONDS, re-fetches it from EODHD. When a symbol's
+recent bars change, its indicators are recomputed on the last
+Config.STREAM_WARMUP_BARS rows only (rolling windows exact, older EWM terms
+below float32 resolution, as in iter_feature_chunks) and just the affected
+symbols are re-scored, in one batched forward call. A new model version
+re-scores everything. Results go to a SignalHub, which keeps the latest
+signal per symbol and fans events out to subscribers:
+
+    hub = SignalHub()
+    StreamWorker(symbols, model, score, hub).start()
+    serve_stream(hub)                  # GET /events (SSE), GET /signals (JSON)
+
+    sub = StreamSubscriber(Config.STREAM_URL).start()   # client side (app.py)
+    sub.latest["AAPL"]
+
+The HTTP side is the stdlib server used for /metrics; each SSE client gets
+a bounded queue, so a slow client drops old events instead of stalling the
+worker (the latest state is replayed on reconnect via Last-Event-ID).
+"""
+
+import json
+import queue
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from config import Config
+from src.data_loader import load_stock_data, prefetch_stock_data
+from src.feature_engineer import create_targets, create_technical_indicators, feature_columns
+from src.instrumentation import increment, timed
+
+
+class SignalHub:
+    """Latest signal per symbol plus fan-out to subscriber queues. Event ids increase by one."""
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or Config.STREAM_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Tuple[int, Dict]] = {}
+        self._subscribers: List[queue.Queue] = []
+        self._next_id = 1
+
+    def publish(self, signals: Sequence[Dict]) -> None:
+        """Record and broadcast signals (dicts with a "symbol" key)."""
+        with self._lock:
+            events = []
+            for signal in signals:
+                event = (self._next_id, signal)
+                self._latest[signal["symbol"]] = event
+                events.append(event)
+                self._next_id += 1
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            for event in events:
+                try:
+                    q.put_nowait(event)
+                except queue.Full:  # slow client: drop its oldest event
+                    increment("stream_events_dropped")
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    q.put_nowait(event)
+        increment("stream_events_published", len(events))
+
+    def snapshot(self, after: int = 0) -> List[Tuple[int, Dict]]:
+        """Latest event of each symbol with id > after, oldest first."""
+        with self._lock:
+            return sorted(e for e in self._latest.values() if e[0] > after)
+
+    def subscribe(self, after: int = 0) -> Tuple[queue.Queue, List[Tuple[int, Dict]]]:
+        """New queue for live events, plus the state to replay (latest per symbol newer than `after`)."""
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.append(q)
+            replay = sorted(e for e in self._latest.values() if e[0] > after)
+        return q, replay
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+@dataclass
+class _SymbolState:
+    tail: pd.DataFrame             # last STREAM_WARMUP_BARS daily rows seen
+    fallback_scaler: Optional[StandardScaler] = None
+
+
+# score(bundle, symbols, X_seq, prices) -> one signal dict per symbol
+ScoreFn = Callable[[object, List[str], np.ndarray, List[float]], List[Dict]]
+
+
+class StreamWorker:
+    """Background thread: detect new bars, update features on a bounded tail, re-score changed symbols."""
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        model,
+        score: ScoreFn,
+        hub: SignalHub,
+        poll_seconds: Optional[float] = None,
+        fetch_seconds: Optional[float] = None,
+        warmup: Optional[int] = None,
+    ):
+        self.symbols = [s.upper() for s in symbols]
+        self.model = model  # anything with .get() -> ModelBundle (HotSwapModel)
+        self.score = score
+        self.hub = hub
+        self.poll_seconds = Config.STREAM_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.fetch_seconds = Config.STREAM_FETCH_SECONDS if fetch_seconds is None else fetch_seconds
+        self.warmup = warmup or Config.STREAM_WARMUP_BARS
+        self._states: Dict[str, _SymbolState] = {}
+        self._stamps: Dict[str, Optional[int]] = {}
+        self._version: Optional[str] = None
+        self._last_fetch = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _changed_files(self) -> List[str]:
+        changed = []
+        for symbol in self.symbols:
+            path = Config.DATA_RAW_DIR / f"{symbol}_raw.csv"
+            stamp = path.stat().st_mtime_ns if path.exists() else None
+            if stamp != self._stamps.get(symbol, -1):
+                self._stamps[symbol] = stamp
+                changed.append(symbol)
+        return changed
+
+    def _update(self, symbol: str) -> bool:
+        """Reload a changed CSV; True if its recent bars differ from the last ones seen."""
+        tail = load_stock_data(symbol).iloc[-self.warmup:]
+        state = self._states.get(symbol)
+        if state is None:
+            self._states[symbol] = _SymbolState(tail=tail)
+            return True
+        if state.tail.equals(tail):
+            return False
+        state.tail = tail
+        return True
+
+    def _window(self, bundle, symbol: str) -> Tuple[np.ndarray, float, str]:
+        """
+        Scaled latest window from the tail (the window predict._latest_window builds),
+        the latest raw close and the date of the window's last row.
+        """
+        state = self._states[symbol]
+        df = create_targets(create_technical_indicators(state.tail, symbol=symbol))
+        cols = feature_columns(df)
+        X_raw = df[cols].to_numpy(dtype="float32")
+        seq_len = Config.SEQUENCE_LENGTH
+        if len(X_raw) <= seq_len:
+            raise ValueError(f"Insufficient data for {symbol}")
+        scaler = bundle.scalers.get(symbol)
+        if scaler is None:
+            # No training-time scaler: fit on the full history (as predict.py does) once per symbol
+            if state.fallback_scaler is None:
+                full = load_stock_data(symbol)
+                full = create_targets(create_technical_indicators(full, symbol=symbol))
+                state.fallback_scaler = StandardScaler().fit(full[cols].to_numpy(dtype="float32"))
+            scaler = state.fallback_scaler
+        X_seq = scaler.transform(X_raw[-seq_len - 1:-1])[np.newaxis]
+        # create_targets drops the last WEEK_HORIZON bars and the window stops one row short of that
+        as_of = df.index[-2].strftime("%Y-%m-%d")
+        return X_seq, float(state.tail["Close"].iloc[-1]), as_of
+
+    def run_once(self) -> List[str]:
+        """One poll: returns the symbols that were re-scored and published."""
+        if self.fetch_seconds and time.monotonic() - self._last_fetch >= self.fetch_seconds:
+            self._last_fetch = time.monotonic()
+            prefetch_stock_data(self.symbols, refresh=True)
+
+        bundle = self.model.get()
+        affected = set()
+        for symbol in self._changed_files():
+            try:
+                if self._update(symbol):
+                    affected.add(symbol)
+            except Exception as e:
+                print(f"  ⚠️ Stream: {symbol}: {e}")
+        if bundle.version != self._version:
+            self._version = bundle.version
+            affected = set(self._states)
+        if not affected:
+            return []
+
+        symbols, windows, prices, dates = [], [], [], []
+        with timed("stream_features"):
+            for symbol in sorted(affected):
+                try:
+                    X_seq, price, as_of = self._window(bundle, symbol)
+                except Exception as e:
+                    print(f"  ⚠️ Stream: {symbol}: {e}")
+                    continue
+                symbols.append(symbol)
+                windows.append(X_seq)
+                prices.append(price)
+                dates.append(as_of)
+        if not symbols:
+            return []
+        with timed("stream_score"):
+            signals = self.score(bundle, symbols, np.concatenate(windows), prices)
+        for signal, as_of in zip(signals, dates):
+            signal["as_of"] = as_of
+            signal["model_version"] = bundle.version
+        self.hub.publish(signals)
+        increment("stream_rescored", len(symbols))
+        return symbols
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"  ⚠️ Stream worker: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self) -> "StreamWorker":
+        self._thread = threading.Thread(target=self._run, name="signal-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _sse(event_id: int, data: Dict) -> bytes:
+    return f"id: {event_id}\nevent: signal\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    hub: SignalHub = None  # set per server by serve_stream
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        wanted = {s.upper() for v in parse_qs(url.query).get("symbols", []) for s in v.split(",") if s}
+        if url.path.rstrip("/") == "/signals":
+            body = json.dumps({d["symbol"]: d for _, d in self.hub.snapshot()
+                               if not wanted or d["symbol"] in wanted}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path.rstrip("/") != "/events":
+            self.send_error(404)
+            return
+
+        after = int(self.headers.get("Last-Event-ID") or 0)
+        q, replay = self.hub.subscribe(after)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            for event_id, data in replay:
+                if not wanted or data["symbol"] in wanted:
+                    self.wfile.write(_sse(event_id, data))
+            self.wfile.flush()
+            while True:
+                try:
+                    event_id, data = q.get(timeout=Config.STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")  # also detects closed connections
+                else:
+                    if wanted and data["symbol"] not in wanted:
+                        continue
+                    self.wfile.write(_sse(event_id, data))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.unsubscribe(q)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_stream(hub: SignalHub, port: int = Config.STREAM_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Expose /events (SSE) and /signals on a daemon thread. Returns the server (call .shutdown() to stop)."""
+    handler = type("StreamHandler", (_StreamHandler,), {"hub": hub})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stream-http", daemon=True).start()
+    return server
+
+
+def iter_events(url: str, last_event_id: int = 0, timeout: Optional[float] = None):
+    """Yield (event_id, data) from an SSE endpoint until the connection closes."""
+    timeout = timeout or 2 * Config.STREAM_HEARTBEAT_SECONDS
+    request = urllib.request.Request(f"{url.rstrip('/')}/events", headers={"Last-Event-ID": str(last_event_id)})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        event_id, data = None, []
+        for raw in response:
+            line = raw.decode().rstrip("\n")
+            if line.startswith("id:"):
+                event_id = int(line[3:].strip())
+            elif line.startswith("data:"):
+                data.append(line[5:].strip())
+            elif not line and data:
+                yield event_id, json.loads("\n".join(data))
+                event_id, data = None, []
+
+
+class StreamSubscriber:
+    """
+    Client-side cache of the stream: a daemon thread keeps `latest`
+    {symbol: signal + "event_id"} current and reconnects (resuming from the last event
+    id) when the connection drops. wait() blocks until a newer event.
+    """
+
+    def __init__(self, url: Optional[str] = None, retry_seconds: float = 2.0):
+        self.url = url or Config.STREAM_URL
+        self.retry_seconds = retry_seconds
+        self.latest: Dict[str, Dict] = {}
+        self.last_event_id = 0
+        self.connected = False
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                for event_id, data in iter_events(self.url, self.last_event_id):
+                    self.connected = True
+                    with self._changed:
+                        self.latest[data["symbol"]] = {**data, "event_id": event_id}
+                        self.last_event_id = max(self.last_event_id, event_id or 0)
+                        self._changed.notify_all()
+            except Exception:
+                pass
+            self.connected = False
+            time.sleep(self.retry_seconds)
+
+    def start(self) -> "StreamSubscriber":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="signal-subscriber", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, after: int, timeout: float) -> int:
+        """Block until an event newer than `after` arrives (or timeout); returns the last event id."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.last_event_id > after, timeout=timeout)
+            return self.last_event_id
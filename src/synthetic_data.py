@@ -0,0 +1,99 @@
+"""
+Synthetic OHLCV generator for benchmarks and offline runs.
+Geometric Brownian motion closes with intraday range, overnight gaps and
+volume that rises with absolute returns. Deterministic for a given seed.
+"""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+SYNTHETIC_END_DATE = "2025-12-31"  # fixed so runs are reproducible
+
+
+def synthetic_symbols(n_symbols: int) -> List[str]:
+    return [f"SYN{i:04d}" for i in range(n_symbols)]
+
+
+def generate_ohlcv(years: float = 15, seed: int = 0) -> pd.DataFrame:
+    """
+    One symbol's daily OHLCV history in the `load_stock_data` layout:
+    Date index, columns Open, High, Low, Close, Adj Close, Volume.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(int(years * TRADING_DAYS_PER_YEAR), 2)
+    dt = 1.0 / TRADING_DAYS_PER_YEAR
+
+    mu = rng.normal(0.08, 0.05)        # annual drift
+    sigma = rng.uniform(0.15, 0.50)    # annual volatility
+    start_price = rng.uniform(10, 500)
+
+    log_ret = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n)
+    close = start_price * np.exp(np.cumsum(log_ret))
+
+    daily_sigma = sigma * np.sqrt(dt)
+    prev_close = np.concatenate([[start_price], close[:-1]])
+    open_ = prev_close * np.exp(rng.normal(0, daily_sigma / 4, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, daily_sigma / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, daily_sigma / 2, n)))
+
+    base_volume = rng.lognormal(mean=16, sigma=0.8)
+    volume = base_volume * rng.lognormal(0, 0.3, n) * (1 + 3 * np.abs(log_ret) / daily_sigma)
+
+    dates = pd.bdate_range(end=SYNTHETIC_END_DATE, periods=n, name="Date")
+    return pd.DataFrame(
+        {
+            "Open": open_.round(4),
+            "High": high.round(4),
+            "Low": low.round(4),
+            "Close": close.round(4),
+            "Adj Close": close.round(4),
+            "Volume": volume.astype(np.int64),
+        },
+        index=dates,
+    )
+
+
+def generate_intraday(days: int = 20, minutes: int = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    One symbol's intraday bars in the src.intraday_store layout: UTC
+    Datetime index over 09:30-16:00 New York sessions (14:30-21:00 UTC),
+    `minutes` per bar, same columns as generate_ohlcv.
+    """
+    rng = np.random.default_rng(seed)
+    per_day = 390 // minutes
+    sessions = pd.bdate_range(end=SYNTHETIC_END_DATE, periods=days)
+    offsets = pd.to_timedelta(np.arange(per_day) * minutes + 14 * 60 + 30, unit="min")
+    index = pd.DatetimeIndex((sessions.values[:, None] + offsets.values[None, :]).ravel(), name="Datetime")
+    n = len(index)
+
+    sigma = rng.uniform(0.15, 0.50) * np.sqrt(minutes / (390 * TRADING_DAYS_PER_YEAR))
+    log_ret = sigma * rng.standard_normal(n)
+    close = rng.uniform(10, 500) * np.exp(np.cumsum(log_ret))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, sigma / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, sigma / 2, n)))
+    volume = rng.lognormal(mean=10, sigma=0.8) * rng.lognormal(0, 0.3, n) * (1 + 3 * np.abs(log_ret) / sigma)
+    return pd.DataFrame(
+        {
+            "Open": open_.round(4),
+            "High": high.round(4),
+            "Low": low.round(4),
+            "Close": close.round(4),
+            "Adj Close": close.round(4),
+            "Volume": volume.astype(np.int64),
+        },
+        index=index,
+    )
+
+
+def write_universe(out_dir: Path, n_symbols: int, years: float, seed: int = 0) -> List[str]:
+    """Write `<symbol>_raw.csv` files (same format as the EODHD cache). Returns the symbols."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    symbols = synthetic_symbols(n_symbols)
+    for i, symbol in enumerate(symbols):
+        generate_ohlcv(years, seed=seed * 1_000_003 + i).to_csv(out_dir / f"{symbol}_raw.csv")
+    return symbols
@@ -0,0 +1,241 @@
+"""
+Decision threshold sweep on cached model outputs.
+Runs the model once over every validation window, stores the raw outputs,
+then scores a grid of (NEUTRAL_LOW, NEUTRAL_HIGH, MEDIUM_EDGE, HIGH_EDGE)
+fully vectorized, without re-running the model.
+"""
+
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from src.data_loader import load_stock_data
+from src.feature_engineer import (
+    create_technical_indicators,
+    create_targets,
+    build_feature_matrix,
+    make_sequences,
+)
+from src.model_registry import LEGACY_VERSION, ModelBundle, current_version, load_bundle, validation_start
+
+# Default sweep ranges (inclusive)
+DEFAULT_GRID = {
+    "neutral_low": np.round(np.arange(0.30, 0.5001, 0.01), 3),
+    "neutral_high": np.round(np.arange(0.50, 0.7001, 0.01), 3),
+    "medium_edge": np.round(np.arange(0.02, 0.1601, 0.02), 3),
+    "high_edge": np.round(np.arange(0.08, 0.3001, 0.02), 3),
+}
+
+# Position size per signal strength (LOW, MEDIUM, HIGH)
+STRENGTH_SIZE = np.array([1 / 3, 2 / 3, 1.0], dtype=np.float32)
+
+OUTPUT_KEYS = ["p_tom_up", "p_week_up", "ret_tom", "ret_week",
+               "y_tom_dir", "y_week_dir", "y_tom_ret", "y_week_ret"]
+
+
+def collect_validation_outputs(
+    bundle: ModelBundle,
+    symbols: Sequence[str] = Config.SUPPORTED_STOCKS,
+) -> Dict[str, np.ndarray]:
+    """
+    Run the model once over the validation windows of every symbol (the
+    trainer's own held-out period, scaled with the bundle's scalers).
+    Returns flat arrays (one row per window) plus 'symbol' and 'date' columns.
+    """
+    columns = {k: [] for k in OUTPUT_KEYS + ["symbol", "date"]}
+
+    for symbol in symbols:
+        try:
+            df = load_stock_data(symbol)
+            df = create_technical_indicators(df, symbol=symbol)
+            df = create_targets(df)
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+            continue
+
+        X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, _ = build_feature_matrix(
+            df, scaler=bundle.scalers.get(symbol)
+        )
+        X_seq, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret = make_sequences(
+            X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret,
+            seq_len=Config.SEQUENCE_LENGTH,
+        )
+        dates = df.index.values[Config.SEQUENCE_LENGTH:]
+
+        split_idx = validation_start(bundle, symbol, dates)
+        if split_idx >= len(X_seq):
+            print(f"  ❌ Skipping {symbol}: no validation windows")
+            continue
+        val = slice(split_idx, None)
+
+        preds = bundle.model.predict(X_seq[val], batch_size=1024, verbose=0)
+        n = len(X_seq) - split_idx
+
+        columns["p_tom_up"].append(preds[0].reshape(-1))
+        columns["p_week_up"].append(preds[1].reshape(-1))
+        columns["ret_tom"].append(preds[2].reshape(-1))
+        columns["ret_week"].append(preds[3].reshape(-1))
+        columns["y_tom_dir"].append(y_tom_dir[val])
+        columns["y_week_dir"].append(y_week_dir[val])
+        columns["y_tom_ret"].append(y_tom_ret[val])
+        columns["y_week_ret"].append(y_week_ret[val])
+        columns["symbol"].append(np.full(n, symbol))
+        columns["date"].append(dates[val])
+        print(f"  → {symbol}: {n:,} validation windows")
+
+    if not columns["symbol"]:
+        raise RuntimeError("❌ No validation windows for any symbol.")
+
+    return {k: np.concatenate(v) for k, v in columns.items()}
+
+
+def save_outputs(outputs: Dict[str, np.ndarray], version: Optional[str] = None,
+                 path=Config.VALIDATION_OUTPUTS_PATH) -> None:
+    """Cache outputs, tagged with the model version that produced them."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **outputs, version=np.array(version or ""))
+
+
+def load_outputs(version: Optional[str] = None,
+                 path=Config.VALIDATION_OUTPUTS_PATH) -> Optional[Dict[str, np.ndarray]]:
+    """Cached outputs, or None if missing or (when `version` is given) from another model."""
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        outputs = {k: data[k] for k in data.files}
+    cached = str(outputs.pop("version", ""))
+    if version is not None and cached != version:
+        return None
+    return outputs
+
+
+def evaluate_grid(
+    p_week_up: np.ndarray,
+    realized_week_ret: np.ndarray,
+    grid: Dict[str, np.ndarray] = DEFAULT_GRID,
+    chunk_size: int = 20_000,
+) -> pd.DataFrame:
+    """
+    Score every threshold combination on one set of validation windows.
+
+    The action (-1/0/+1) depends only on the neutral band and the position
+    size only on the edge cut-offs, so the strength-sized strategy return
+    for all combinations is one (bands × N) @ (N × edges) product.
+    """
+    p = np.asarray(p_week_up, dtype=np.float32).reshape(-1)
+    r = np.asarray(realized_week_ret, dtype=np.float32).reshape(-1)
+    n = len(p)
+
+    # Neutral band combinations: (B,) each
+    low, high = np.meshgrid(grid["neutral_low"], grid["neutral_high"], indexing="ij")
+    low, high = low.ravel(), high.ravel()
+    band_ok = low < high
+
+    # Edge cut-off combinations: (E,) each
+    med, hi = np.meshgrid(grid["medium_edge"], grid["high_edge"], indexing="ij")
+    med, hi = med.ravel(), hi.ravel()
+    edge_ok = med < hi
+
+    # Accumulate over chunks of windows to bound the (grid × N) temporaries
+    B, E = len(low), len(med)
+    trades = np.zeros(B, dtype=np.float64)
+    hits = np.zeros(B, dtype=np.float64)
+    pnl_sum = np.zeros(B, dtype=np.float64)
+    score = np.zeros((B, E), dtype=np.float64)
+
+    for start in range(0, n, chunk_size):
+        pc, rc = p[start:start + chunk_size], r[start:start + chunk_size]
+
+        # Actions for every band: (B, n_chunk)
+        action = (
+            (pc[None, :] >= high[:, None]).astype(np.float32)
+            - (pc[None, :] <= low[:, None]).astype(np.float32)
+        )
+        # Size for every edge pair: (E, n_chunk)
+        edge = np.abs(pc - 0.5)
+        strength = (edge[None, :] >= med[:, None]).astype(np.int8) + (
+            edge[None, :] >= hi[:, None]
+        ).astype(np.int8)
+        size = STRENGTH_SIZE[strength]
+
+        pnl = action * rc[None, :]
+        trades += np.abs(action).sum(axis=1)
+        hits += (pnl > 0).sum(axis=1)
+        pnl_sum += pnl.sum(axis=1)
+        score += pnl @ size.T
+
+    # Per-band stats: (B,)
+    coverage = trades / n
+    hit_rate = np.divide(hits, trades, out=np.zeros_like(trades), where=trades > 0)
+    mean_trade_ret = np.divide(pnl_sum, trades, out=np.zeros_like(trades), where=trades > 0)
+    # Strength-sized strategy return per window: (B, E)
+    score /= n
+
+    b_idx = np.repeat(np.arange(B), E)
+    e_idx = np.tile(np.arange(E), B)
+    results = pd.DataFrame({
+        "neutral_low": low[b_idx],
+        "neutral_high": high[b_idx],
+        "medium_edge": med[e_idx],
+        "high_edge": hi[e_idx],
+        "coverage": coverage[b_idx],
+        "hit_rate": hit_rate[b_idx],
+        "mean_trade_ret": mean_trade_ret[b_idx],
+        "score": score.ravel(),
+    })
+    valid = (band_ok[b_idx]) & (edge_ok[e_idx])
+    return results[valid].reset_index(drop=True)
+
+
+def best_per_symbol(
+    outputs: Dict[str, np.ndarray],
+    grid: Dict[str, np.ndarray] = DEFAULT_GRID,
+    min_coverage: float = 0.05,
+) -> pd.DataFrame:
+    """Best threshold combination per symbol (plus pooled 'ALL')."""
+    rows = []
+    groups = [(s, outputs["symbol"] == s) for s in np.unique(outputs["symbol"])]
+    groups.append(("ALL", np.ones(len(outputs["symbol"]), dtype=bool)))
+
+    for symbol, mask in groups:
+        results = evaluate_grid(outputs["p_week_up"][mask], outputs["y_week_ret"][mask], grid)
+        eligible = results[results["coverage"] >= min_coverage]
+        if eligible.empty:
+            print(f"  ⚠️ {symbol}: no combination reaches {min_coverage:.0%} coverage")
+            continue
+        best = eligible.loc[eligible["score"].idxmax()].to_dict()
+        best["symbol"] = symbol
+        best["windows"] = int(mask.sum())
+        best["combinations"] = len(results)
+        rows.append(best)
+
+    cols = ["symbol", "windows", "combinations", "neutral_low", "neutral_high",
+            "medium_edge", "high_edge", "coverage", "hit_rate", "mean_trade_ret", "score"]
+    return pd.DataFrame(rows, columns=cols)
+
+
+def run_threshold_search(
+    refresh: bool = False,
+    grid: Dict[str, np.ndarray] = DEFAULT_GRID,
+    min_coverage: float = 0.05,
+) -> pd.DataFrame:
+    """Load (or compute once) cached validation outputs, then sweep the grid."""
+    outputs = None if refresh else load_outputs(current_version() or LEGACY_VERSION)
+    if outputs is None:
+        print("🤖 Running model over validation windows (one pass)...")
+        bundle = load_bundle()
+        outputs = collect_validation_outputs(bundle)
+        save_outputs(outputs, bundle.version)
+        print(f"💾 Cached outputs: {Config.VALIDATION_OUTPUTS_PATH}")
+    else:
+        print(f"📂 Using cached outputs: {Config.VALIDATION_OUTPUTS_PATH}")
+
+    n_combos = int(np.prod([len(v) for v in grid.values()]))
+    print(f"🔍 Sweeping {n_combos:,} threshold combinations...")
+    t0 = time.perf_counter()
+    best = best_per_symbol(outputs, grid, min_coverage)
+    print(f"⏱️ Sweep done in {time.perf_counter() - t0:.2f}s")
+    return best
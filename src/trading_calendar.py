@@ -0,0 +1,208 @@
+"""
+NYSE trading-day calendar with array lookups.
+
+The session index (weekdays minus exchange holidays and unscheduled
+closures) is built once per process. Alongside it sits a dense table over
+calendar days mapping each day number to its session position (-1 on
+weekends and holidays), so for any DatetimeIndex:
+
+    cal = get_calendar()
+    pos = cal.positions(df.index)       # session numbers, one array lookup
+    cal.offset(df.index, 7)             # the session 7 trading days later
+    report = cal.validate(df.index)     # duplicates, off-calendar rows, missing sessions
+
+Aligning many symbols is then integer indexing into a (symbols × sessions)
+array (align) instead of reindexing each frame. load_stock_data uses
+conform() to sort/deduplicate rows and forward-fill missing sessions, so
+row offsets such as create_targets' shift(-7) are session offsets.
+"""
+
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    DateOffset,
+    GoodFriday,
+    Holiday,
+    MO,
+    USLaborDay,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+from config import Config
+from src.instrumentation import increment, instrumented
+
+PRICE_FILL_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close"]
+
+# Unscheduled full-day closures (weather, national days of mourning, 9/11)
+SPECIAL_CLOSURES = [
+    "1994-04-27", "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+    "2004-06-11", "2007-01-02", "2012-10-29", "2012-10-30", "2018-12-05",
+    "2025-01-09",
+]
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    rules = [
+        # No Friday holiday when Jan 1 falls on a Saturday
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday("Martin Luther King Jr. Day", month=1, day=1, offset=DateOffset(weekday=MO(3)),
+                start_date="1998-01-01"),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, observance=nearest_workday, start_date="2022-01-01"),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def _day_numbers(index) -> np.ndarray:
+    return pd.DatetimeIndex(index).values.astype("datetime64[D]").astype(np.int64)
+
+
+class TradingCalendar:
+    """Exchange sessions in [start, end] plus a day-number -> session-position table."""
+
+    def __init__(self, start: str, end: str):
+        days = pd.bdate_range(start, end)
+        holidays = NYSEHolidayCalendar().holidays(start, end).union(pd.DatetimeIndex(SPECIAL_CLOSURES))
+        self.sessions = days.difference(holidays).rename("Date")
+        self._first = int(_day_numbers(pd.DatetimeIndex([start]))[0])
+        self._slot = np.full(int(_day_numbers(pd.DatetimeIndex([end]))[0]) - self._first + 1, -1, dtype=np.int64)
+        self._slot[_day_numbers(self.sessions) - self._first] = np.arange(len(self.sessions))
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def positions(self, index) -> np.ndarray:
+        """Session number of each date (-1 for non-sessions and dates outside the calendar)."""
+        rel = _day_numbers(index) - self._first
+        inside = (rel >= 0) & (rel < len(self._slot))
+        return np.where(inside, self._slot[np.clip(rel, 0, len(self._slot) - 1)], -1)
+
+    def is_session(self, index) -> np.ndarray:
+        return self.positions(index) >= 0
+
+    def offset(self, index, n: int) -> pd.DatetimeIndex:
+        """The session `n` trading days after each date (NaT for non-sessions or past the calendar)."""
+        base = self.positions(index)
+        pos = base + n
+        ok = (base >= 0) & (pos >= 0) & (pos < len(self.sessions))
+        out = np.full(len(pos), np.datetime64("NaT"), dtype="datetime64[ns]")
+        out[ok] = self.sessions.values[pos[ok]]
+        return pd.DatetimeIndex(out)
+
+    def validate(self, index) -> Dict:
+        """
+        Check dates against the calendar: duplicates, ordering, rows on
+        non-session days, and sessions missing between the first and last row.
+        """
+        index = pd.DatetimeIndex(index)
+        pos = self.positions(index)
+        on_calendar = pos[pos >= 0]
+        report = {
+            "rows": len(index),
+            "first": index.min() if len(index) else None,
+            "last": index.max() if len(index) else None,
+            "duplicates": int(index.duplicated().sum()),
+            "sorted": bool(index.is_monotonic_increasing),
+            "off_calendar": index[pos < 0],
+            "missing": pd.DatetimeIndex([], name="Date"),
+        }
+        if len(on_calendar):
+            lo, hi = on_calendar.min(), on_calendar.max()
+            covered = np.zeros(hi - lo + 1, dtype=bool)
+            covered[on_calendar - lo] = True
+            report["missing"] = self.sessions[lo + np.flatnonzero(~covered)]
+        return report
+
+    def align(self, frames: Mapping[str, pd.DataFrame], column: str = "Close") -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        (sessions, values[symbol, session]) for `frames` in iteration order,
+        NaN where a symbol has no row; rows on non-session days are dropped.
+        Sessions span the earliest to the latest row of any frame.
+        """
+        positions = {s: self.positions(df.index) for s, df in frames.items()}
+        valid = [p[p >= 0] for p in positions.values() if (p >= 0).any()]
+        lo = min(int(p.min()) for p in valid)
+        hi = max(int(p.max()) for p in valid)
+        values = np.full((len(frames), hi - lo + 1), np.nan)
+        for i, (symbol, df) in enumerate(frames.items()):
+            pos = positions[symbol]
+            keep = pos >= 0
+            values[i, pos[keep] - lo] = df[column].to_numpy(dtype=np.float64)[keep]
+        return self.sessions[lo:hi + 1], values
+
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_calendar() -> TradingCalendar:
+    """Process-wide calendar from Config.CALENDAR_START to two years after today."""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                end = (pd.Timestamp.today() + pd.DateOffset(years=2)).strftime("%Y-%m-%d")
+                _calendar = TradingCalendar(Config.CALENDAR_START, end)
+    return _calendar
+
+
+@instrumented("conform_to_calendar")
+def conform(df: pd.DataFrame, fill_gaps: Optional[bool] = None) -> pd.DataFrame:
+    """
+    Daily OHLCV with sorted, unique dates; with `fill_gaps` (default
+    Config.CALENDAR_FILL_GAPS) missing sessions between the first and last
+    row are inserted with the previous close as OHLC and zero volume.
+    Rows on non-session days are kept. Returns df itself when nothing changes.
+    """
+    fill_gaps = Config.CALENDAR_FILL_GAPS if fill_gaps is None else fill_gaps
+    if not df.index.is_monotonic_increasing or df.index.has_duplicates:
+        increment("calendar_duplicates_dropped", int(df.index.duplicated().sum()))
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+    if not fill_gaps or df.empty:
+        return df
+
+    missing = get_calendar().validate(df.index)["missing"]
+    if len(missing) == 0:
+        return df
+    increment("calendar_gaps_filled", len(missing))
+    out = df.reindex(df.index.union(missing))
+    close = out["Close"].ffill()
+    for col in PRICE_FILL_COLUMNS:
+        fill = out["Adj Close"].ffill() if col == "Adj Close" else close
+        out[col] = out[col].fillna(fill)
+    out["Volume"] = out["Volume"].fillna(0)
+    out.index.name = df.index.name
+    return out.astype(df.dtypes.to_dict(), copy=False)
+
+
+def validate_symbols(dates: Mapping[str, pd.DatetimeIndex]) -> pd.DataFrame:
+    """One row per symbol: rows, range, duplicates, off-calendar rows and missing sessions."""
+    cal = get_calendar()
+    rows: List[Dict] = []
+    for symbol, index in dates.items():
+        r = cal.validate(index)
+        rows.append({
+            "symbol": symbol,
+            "rows": r["rows"],
+            "first": r["first"],
+            "last": r["last"],
+            "duplicates": r["duplicates"],
+            "sorted": r["sorted"],
+            "off_calendar": len(r["off_calendar"]),
+            "missing": len(r["missing"]),
+            "missing_dates": ", ".join(d.strftime("%Y-%m-%d") for d in r["missing"][:5]),
+        })
+    return pd.DataFrame(rows)
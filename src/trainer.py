@@ -4,7 +4,9 @@ Multi-Task LSTM Trainer - Production Ready
 Realistic confidence calibration
 """
 
+import time
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from pathlib import Path
 from sklearn.model_selection import train_test_split
@@ -13,7 +15,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from config import Config
-from src.data_loader import load_stock_data
+from src.data_loader import load_stock_data, prefetch_stock_data
 from src.feature_engineer import (
     create_technical_indicators, 
     create_targets, 
@@ -21,28 +23,35 @@ from src.feature_engineer import (
     make_sequences
 )
 from src.model_builder import build_multi_task_model
+from src.retrainer import load_training_state, save_training_state
+from src.model_registry import publish_bundle
+from src.model_metrics import build_metrics_manifest
+from src.instrumentation import instrumented, timed, record, increment
+from src.checkpointing import (
+    TrainingCheckpoint,
+    clear_checkpoints,
+    has_checkpoint,
+    is_finished,
+    load_run,
+    start_run,
+)
 
-# Global validation accuracies (shared with predictor)
-_VAL_ACC_TOMORROW: float = 0.55
-_VAL_ACC_WEEK: float = 0.77
-
-def set_validation_accuracies(val_tom: float, val_week: float):
-    """Set global validation accuracies for predictor use."""
-    global _VAL_ACC_TOMORROW, _VAL_ACC_WEEK
-    _VAL_ACC_TOMORROW = val_tom
-    _VAL_ACC_WEEK = val_week
-
+@instrumented("build_dataset")
 def build_dataset_for_symbols(symbols: list) -> tuple:
     """Build combined dataset from multiple symbols."""
     print("📊 Building dataset...")
     
     all_X, all_y_tom_dir, all_y_week_dir, all_y_tom_ret, all_y_week_ret = [], [], [], [], []
+    all_symbols, all_dates = [], []
+    first_date, last_date = None, None
+    scalers = {}
     
+    prefetch_stock_data(symbols)  # concurrent, rate-limited download of missing CSVs
     for i, symbol in enumerate(symbols):
         print(f"Processing {symbol}... ({i+1}/{len(symbols)})")
         try:
             df = load_stock_data(symbol)
-            df = create_technical_indicators(df)
+            df = create_technical_indicators(df, symbol=symbol)
             df = create_targets(df)
             
             X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, scaler = build_feature_matrix(df)
@@ -52,6 +61,12 @@ def build_dataset_for_symbols(symbols: list) -> tuple:
             all_y_week_dir.append(y_week_dir)
             all_y_tom_ret.append(y_tom_ret)
             all_y_week_ret.append(y_week_ret)
+            all_symbols.append(np.full(len(X), symbol))
+            all_dates.append(df.index.values)
+            scalers[symbol] = scaler
+            
+            first_date = df.index.min() if first_date is None else min(first_date, df.index.min())
+            last_date = df.index.max() if last_date is None else max(last_date, df.index.max())
             
             print(f"  → {len(X):,} samples")
             
@@ -70,78 +85,154 @@ def build_dataset_for_symbols(symbols: list) -> tuple:
     y_week_ret = np.concatenate(all_y_week_ret, axis=0)
     
     print(f"✅ Dataset built: {len(X):,} samples, {X.shape[1]} features")
-    return X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret
+    info = {
+        "first_date": first_date,
+        "last_date": last_date,
+        "scalers": scalers,
+        "symbols": np.concatenate(all_symbols),  # symbol of each row
+        "dates": np.concatenate(all_dates),      # date of each row
+    }
+    return X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, info
+
+def split_sequences_by_symbol(X: np.ndarray, targets: list, symbols: np.ndarray,
+                              dates: np.ndarray = None) -> tuple:
+    """
+    60-day sequences built per symbol (no window spans two symbols) and split
+    in time per symbol: the last VALIDATION_SPLIT of each symbol's windows are
+    validation, so every symbol is validated on its own most recent period.
+    Returns (train, val, val_symbols, validation_from) where train/val are
+    [X_seq, *targets] and validation_from maps each symbol to the target date
+    of its first validation window (empty when `dates` is unknown).
+    """
+    train, val = [[] for _ in range(len(targets) + 1)], [[] for _ in range(len(targets) + 1)]
+    val_symbols, validation_from = [], {}
+    starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+    for start, end in zip(starts, np.r_[starts[1:], len(X)]):
+        symbol = str(symbols[start])
+        if end - start <= Config.SEQUENCE_LENGTH:
+            continue
+        seqs = make_sequences(X[start:end], *[y[start:end] for y in targets],
+                              seq_len=Config.SEQUENCE_LENGTH)
+        split_idx = int(len(seqs[0]) * (1 - Config.VALIDATION_SPLIT))
+        for k, arr in enumerate(seqs):
+            train[k].append(arr[:split_idx])
+            val[k].append(arr[split_idx:])
+        val_symbols.append(np.full(len(seqs[0]) - split_idx, symbol))
+        if dates is not None and split_idx < len(seqs[0]):
+            # Window i is labelled by row i + SEQUENCE_LENGTH
+            day = dates[start + Config.SEQUENCE_LENGTH + split_idx]
+            validation_from[symbol] = str(pd.Timestamp(day).date())
+    train = [np.concatenate(parts) for parts in train]
+    val = [np.concatenate(parts) for parts in val]
+    return train, val, np.concatenate(val_symbols), validation_from
 
-def train_and_save_model() -> tuple[float, float]:
-    """Complete training pipeline with proper data splitting."""
+def _prepare_run(hparams: dict, resume: bool) -> tuple:
+    """Dataset and run settings: from the checkpoint when resuming, else built and checkpointed."""
+    if resume:
+        run, arrays, scalers = load_run()
+        print(f"♻️ Resuming checkpointed run (data {run['first_date']} → {run['last_date']})")
+        info = {
+            "first_date": run["first_date"],
+            "last_date": run["last_date"],
+            "scalers": scalers,
+            "symbols": arrays["symbols"],
+            "dates": arrays.get("dates"),  # absent in checkpoints from older runs
+        }
+        return (arrays["X"], arrays["y_tom_dir"], arrays["y_week_dir"],
+                arrays["y_tom_ret"], arrays["y_week_ret"], info, run)
     print("🔄 Loading 15+ years of data...")
-    X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret = build_dataset_for_symbols(
+    X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, info = build_dataset_for_symbols(
         Config.SUPPORTED_STOCKS
     )
+    run = {
+        "hparams": hparams,
+        "epochs": Config.EPOCHS,
+        "first_date": str(pd.Timestamp(info["first_date"]).date()),
+        "last_date": str(pd.Timestamp(info["last_date"]).date()),
+    }
+    start_run(run, {
+        "X": X, "y_tom_dir": y_tom_dir, "y_week_dir": y_week_dir,
+        "y_tom_ret": y_tom_ret, "y_week_ret": y_week_ret, "symbols": info["symbols"],
+        "dates": info["dates"],
+    }, info["scalers"])
+    return X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, info, run
+
+def train_and_save_model(hparams: dict = None, resume: bool = False,
+                         checkpoint_every: int = None) -> tuple[float, float]:
+    """
+    Complete training pipeline with proper data splitting.
+    `hparams` overrides the Config architecture/optimizer settings (see search.py).
+    Weights, optimizer and callback state are checkpointed every
+    `checkpoint_every` epochs; `resume=True` continues the interrupted run.
+    """
+    t0 = time.perf_counter()
+    resuming = resume and has_checkpoint()
+    if resume and not resuming:
+        print("⚠️ No checkpoint found: starting a fresh run")
+    elif not resume and has_checkpoint():
+        print("⚠️ Discarding the checkpoint of an unfinished run (use --resume to continue it)")
+    X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret, info, run = _prepare_run(hparams or {}, resuming)
+    hparams = run["hparams"]  # a resumed run keeps its own settings
     
     print("🔄 Creating 60-day sequences...")
-    X_seq, y_tom_dir_seq, y_week_dir_seq, y_tom_ret_seq, y_week_ret_seq = make_sequences(
-        X, y_tom_dir, y_week_dir, y_tom_ret, y_week_ret,
-        seq_len=Config.SEQUENCE_LENGTH
+    train, val, val_symbols, validation_from = split_sequences_by_symbol(
+        X, [y_tom_dir, y_week_dir, y_tom_ret, y_week_ret], info["symbols"], info["dates"]
     )
+    X_train, y_tom_dir_train, y_week_dir_train, y_tom_ret_train, y_week_ret_train = train
+    X_val, y_tom_dir_val, y_week_dir_val, y_tom_ret_val, y_week_ret_val = val
     
-    print(f"📊 Sequences: {len(X_seq):,} (shape: {X_seq.shape})")
-    
-    # FIXED: Proper train/validation split for ALL targets
-    split_idx = int(len(X_seq) * (1 - Config.VALIDATION_SPLIT))
-    
-    X_train = X_seq[:split_idx]
-    X_val = X_seq[split_idx:]
-    
-    y_tom_dir_train = y_tom_dir_seq[:split_idx]
-    y_tom_dir_val = y_tom_dir_seq[split_idx:]
-    
-    y_week_dir_train = y_week_dir_seq[:split_idx]
-    y_week_dir_val = y_week_dir_seq[split_idx:]
-    
-    y_tom_ret_train = y_tom_ret_seq[:split_idx]
-    y_tom_ret_val = y_tom_ret_seq[split_idx:]
-    
-    y_week_ret_train = y_week_ret_seq[:split_idx]
-    y_week_ret_val = y_week_ret_seq[split_idx:]
+    print(f"📊 Sequences: {len(X_train) + len(X_val):,} (shape: {X_train.shape[1:]})")
     
     print(f"📈 Training: {len(X_train):,} | Validation: {len(X_val):,}")
     
     print("🏗️ Building multi-task LSTM...")
     # FIXED: Pass exact input shape
-    model = build_multi_task_model((Config.SEQUENCE_LENGTH, X.shape[1]))
-    
-    print("🚀 Starting training...")
-    history = model.fit(
-        X_train,
-        [y_tom_dir_train, y_week_dir_train, y_tom_ret_train, y_week_ret_train],
-        validation_data=(
-            X_val, 
-            [y_tom_dir_val, y_week_dir_val, y_tom_ret_val, y_week_ret_val]
-        ),
-        epochs=Config.EPOCHS,
-        batch_size=Config.BATCH_SIZE,
-        callbacks=[
-            tf.keras.callbacks.EarlyStopping(
-                monitor='val_loss', 
-                patience=10, 
-                restore_best_weights=True,
-                verbose=1
-            ),
-            tf.keras.callbacks.ReduceLROnPlateau(
-                monitor='val_loss', 
-                factor=0.5, 
-                patience=5, 
-                min_lr=1e-7,
-                verbose=1
-            )
-        ],
+    model = build_multi_task_model((Config.SEQUENCE_LENGTH, X.shape[1]), hparams=hparams)
+    
+    early_stopping = tf.keras.callbacks.EarlyStopping(
+        monitor='val_loss', 
+        patience=10, 
+        restore_best_weights=True,
+        verbose=1
+    )
+    reduce_lr = tf.keras.callbacks.ReduceLROnPlateau(
+        monitor='val_loss', 
+        factor=0.5, 
+        patience=5, 
+        min_lr=1e-7,
         verbose=1
     )
+    # Last in the callback list, so it saves/restores the other callbacks' state
+    checkpoint = TrainingCheckpoint(early_stopping, reduce_lr, every_epochs=checkpoint_every)
+    initial_epoch = 0
+    if resuming:
+        initial_epoch = checkpoint.restore(model)
+    
+    if resuming and is_finished():
+        print(f"✅ Training had finished at epoch {initial_epoch}: skipping to evaluation")
+    else:
+        print(f"🚀 Starting training{f' at epoch {initial_epoch + 1}' if initial_epoch else ''}...")
+        t_fit = time.perf_counter()
+        history = model.fit(
+            X_train,
+            [y_tom_dir_train, y_week_dir_train, y_tom_ret_train, y_week_ret_train],
+            validation_data=(
+                X_val, 
+                [y_tom_dir_val, y_week_dir_val, y_tom_ret_val, y_week_ret_val]
+            ),
+            epochs=run["epochs"],
+            initial_epoch=initial_epoch,
+            batch_size=int(hparams.get("batch_size", Config.BATCH_SIZE)),
+            callbacks=[early_stopping, reduce_lr, checkpoint],
+            verbose=1
+        )
+        record("model_fit", time.perf_counter() - t_fit)
+        increment("training_epochs", len(history.epoch))
     
     print("\n📊 Calculating final validation accuracy...")
     # Predict on validation set
-    val_predictions = model.predict(X_val, verbose=0)
+    with timed("model_evaluate"):
+        val_predictions = model.predict(X_val, verbose=0)
     
     tom_dir_pred = (val_predictions[0] > 0.5).astype(int).flatten()
     week_dir_pred = (val_predictions[1] > 0.5).astype(int).flatten()
@@ -153,14 +244,45 @@ def train_and_save_model() -> tuple[float, float]:
     print(f"   📅 Tomorrow Direction: {val_tom_acc:.1%}")
     print(f"   📈 1-Week Direction:  {val_week_acc:.1%}")
     
-    # Save model
-    Config.MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    model.save(Config.MODEL_PATH)
+    # Publish an immutable bundle and atomically make it current
+    trained_from = str(pd.Timestamp(info["first_date"]).date())
+    trained_through = str(pd.Timestamp(info["last_date"]).date())
+    metrics = build_metrics_manifest(
+        val_predictions,
+        y_tom_dir_val,
+        y_week_dir_val,
+        symbols=val_symbols,
+        data_range={"from": trained_from, "through": trained_through},
+        train_seconds=time.perf_counter() - t0,
+        n_train=len(X_train),
+        validation_from=validation_from,
+    )
+    version = publish_bundle(
+        model,
+        scalers=info["scalers"],
+        metrics=metrics,
+        metadata={
+            "source": "full",
+            "trained_from": trained_from,
+            "trained_through": trained_through,
+            "validation_from": validation_from,
+            "hparams": hparams,
+        },
+    )
     
-    print(f"💾 Model saved: {Config.MODEL_PATH.absolute()}")
+    print(f"💾 Model published: {Config.MODEL_REGISTRY_DIR / version}")
     
-    # Update global accuracies for predictor
-    set_validation_accuracies(val_tom_acc, val_week_acc)
+    # Record what this model has seen so warm-start refreshes know where to resume
+    state = load_training_state() or {}
+    state.update({
+        "trained_through": trained_through,
+        "version": version,
+        "val_acc_tomorrow": float(val_tom_acc),
+        "val_acc_week": float(val_week_acc),
+        "full_train_seconds": metrics["train_seconds"],
+    })
+    save_training_state(state)
+    clear_checkpoints()  # published: nothing left to resume
     
     return val_tom_acc, val_week_acc
 
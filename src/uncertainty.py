@@ -0,0 +1,74 @@
+"""
+Monte Carlo dropout uncertainty for the multi-task model.
+
+Input windows are tiled K times into one batch and run through the model in
+a single forward call with training=True, so each copy gets its own dropout
+masks: K stochastic passes for the cost of one batched inference instead of
+K separate model.predict calls. Returns the mean and spread of every head.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import tensorflow as tf
+
+from config import Config
+from src.instrumentation import timed, increment
+
+HEADS = ["tomorrow_output", "week_output", "tomorrow_return", "week_return"]
+
+
+def _stochastic_forward(model: tf.keras.Model):
+    """Compiled forward pass with dropout on, cached on the model (eager calls are far slower)."""
+    fn = getattr(model, "_mc_dropout_forward", None)
+    if fn is None:
+        fn = tf.function(lambda x: model(x, training=True), reduce_retracing=True)
+        model._mc_dropout_forward = fn
+    return fn
+
+
+@dataclass
+class MCDropoutEstimate:
+    mean: np.ndarray  # (4, n_windows), heads in HEADS order
+    std: np.ndarray   # (4, n_windows)
+    passes: int
+
+    def as_dict(self, i: int = 0) -> Dict[str, Dict[str, float]]:
+        """{head: {"mean": ..., "std": ...}} for window i."""
+        return {
+            head: {"mean": float(self.mean[h, i]), "std": float(self.std[h, i])}
+            for h, head in enumerate(HEADS)
+        }
+
+
+def mc_dropout_predict(
+    model: tf.keras.Model,
+    X: np.ndarray,
+    passes: Optional[int] = None,
+    max_batch: Optional[int] = None,
+) -> MCDropoutEstimate:
+    """
+    K stochastic passes over windows X (n, seq_len, features). Windows are
+    processed in chunks so at most `max_batch` tiled rows go through at once.
+    """
+    passes = passes or Config.MC_DROPOUT_PASSES
+    max_batch = max_batch or Config.MC_DROPOUT_MAX_BATCH
+    X = np.asarray(X, dtype=np.float32)
+    n = len(X)
+    windows_per_call = max(1, max_batch // passes)
+    forward = _stochastic_forward(model)
+
+    mean = np.empty((len(HEADS), n), dtype=np.float32)
+    std = np.empty((len(HEADS), n), dtype=np.float32)
+    with timed("mc_dropout"):
+        for start in range(0, n, windows_per_call):
+            chunk = X[start:start + windows_per_call]
+            tiled = np.repeat(chunk, passes, axis=0)  # copies of each window are adjacent
+            outputs = forward(tf.convert_to_tensor(tiled))
+            for h, out in enumerate(outputs):
+                samples = out.numpy().reshape(len(chunk), passes)
+                mean[h, start:start + len(chunk)] = samples.mean(axis=1)
+                std[h, start:start + len(chunk)] = samples.std(axis=1)
+    increment("mc_dropout_passes", passes * n)
+    return MCDropoutEstimate(mean=mean, std=std, passes=passes)
@@ -0,0 +1,200 @@
+"""
+Memory-mapped window dataset shared by training worker processes.
+
+All symbols' scaled feature rows are written once as .npy files that every
+worker maps read-only; 60-day windows are gathered from the shared rows per
+batch, so N processes do not hold N copies of the (windows × 60 × features)
+tensor. Window i covers rows [start, start + seq_len) and is labelled by row
+start + seq_len (as make_sequences).
+
+Cutoffs split windows by target date into expanding folds: fold k trains on
+windows labelled before cutoff k (minus an embargo) and validates on
+[cutoff k, cutoff k+1). Scalers are fitted per symbol on the rows before the
+first cutoff, so no fold sees validation statistics.
+
+Layout:
+    <dataset>/rows.npy        float32 (rows × features), all symbols back to back
+    <dataset>/targets.npy     float32 (rows × 4), TARGET_COLUMNS order
+    <dataset>/windows.npz     start row, target date and symbol of each window
+    <dataset>/scalers.joblib  {symbol: StandardScaler}
+    <dataset>/meta.json       symbols, features, seq_len, cutoffs
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sklearn.preprocessing import StandardScaler
+
+from config import Config
+from src.data_loader import load_stock_data, prefetch_stock_data
+from src.feature_engineer import (
+    TARGET_COLUMNS,
+    create_technical_indicators,
+    create_targets,
+    feature_columns,
+)
+from src.instrumentation import instrumented
+from src.trading_calendar import get_calendar
+
+
+def load_frames(symbols: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Features + targets per symbol from the CSV cache."""
+    frames = {}
+    prefetch_stock_data(symbols)
+    for symbol in symbols:
+        try:
+            df = load_stock_data(symbol)
+            df = create_technical_indicators(df, symbol=symbol)
+            frames[symbol] = create_targets(df)
+        except Exception as e:
+            print(f"  ❌ Skipping {symbol}: {e}")
+    if not frames:
+        raise RuntimeError("❌ No valid data for any symbol")
+    return frames
+
+
+def _day_numbers(index: pd.DatetimeIndex) -> np.ndarray:
+    return index.values.astype("datetime64[D]").astype(np.int64)
+
+
+@instrumented("build_window_dataset")
+def build_window_dataset(
+    frames: Dict[str, pd.DataFrame],
+    out_dir: Path,
+    n_folds: Optional[int] = None,
+    min_train_fraction: Optional[float] = None,
+    seq_len: Optional[int] = None,
+) -> Path:
+    """Scale and write all symbols' rows and windows as memory-mappable files."""
+    n_folds = n_folds or Config.SEARCH_FOLDS
+    min_train_fraction = min_train_fraction or Config.SEARCH_MIN_TRAIN_FRACTION
+    seq_len = seq_len or Config.SEQUENCE_LENGTH
+    symbols = list(frames)
+    features = feature_columns(frames[symbols[0]])
+
+    # Fold cutoffs: quantiles of the pooled window target dates
+    target_days = np.concatenate([_day_numbers(df.index[seq_len:]) for df in frames.values()])
+    fractions = min_train_fraction + (1 - min_train_fraction) * np.arange(n_folds + 1) / n_folds
+    cutoffs = np.quantile(target_days, fractions).astype(np.int64)
+    cutoffs[-1] = target_days.max() + 1
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_rows = sum(len(df) for df in frames.values())
+    rows = np.lib.format.open_memmap(out_dir / "rows.npy", mode="w+", dtype=np.float32,
+                                     shape=(n_rows, len(features)))
+    targets = np.lib.format.open_memmap(out_dir / "targets.npy", mode="w+", dtype=np.float32,
+                                        shape=(n_rows, len(TARGET_COLUMNS)))
+    starts, window_days, window_symbol = [], [], []
+    scalers = {}
+    offset = 0
+    for s, symbol in enumerate(symbols):
+        df = frames[symbol]
+        if feature_columns(df) != features:
+            raise ValueError(f"{symbol}: feature columns differ from {symbols[0]}")
+        X_raw = df[features].to_numpy(dtype="float32")
+        days = _day_numbers(df.index)
+        fit_rows = X_raw[days < cutoffs[0]]
+        scaler = StandardScaler().fit(fit_rows if len(fit_rows) > 1 else X_raw)
+        scalers[symbol] = scaler
+
+        rows[offset:offset + len(df)] = scaler.transform(X_raw)
+        targets[offset:offset + len(df)] = df[TARGET_COLUMNS].to_numpy(dtype="float32")
+        # Window [i, i + seq_len) is labelled by row i + seq_len (as make_sequences)
+        n_windows = max(len(df) - seq_len, 0)
+        starts.append(offset + np.arange(n_windows))
+        window_days.append(days[seq_len:])
+        window_symbol.append(np.full(n_windows, s, dtype=np.int32))
+        offset += len(df)
+    rows.flush()
+    targets.flush()
+    del rows, targets
+
+    joblib.dump(scalers, out_dir / "scalers.joblib")
+    np.savez(out_dir / "windows.npz",
+             start=np.concatenate(starts), day=np.concatenate(window_days),
+             symbol=np.concatenate(window_symbol))
+    (out_dir / "meta.json").write_text(json.dumps({
+        "symbols": symbols,
+        "features": features,
+        "seq_len": seq_len,
+        "cutoffs": [str(np.datetime64(int(c), "D")) for c in cutoffs],
+    }))
+    return out_dir
+
+
+class WindowDataset:
+    """Read-only view over a dataset written by build_window_dataset."""
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        self.path = path
+        meta = json.loads((path / "meta.json").read_text())
+        windows = np.load(path / "windows.npz")
+        self.rows: np.ndarray = np.load(path / "rows.npy", mmap_mode="r")
+        self.targets: np.ndarray = np.load(path / "targets.npy", mmap_mode="r")
+        self.start: np.ndarray = windows["start"]
+        self.day: np.ndarray = windows["day"]
+        self.symbol: np.ndarray = windows["symbol"]
+        self.symbols: List[str] = meta["symbols"]
+        self.features: List[str] = meta["features"]
+        self.seq_len: int = meta["seq_len"]
+        self.cutoffs = np.array([np.datetime64(c, "D").astype(np.int64) for c in meta["cutoffs"]])
+
+    def scalers(self) -> Dict[str, StandardScaler]:
+        return joblib.load(self.path / "scalers.joblib")
+
+    @property
+    def n_folds(self) -> int:
+        return len(self.cutoffs) - 1
+
+    def fold(self, k: int, embargo_sessions: Optional[int] = None):
+        """
+        (train window ids, validation window ids) of expanding fold k. Training
+        windows are labelled at least `embargo_sessions` trading sessions before
+        the first validation session, so their week targets end before it.
+        """
+        embargo = Config.SEARCH_EMBARGO_SESSIONS if embargo_sessions is None else embargo_sessions
+        lo, hi = self.cutoffs[k], self.cutoffs[k + 1]
+        sessions = get_calendar().sessions.values.astype("datetime64[D]").astype(np.int64)
+        first_val = int(np.searchsorted(sessions, lo))
+        last_train = first_val - embargo  # session position of the latest training label
+        train = np.flatnonzero(self.day <= sessions[last_train]) if last_train >= 0 else np.array([], dtype=np.int64)
+        val = np.flatnonzero((self.day >= lo) & (self.day < hi))
+        return train, val
+
+    def batch(self, window_ids: np.ndarray):
+        """(X (n, seq_len, features), [tom_dir, week_dir, tom_ret, week_ret]) for the given windows."""
+        starts = self.start[window_ids]
+        X = self.rows[starts[:, None] + np.arange(self.seq_len)]
+        y = self.targets[starts + self.seq_len]
+        return X, [y[:, j] for j in range(y.shape[1])]
+
+
+class WindowBatches(tf.keras.utils.Sequence):
+    """Keras batches gathered from the shared rows (no materialized window tensor)."""
+
+    def __init__(self, data: WindowDataset, window_ids: np.ndarray, batch_size: int,
+                 shuffle: bool = False, seed: int = 0):
+        super().__init__()
+        self.data = data
+        self.window_ids = np.array(window_ids)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        self.on_epoch_end()
+
+    def __len__(self) -> int:
+        return int(np.ceil(len(self.window_ids) / self.batch_size))
+
+    def __getitem__(self, i: int):
+        ids = self.window_ids[i * self.batch_size:(i + 1) * self.batch_size]
+        return self.data.batch(ids)
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self._rng.shuffle(self.window_ids)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Stream signal updates to clients over Server-Sent Events.
+
+A background worker watches the daily CSV cache for new bars (optionally
+re-fetching from EODHD), updates indicators on a bounded tail, re-scores only
+the symbols that changed and pushes their UIMetrics to every subscriber.
+app.py follows the stream with its "📡 Live stream" toggle.
+
+Run:
+    python stream.py
+    python stream.py --symbols AAPL MSFT --fetch-seconds 300 --port 8765
+    python stream.py --metrics-port 9108 --log-json   # Prometheus /metrics + JSON timings each minute
+
+Endpoints:
+    GET /events[?symbols=AAPL,MSFT]    text/event-stream, one "signal" event per update
+    GET /signals                       latest signal of every symbol (JSON)
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from predict import _MODEL, ui_predict_windows
+from src.instrumentation import log_json, serve_metrics
+from src.signal_stream import SignalHub, StreamWorker, serve_stream
+
+
+def score(bundle, symbols, X_seq, prices):
+    return [asdict(m) for m in ui_predict_windows(bundle, symbols, X_seq, prices)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming signal server (SSE)")
+    parser.add_argument("--symbols", nargs="+", default=Config.SUPPORTED_STOCKS)
+    parser.add_argument("--port", type=int, default=Config.STREAM_PORT)
+    parser.add_argument("--poll", type=float, default=Config.STREAM_POLL_SECONDS,
+                        help="Seconds between checks of the daily CSV cache")
+    parser.add_argument("--fetch-seconds", type=float, default=Config.STREAM_FETCH_SECONDS,
+                        help="Re-fetch the symbols from EODHD this often (0 = only watch the cache)")
+    parser.add_argument("--metrics-port", type=int, nargs="?", const=Config.METRICS_PORT, default=None,
+                        help=f"Expose stage timings and counters on /metrics (default port {Config.METRICS_PORT})")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Print one JSON line with stage timings and counters every minute")
+    args = parser.parse_args()
+
+    try:
+        hub = SignalHub()
+        worker = StreamWorker(args.symbols, _MODEL, score, hub,
+                              poll_seconds=args.poll, fetch_seconds=args.fetch_seconds)
+        t0 = time.perf_counter()
+        scored = worker.run_once()  # initial state for the first subscribers
+        print(f"📈 Scored {len(scored)} symbols in {time.perf_counter() - t0:.2f}s")
+        server = serve_stream(hub, port=args.port)
+        metrics = serve_metrics(args.metrics_port) if args.metrics_port else None
+        worker.start()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(f"📡 Streaming signals on http://localhost:{args.port}/events "
+          f"(checking every {args.poll:g}s; Ctrl+C to stop)")
+    if metrics:
+        print(f"📊 Metrics on http://localhost:{args.metrics_port}/metrics")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"   {hub.subscribers} subscriber(s), {len(hub.snapshot())} symbols live")
+            if args.log_json:
+                log_json("stream")
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping stream")
+        worker.stop()
+        server.shutdown()
+        if metrics:
+            metrics.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,95 @@
 """
 Train Multi-Task LSTM Stock Prediction Model
 15+ years data → 60-day sequences → 4 outputs (tomorrow/week direction + returns)
+
+Run:
+    python train.py                      # full training from scratch
+    python train.py --warm-start         # fine-tune on bars since last training
+    python train.py --schedule 24        # walk-forward refresh every 24 hours
+    python train.py --hparams models/search/<run>/best.json
+    python train.py --resume             # continue an interrupted training run
+    python train.py --distributed 4      # data-parallel across 4 local worker processes
 """
 
+import argparse
+import json
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent))
 
-from src.trainer import train_and_save_model, set_validation_accuracies
-from src.predictor import set_validation_accuracies as set_pred_accuracies
+from config import Config
+from src.trainer import train_and_save_model
+from src.distributed import train_distributed
+from src.retrainer import retrain_incremental, run_retrain_schedule
+from src.instrumentation import log_json, profile_session
+
+def run(args):
+    """Dispatch to full training, a warm-start refresh or the refresh schedule."""
+    if args.schedule:
+        print(f"🗓️ Walk-forward retraining every {args.schedule:g}h (Ctrl+C to stop)")
+        run_retrain_schedule(interval_hours=args.schedule)
+        return
+
+    if args.warm_start:
+        print("🔥 Warm-start refresh of Multi-Task LSTM Stock Model...")
+        retrain_incremental(refresh_data=args.refresh_data)
+        return
 
-def main():
     print("🚀 Training Multi-Task LSTM Stock Model...")
     print("📊 15+ years data → 60-day sequences → Realistic confidence calibration")
-    
-    val_tom, val_week = train_and_save_model()
-    
-    # Update both trainer and predictor with real validation accuracies
-    set_validation_accuracies(val_tom, val_week)
-    set_pred_accuracies(val_tom, val_week)
-    
+
+    # Validation metrics are written to the bundle's metrics.json and read by predictors
+    hparams = None
+    if args.hparams:
+        hparams = json.loads(Path(args.hparams).read_text())["hparams"]
+        print(f"🎛️ Hyperparameters from {args.hparams}: {hparams}")
+    if args.distributed:
+        result = train_distributed(args.distributed, hparams=hparams)
+        val_tom, val_week = result["val_acc_tomorrow"], result["val_acc_week"]
+        print(f"⚡ {result['workers']} workers: {result['windows_per_sec']:,.0f} windows/s "
+              f"(global batch {result['global_batch']})")
+    else:
+        val_tom, val_week = train_and_save_model(
+            hparams=hparams, resume=args.resume, checkpoint_every=args.checkpoint_every
+        )
+
     print(f"\n✅ Training Complete!")
     print(f"📈 Validation Accuracy → Tomorrow: {val_tom:.1%} | Week: {val_week:.1%}")
-    print(f"💾 Model saved: {Path('models/lstm_stock_model.h5').absolute()}")
+    print(f"💾 Model registry: {Config.MODEL_REGISTRY_DIR.absolute()}")
     print("\n🔥 Run predictions: python predict.py --stock AAPL")
 
+def main():
+    parser = argparse.ArgumentParser(description="Train Multi-Task LSTM Stock Model")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Fine-tune the saved model on bars since the last training date")
+    parser.add_argument("--schedule", type=float, metavar="HOURS",
+                        help="Run warm-start refreshes on a rolling schedule")
+    parser.add_argument("--refresh-data", action="store_true",
+                        help="Re-download prices before a warm-start refresh")
+    parser.add_argument("--hparams", metavar="BEST_JSON",
+                        help="Train with the best trial of a search run (search.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the interrupted training run from its last checkpoint")
+    parser.add_argument("--checkpoint-every", type=int, default=Config.CHECKPOINT_EVERY_EPOCHS,
+                        metavar="EPOCHS", help="Checkpoint interval during full training")
+    parser.add_argument("--distributed", type=int, metavar="WORKERS",
+                        help="Data-parallel training across local worker processes "
+                             "(MultiWorkerMirroredStrategy)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print stage timings and dump cProfile + TensorFlow profiler traces")
+    parser.add_argument("--log-json", action="store_true",
+                        help="Print one JSON line with stage timings and counters after the run")
+    args = parser.parse_args()
+
+    label = "train-warm" if args.warm_start else "train"
+    if args.profile:
+        with profile_session(label):
+            run(args)
+    else:
+        run(args)
+    if args.log_json:
+        log_json(label)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tune decision thresholds on cached validation outputs.
+Runs the model once (or reuses data/processed/validation_outputs.npz),
+then sweeps NEUTRAL_LOW/HIGH and MEDIUM/HIGH_EDGE per symbol.
+
+Run:
+    python tune_thresholds.py
+    python tune_thresholds.py --refresh --min-coverage 0.10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from config import Config
+from src.threshold_search import run_threshold_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decision threshold grid search")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-run the model instead of using cached outputs")
+    parser.add_argument("--min-coverage", type=float, default=0.05,
+                        help="Minimum fraction of windows that must trade (default 0.05)")
+    args = parser.parse_args()
+
+    try:
+        best = run_threshold_search(refresh=args.refresh, min_coverage=args.min_coverage)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("\n" + "=" * 80)
+    print("🏆 BEST THRESHOLDS PER SYMBOL")
+    print(best.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print("=" * 80)
+    print(f"Current: NEUTRAL_LOW={Config.NEUTRAL_LOW} NEUTRAL_HIGH={Config.NEUTRAL_HIGH} "
+          f"MEDIUM_EDGE={Config.MEDIUM_EDGE} HIGH_EDGE={Config.HIGH_EDGE}")
+
+
+if __name__ == "__main__":
+    main()